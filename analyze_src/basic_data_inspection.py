@@ -3,6 +3,9 @@ from abc import ABC, abstractmethod
 import numpy as np
 import pandas as pd
 
+from data_profile import DataProfile, profile_dataframe
+from dataset_handle import as_dataframe
+
 
 # Absract Base Class for Data Inspection Strategies
 # -------------------------------------------------
@@ -10,12 +13,13 @@ import pandas as pd
 # Subclasses must implement the inspect method.
 class DataInspectionStrategy(ABC):
     @abstractmethod
-    def inspect(self, df: pd.DataFrame):
+    def inspect(self, df: pd.DataFrame, profile: DataProfile = None):
         """
         Perform a specific type of data inspection
 
         Parameters:
         df (pd.DataFrame): The dataframe on which the inspection is to be performed
+        profile (DataProfile): A profile of df. It is computed when not given.
 
         Returns:
         None: This method prints the inspection results directly
@@ -27,38 +31,43 @@ class DataInspectionStrategy(ABC):
 # ---------------------
 # This strategy inspects the data types of each column and count of null values
 class DataTypesInspection(DataInspectionStrategy):
-    def inspect(self, df: pd.DataFrame):
+    def inspect(self, df: pd.DataFrame, profile: DataProfile = None):
         """
         inpectS and prints the data types and non-null couns for every column
 
         Parameters:
         df (pd.DataFrame): The dataframe to be inspected.
+        profile (DataProfile): A profile of df. It is computed when not given.
 
         Returns:
         None: Prints the data types and non-null counts of the data frame
         """
+        profile = profile if profile is not None else profile_dataframe(df)
         print("\nData Types and Non-null Counts:")
-        print(df.info())
+        print(f"{profile.n_rows} entries, {len(profile.columns)} columns")
+        print(profile.info())
 
 
 # Summary Statistics Inspection
 # -----------------------------
 # This strategy provides summary statistics for both numerical and categorical data
 class SummaryStatisticsInspection(DataInspectionStrategy):
-    def inspect(self, df: pd.DataFrame):
+    def inspect(self, df: pd.DataFrame, profile: DataProfile = None):
         """
         Prints summary statistics for numerical and categorical values
 
         Parameters:
         df (pd.DataFrame): The dataframe to be inspected
+        profile (DataProfile): A profile of df. It is computed when not given.
 
         Returns:
         None: Prints summary statistics console
         """
+        profile = profile if profile is not None else profile_dataframe(df)
         print("\nSummary Statistics (Numerical Features):")
-        print(df.describe())
+        print(profile.numeric_summary())
         print("\nSummary Statistics (Categorical Features)")
-        print(df.describe(include=[object]))
+        print(profile.categorical_summary())
 
 
 # Context class that uses a DataInspectionStrategy
@@ -89,17 +98,19 @@ class DataInspector:
         """
         self._strategy = strategy
 
-    def execute_inspection(self, df: pd.DataFrame):
+    def execute_inspection(self, df: pd.DataFrame, profile: DataProfile = None):
         """
         Executes the inspection using the current strategy.
 
         Parameters:
-        df (pd.DataFrames): The dataframe to be inspected.
+        df (pd.DataFrames): The dataframe to be inspected, or a dataset handle such as SharedDataset.
+        profile (DataProfile): A profile of df from profile_dataframe. Pass the same profile
+            to several inspections to scan the dataframe only once.
 
         Returns:
         None: Executes the strategys inspection method.
         """
-        self._strategy.inspect(df)
+        self._strategy.inspect(as_dataframe(df), profile)
 
 # Example Usage
 if __name__ == "__main__":
@@ -108,11 +119,14 @@ if __name__ == "__main__":
     #load the data
     #df = pd.read_csv()
 
+    # Profile the data once; every inspection reads from the profile
+    # profile = profile_dataframe(df)
+
     # Initialize the Data inspector with a specific strategy
     # inspector.set_strategy(DataTypeInspection)
-    # inspector.execute_inspection(df)
+    # inspector.execute_inspection(df, profile)
 
     # Change strategy to summary Statistics and execute
     # inspector.set_strategy(SummaryStatisticsInspection)
-    # inspector.execute_inspection(df)
+    # inspector.execute_inspection(df, profile)
     pass
\ No newline at end of file
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import seaborn as sns
 
+from data_profile import SharedScan
+from dataset_handle import as_dataframe
 
 
 # Abstract method class for bivariate analysis
@@ -42,6 +43,9 @@ class NumericalVsNumericalAnalysis(BivariateAnalysisStrategy):
         Returns:
         None: Displays a scatter plot showing relationship between two features
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(10, 6))
         sns.scatterplot(x=feature1, y=feature2, data=df)
         plt.title(f"{feature1} vs {feature2}")
@@ -50,6 +54,59 @@ class NumericalVsNumericalAnalysis(BivariateAnalysisStrategy):
         plt.show()
 
 
+# Concrete Strategy for Numerical vs Numerical Analysis on large data
+# -------------------------------------------------------------------
+# Draws the density of points instead of every point, so the render time
+# depends on the grid size rather than on the number of rows.
+class DensityNumericalVsNumericalAnalysis(BivariateAnalysisStrategy):
+    def __init__(self, kind: str = "hexbin", gridsize: int = 60):
+        """
+        Initialises the density strategy
+
+        Parameters:
+        kind (str): "hexbin" for hexagonal bins or "hist2d" for a 2D histogram
+        gridsize (int): Number of bins along the x axis (and the y axis for "hist2d")
+
+        Returns:
+        None
+        """
+        if kind not in ("hexbin", "hist2d"):
+            raise ValueError(f"Unknown density plot kind: {kind}")
+        self.kind = kind
+        self.gridsize = gridsize
+
+    def analyze(self, df: pd.DataFrame, feature1: str, feature2: str):
+        """
+        Plots the density of the relationship between two numerical features
+
+        Parameters:
+        df (pd.DataFrame): dataframe containing the data.
+        feature1 (str): The name of the first feature/column to be analysed.
+        feature2 (str): The name of the second feature/column to be analysed.
+
+        Returns:
+        None: Displays a hexbin or 2D histogram with a log-scaled count colour bar
+        """
+        import matplotlib.pyplot as plt
+
+        values = df[[feature1, feature2]].to_numpy(dtype="float64", na_value=np.nan)
+        values = values[~np.isnan(values).any(axis=1)]
+        x, y = values[:, 0], values[:, 1]
+
+        plt.figure(figsize=(10, 6))
+        if self.kind == "hexbin":
+            image = plt.hexbin(x, y, gridsize=self.gridsize, bins="log", mincnt=1, cmap="viridis")
+        else:
+            counts, x_edges, y_edges = np.histogram2d(x, y, bins=self.gridsize)
+            counts = np.ma.masked_equal(counts, 0)
+            image = plt.pcolormesh(x_edges, y_edges, counts.T, norm="log", cmap="viridis")
+        plt.colorbar(image, label="count")
+        plt.title(f"{feature1} vs {feature2}")
+        plt.xlabel(feature1)
+        plt.ylabel(feature2)
+        plt.show()
+
+
 # Concrete Strategy for categorical vs Numerical Analysis
 # -------------------------------------------------------
 # This method analyzes the relationship between a categorical feature and a numerical feature
@@ -66,6 +123,9 @@ class CategoricalVsNumericalAnalysis(BivariateAnalysisStrategy):
         Returns:
         None: Displays a box plot showing relationship between two features
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(10, 6))
         sns.boxplot(x=feature1, y=feature2, data=df)
         plt.title(f"{feature1} vs {feature2}")
@@ -74,6 +134,154 @@ class CategoricalVsNumericalAnalysis(BivariateAnalysisStrategy):
         plt.xticks(rotation=45)
         plt.show()
 
+# Batch Categorical vs Numerical Analysis
+# ---------------------------------------
+# Summarises every categorical feature against one numerical target in a
+# single pass per feature: the target is sorted once, each feature's codes are
+# stable-sorted over that order (a radix sort for small code types), which
+# leaves every category's target values contiguous and ascending. Quartiles,
+# whiskers and outlier counts are then read off with vectorized indexing over
+# all categories at once. The result is a tidy table; boxes are drawn from it
+# only when asked for.
+class BatchCategoricalVsNumericalAnalysis(BivariateAnalysisStrategy):
+    SUMMARY_COLUMNS = [
+        "feature", "category", "count", "mean", "min", "whisker_low", "q1",
+        "median", "q3", "whisker_high", "max", "n_outliers",
+    ]
+
+    def __init__(self, whis: float = 1.5):
+        """
+        Initialises the batch strategy
+
+        Parameters:
+        whis (float): Whisker reach as a multiple of the interquartile range, as in matplotlib's boxplot
+
+        Returns:
+        None
+        """
+        self.whis = whis
+
+    def summarize(self, df: pd.DataFrame, target: str = "SalePrice", features: list = None,
+                  scan: SharedScan = None) -> pd.DataFrame:
+        """
+        Computes box plot statistics of the target for every category of every categorical feature
+
+        Parameters:
+        df (pd.DataFrame): dataframe containing the data.
+        target (str): The name of the numerical feature/column to summarise
+        features (list): The categorical features/columns to group by. Defaults to every non-numerical column.
+        scan (SharedScan): A shared scan of df to read the target order and category codes from. Created when not given.
+
+        Returns:
+        pd.DataFrame: One row per (feature, category) with count, mean, min, whiskers, quartiles, max and outlier count
+        """
+        scan = scan if scan is not None else SharedScan(df)
+        if features is None:
+            features = scan.categorical_columns
+        if target not in scan.numeric_position:
+            raise ValueError(f"The target {target} is not a numerical column")
+        order = scan.order(target)
+        y_sorted = scan.numeric_values[order, scan.numeric_position[target]]
+
+        tables = [self._summarize_feature(*scan.codes(name), name, order, y_sorted) for name in features]
+        tables = [table for table in tables if len(table)]
+        if not tables:
+            return pd.DataFrame(columns=self.SUMMARY_COLUMNS)
+        return pd.concat(tables, ignore_index=True)[self.SUMMARY_COLUMNS]
+
+    def _summarize_feature(self, codes: np.ndarray, uniques: pd.Index, name: str, order: np.ndarray,
+                           y_sorted: np.ndarray) -> pd.DataFrame:
+        codes = codes[order]
+        keep = codes >= 0
+        codes, values = codes[keep], y_sorted[keep]
+        if len(uniques) < np.iinfo(np.int16).max:
+            codes = codes.astype(np.int16)
+
+        # Stable sort keeps the ascending target order inside each category
+        grouped = np.argsort(codes, kind="stable")
+        codes, values = codes[grouped], values[grouped]
+        counts = np.bincount(codes, minlength=len(uniques))
+        present = np.flatnonzero(counts)
+        if not len(present):
+            # All-missing feature, or no row with both the feature and the target set
+            return pd.DataFrame(columns=self.SUMMARY_COLUMNS)
+        counts = counts[present]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        last = starts + counts - 1
+
+        def quantile(q):
+            # Linear interpolation between closest ranks, as in np.quantile
+            position = starts + q * (counts - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, last)
+            fraction = position - lower
+            return values[lower] * (1 - fraction) + values[upper] * fraction
+
+        q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        reach = self.whis * (q3 - q1)
+        # Map each row to its position among the present categories
+        group = np.repeat(np.arange(len(present)), counts)
+        below = np.bincount(group, weights=values < (q1 - reach)[group], minlength=len(present)).astype(np.int64)
+        above = np.bincount(group, weights=values > (q3 + reach)[group], minlength=len(present)).astype(np.int64)
+        sums = np.add.reduceat(values, starts) if len(values) else np.zeros(0)
+
+        return pd.DataFrame({
+            "feature": name,
+            "category": np.asarray(uniques, dtype=object)[present],
+            "count": counts,
+            "mean": sums / counts,
+            "min": values[starts],
+            "whisker_low": values[starts + below],
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "whisker_high": values[last - above],
+            "max": values[last],
+            "n_outliers": below + above,
+        })
+
+    def plot(self, summary: pd.DataFrame, feature: str, target: str = "SalePrice"):
+        """
+        Draws the box plot of one feature from a summary table
+
+        Parameters:
+        summary (pd.DataFrame): The output of summarize
+        feature (str): The name of the categorical feature/column to draw
+        target (str): The name of the summarised numerical feature, used as the y label
+
+        Returns:
+        None: Displays a box plot (without individual outliers) showing the relationship between two features
+        """
+        import matplotlib.pyplot as plt
+
+        rows = summary[summary["feature"] == feature]
+        stats = [
+            {"label": str(row.category), "whislo": row.whisker_low, "q1": row.q1, "med": row.median,
+             "q3": row.q3, "whishi": row.whisker_high}
+            for row in rows.itertuples(index=False)
+        ]
+        plt.figure(figsize=(10, 6))
+        plt.gca().bxp(stats, showfliers=False)
+        plt.title(f"{feature} vs {target}")
+        plt.xlabel(feature)
+        plt.ylabel(target)
+        plt.xticks(rotation=45)
+        plt.show()
+
+    def analyze(self, df: pd.DataFrame, feature1: str, feature2: str):
+        """
+        Plots the relationship between a categorical and a Numerical features
+
+        Parameters:
+        df (pd.DataFrame): dataframe containing the data.
+        feature1 (str): The name of the categorical feature/column to be analysed.
+        feature2 (str): The name of the Numerical feature/column to be analysed.
+
+        Returns:
+        None: Displays a box plot showing relationship between two features
+        """
+        self.plot(self.summarize(df, feature2, [feature1]), feature1, feature2)
+
 # Context class that uses a DataInspectionStrategy
 # ------------------------------------------------
 # Allows you to switch between different data inspection strategies
@@ -107,12 +315,12 @@ class Bi_Analysis:
         Executes the inspection using the current strategy.
 
         Parameters:
-        df (pd.DataFrames): The dataframe to be inspected.
+        df (pd.DataFrames): The dataframe to be inspected, or a dataset handle such as SharedDataset.
 
         Returns:
         None: Executes the strategys inspection method.
         """
-        self._strategy.analyze(df, feature1, feature2)
+        self._strategy.analyze(as_dataframe(df, [feature1, feature2]), feature1, feature2)
 
  # Example Usage
 if __name__ == "__main__":
@@ -128,4 +336,9 @@ if __name__ == "__main__":
     # Change strategy to summary Statistics and execute
     # inspector.set_strategy(NumericalVsNumericalAnalysis)
     # inspector.execute_inspection(df)
+
+    # Summarise every categorical feature against SalePrice, then draw only what is needed
+    # batch = BatchCategoricalVsNumericalAnalysis()
+    # summary = batch.summarize(df, "SalePrice")
+    # batch.plot(summary, "Neighborhood")
     pass       
\ No newline at end of file
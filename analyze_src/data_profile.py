@@ -0,0 +1,251 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Data profile
+# ------------
+# Structured result of profiling a dataframe. The inspection and missing
+# values strategies read from it instead of rescanning the dataframe.
+@dataclass
+class DataProfile:
+    n_rows: int
+    columns: pd.DataFrame
+    numeric: pd.DataFrame
+    categorical: pd.DataFrame
+    top_k: Dict[str, pd.Series] = field(default_factory=dict)
+
+    def info(self) -> pd.DataFrame:
+        """
+        Returns the data types, non-null counts and cardinality of every column
+
+        Returns:
+        pd.DataFrame: One row per column
+        """
+        return self.columns[["dtype", "non_null", "cardinality"]]
+
+    def missing_values(self) -> pd.Series:
+        """
+        Returns the count of missing values in each column
+
+        Returns:
+        pd.Series: Null count per column
+        """
+        return self.columns["null_count"]
+
+    def numeric_summary(self) -> pd.DataFrame:
+        """
+        Returns summary statistics for the numerical columns, laid out like df.describe()
+
+        Returns:
+        pd.DataFrame: count, mean, std, min, quantiles and max per numerical column
+        """
+        return self.numeric.T
+
+    def categorical_summary(self) -> pd.DataFrame:
+        """
+        Returns summary statistics for the categorical columns, laid out like df.describe(include=[object])
+
+        Returns:
+        pd.DataFrame: count, unique, top and freq per categorical column
+        """
+        return self.categorical.T
+
+
+# Shared scan
+# -----------
+# Lazily computes, once per dataframe, the intermediate results several
+# analyses need: the numerical columns as one float64 block, its validity
+# mask, the block sorted along the rows, per-column category codes, row orders
+# of numerical columns and the null mask of the whole frame. The profiling
+# engine and the EDA strategies that accept a `scan` read from it instead of
+# rescanning the dataframe.
+class SharedScan:
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialises the shared scan; nothing is computed until it is first needed
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to be scanned
+
+        Returns:
+        None
+        """
+        self.df = df
+        self._codes = {}
+        self._orders = {}
+
+    @cached_property
+    def numeric_columns(self) -> list:
+        return list(self.df.select_dtypes(include="number").columns)
+
+    @cached_property
+    def categorical_columns(self) -> list:
+        numeric = set(self.numeric_columns)
+        return [name for name in self.df.columns if name not in numeric]
+
+    @cached_property
+    def numeric_position(self) -> Dict[str, int]:
+        return {name: i for i, name in enumerate(self.numeric_columns)}
+
+    @cached_property
+    def numeric_values(self) -> np.ndarray:
+        return self.df[self.numeric_columns].to_numpy(dtype="float64", na_value=np.nan)
+
+    @cached_property
+    def numeric_valid(self) -> np.ndarray:
+        return ~np.isnan(self.numeric_values)
+
+    @cached_property
+    def numeric_sorted(self) -> np.ndarray:
+        # NaN sorts to the end, so the first `count` rows of each column are its valid values
+        return np.sort(self.numeric_values, axis=0)
+
+    def numeric_column(self, name: str) -> np.ndarray:
+        """Returns the non-missing values of a numerical column, in row order."""
+        i = self.numeric_position[name]
+        return self.numeric_values[:, i][self.numeric_valid[:, i]]
+
+    def codes(self, name: str) -> Tuple[np.ndarray, pd.Index]:
+        """Returns the integer codes (-1 for missing) and the unique values of a column."""
+        if name not in self._codes:
+            column = self.df[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes, uniques = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                codes, uniques = pd.factorize(column, use_na_sentinel=True)
+            self._codes[name] = (codes, pd.Index(uniques))
+        return self._codes[name]
+
+    def order(self, name: str) -> np.ndarray:
+        """Returns the rows of a numerical column's non-missing values, in ascending order of value."""
+        if name not in self._orders:
+            values = self.numeric_values[:, self.numeric_position[name]]
+            order = np.argsort(values, kind="stable")
+            self._orders[name] = order[: int((~np.isnan(values)).sum())]
+        return self._orders[name]
+
+    @cached_property
+    def null_mask(self) -> pd.DataFrame:
+        columns = {name: ~self.numeric_valid[:, i] for i, name in enumerate(self.numeric_columns)}
+        columns.update({name: self.codes(name)[0] < 0 for name in self.categorical_columns})
+        return pd.DataFrame(columns, index=self.df.index)[list(self.df.columns)]
+
+
+# Profiling engine
+# ----------------
+# Numerical columns are materialised once as a single float64 block and
+# sorted once along the rows; counts, min/max, quantiles and cardinality all
+# come from that sorted block, and mean/std from one vectorized reduction.
+# Categorical columns are reduced to integer codes and counted with bincount.
+def _profile_numeric(scan: SharedScan, quantiles: Sequence[float]) -> pd.DataFrame:
+    names = scan.numeric_columns
+    index = ["count", "mean", "std", "min"] + [f"{q:.0%}" for q in quantiles] + ["max", "cardinality"]
+    if not names:
+        return pd.DataFrame(index=names, columns=index, dtype="float64")
+
+    values = scan.numeric_values
+    valid = scan.numeric_valid
+    count = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, values, 0.0).sum(axis=0) / count
+        centered = np.where(valid, values - mean, 0.0)
+        # As in df.describe(), fewer than two values have no sample std (0 / -1 would give -0.0)
+        std = np.where(count > 1, np.sqrt((centered * centered).sum(axis=0) / (count - 1)), np.nan)
+
+    ordered = scan.numeric_sorted
+    columns = np.arange(len(names))
+    last = np.maximum(count - 1, 0)
+    stats = {
+        "count": count.astype("float64"),
+        "mean": mean,
+        "std": std,
+        "min": np.where(count > 0, ordered[0, columns], np.nan),
+    }
+    for q in quantiles:
+        # Linear interpolation between closest ranks, as in np.quantile / df.describe
+        position = q * last
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, last)
+        fraction = position - lower
+        value = ordered[lower, columns] * (1 - fraction) + ordered[upper, columns] * fraction
+        stats[f"{q:.0%}"] = np.where(count > 0, value, np.nan)
+    stats["max"] = np.where(count > 0, ordered[last, columns], np.nan)
+
+    row = np.arange(ordered.shape[0])[:, None]
+    changes = (np.diff(ordered, axis=0) != 0) & (row[1:] < count)
+    stats["cardinality"] = np.where(count > 0, changes.sum(axis=0) + 1, 0).astype("float64")
+    return pd.DataFrame(stats, index=names)[index]
+
+
+def _profile_categorical(scan: SharedScan, top_k: int):
+    rows = {}
+    top_values = {}
+    for name in scan.categorical_columns:
+        codes, uniques = scan.codes(name)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        top = pd.Series(counts[order[:top_k]], index=np.asarray(uniques)[order[:top_k]], name=name)
+        top_values[name] = top
+        rows[name] = {
+            "count": int(counts.sum()),
+            "unique": int((counts > 0).sum()),
+            "top": top.index[0] if len(top) else np.nan,
+            "freq": int(top.iloc[0]) if len(top) else np.nan,
+        }
+    categorical = pd.DataFrame.from_dict(rows, orient="index", columns=["count", "unique", "top", "freq"])
+    return categorical, top_values
+
+
+def profile_dataframe(df: pd.DataFrame, top_k: int = 5, quantiles: Sequence[float] = (0.25, 0.5, 0.75),
+                      scan: SharedScan = None) -> DataProfile:
+    """
+    Profiles every column of a dataframe
+
+    Parameters:
+    df (pd.DataFrame): The dataframe to be profiled
+    top_k (int): Number of most frequent values kept per categorical column
+    quantiles (Sequence[float]): Quantiles computed for the numerical columns
+    scan (SharedScan): A shared scan of df, to reuse its intermediate results. Created when not given.
+
+    Returns:
+    DataProfile: dtypes, null counts, numerical statistics, cardinality and top-k values
+    """
+    scan = scan if scan is not None else SharedScan(df)
+    numeric = _profile_numeric(scan, quantiles)
+    categorical, top_values = _profile_categorical(scan, top_k)
+
+    non_null = pd.concat([numeric["count"], categorical["count"]]).astype("int64")
+    cardinality = pd.concat([numeric["cardinality"], categorical["unique"]]).astype("int64")
+    columns = pd.DataFrame({
+        "dtype": df.dtypes,
+        "non_null": non_null.reindex(df.columns),
+        "null_count": len(df) - non_null.reindex(df.columns),
+        "cardinality": cardinality.reindex(df.columns),
+    })
+    return DataProfile(
+        n_rows=len(df),
+        columns=columns,
+        numeric=numeric.drop(columns="cardinality"),
+        categorical=categorical,
+        top_k=top_values,
+    )
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    #load the data
+    #df = pd.read_csv(...data/housing.csv)
+
+    # Profile once and let every inspection strategy read from the profile
+    # profile = profile_dataframe(df)
+    # inspector = DataInspector(SummaryStatisticsInspection())
+    # inspector.execute_inspection(df, profile)
+    pass
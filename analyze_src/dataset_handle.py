@@ -0,0 +1,37 @@
+from typing import List
+
+import pandas as pd
+
+
+# Dataset handles
+# ---------------
+# The context classes accept either a DataFrame or a dataset handle such as
+# src_/shared_dataset.SharedDataset. A handle is anything with a
+# `to_frame(columns=None)` method; it is recognised by that method rather than
+# by its type, so analyze_src does not depend on the ingestion code.
+def as_dataframe(data, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Returns a DataFrame for a DataFrame or a dataset handle
+
+    Parameters:
+    data (pd.DataFrame or handle): The data to be analysed
+    columns (List[str]): The columns the caller needs. A handle only materialises these;
+        a DataFrame is returned whole.
+
+    Returns:
+    pd.DataFrame: The data as a DataFrame
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if callable(getattr(data, "to_frame", None)):
+        return data.to_frame(columns)
+    raise ValueError(f"Expected a DataFrame or a dataset handle with to_frame(), got {type(data).__name__}")
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    # dataset = SharedDataset("/dev/shm/ames")
+    # df = as_dataframe(dataset, ["SalePrice", "Gr Liv Area"])
+    pass
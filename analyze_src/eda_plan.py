@@ -0,0 +1,330 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import pandas as pd
+
+from basic_data_inspection import DataInspectionStrategy, DataTypesInspection, SummaryStatisticsInspection
+from bivariate_analysis import BatchCategoricalVsNumericalAnalysis, BivariateAnalysisStrategy
+from data_profile import DataProfile, SharedScan, profile_dataframe
+from dataset_handle import as_dataframe
+from missing_values_analysis import BinnedMissingValuesAnalysis, MissingValuesanalysis, SimpleMissingValuesAnalysis
+from multivariate_analysis import FastMultivariateAnalysis, MultivariateAnalysisTemplate
+from univariate_analysis import (
+    CategoricalUnivariateAnalysis,
+    NumericalUnivariateAnalysis,
+    UnivariateAnalysisStrategy,
+)
+
+
+# Lazy EDA plan
+# -------------
+# Strategies are registered on the plan instead of being run one by one. When
+# the plan runs, an optimizer resolves the columns, drops duplicate steps,
+# merges steps that share work (every inspection and missing value count reads
+# one profile, every batch box plot against the same target one summary table,
+# the correlation heatmap and pair plot one correlation matrix) and lists the
+# shared intermediate results they need: the numerical block, its sort, the
+# category codes, target orders and the null mask. Those are computed once on
+# a SharedScan, then every aggregate, and only then is anything drawn.
+# Strategies the optimizer does not know are run eagerly at draw time.
+@dataclass
+class PlanStep:
+    kind: str
+    strategy: object
+    args: tuple = ()
+
+    @property
+    def label(self) -> str:
+        if self.kind == "bivariate":
+            return f"{self.args[0]} vs {self.args[1]}"
+        if self.kind == "univariate":
+            return f"univariate {self.args[0]}"
+        return self.kind
+
+    def key(self) -> tuple:
+        params = tuple(sorted((name, repr(value)) for name, value in vars(self.strategy).items()))
+        return (self.kind, type(self.strategy).__name__, params, self.args)
+
+
+@dataclass
+class CompiledPlan:
+    steps: List[PlanStep]
+    shared: List[str]
+    profile: bool = False
+    summaries: Dict[tuple, List[str]] = field(default_factory=dict)
+    correlations: Dict[tuple, FastMultivariateAnalysis] = field(default_factory=dict)
+
+    def explain(self) -> str:
+        """Returns a readable description of the shared computations and the steps."""
+        lines = ["shared scan:"] + [f"  {name}" for name in self.shared]
+        lines.append("aggregates:")
+        if self.profile:
+            lines.append("  profile")
+        lines += [f"  summary of {len(features)} features vs {target}" for (target, _), features in self.summaries.items()]
+        lines += [f"  correlation matrix ({key[1]})" for key in self.correlations]
+        lines += [f"  {step.label}" for step in self.steps if step.kind == "univariate"]
+        lines.append("draw:")
+        lines += [f"  {step.label} ({type(step.strategy).__name__})" for step in self.steps]
+        return "\n".join(lines)
+
+
+@dataclass
+class EDAResult:
+    profile: DataProfile
+    aggregates: Dict[str, object]
+    timings: Dict[str, float]
+
+
+class EDAPlan:
+    def __init__(self):
+        """
+        Initialises an empty plan
+
+        Returns:
+        None
+        """
+        self._steps = []
+
+    @classmethod
+    def full(cls, target: str = "SalePrice") -> "EDAPlan":
+        """
+        Builds the complete EDA: both inspections, missing values, every univariate plot,
+        every categorical feature against the target and the multivariate plots
+
+        Parameters:
+        target (str): The numerical column the bivariate and pair plots are drawn against
+
+        Returns:
+        EDAPlan: The plan, ready to run
+        """
+        return (
+            cls()
+            .inspect(DataTypesInspection())
+            .inspect(SummaryStatisticsInspection())
+            .missing_values(BinnedMissingValuesAnalysis())
+            .univariate()
+            .categorical_vs_target(target)
+            .multivariate(FastMultivariateAnalysis(target=target))
+        )
+
+    def inspect(self, strategy: DataInspectionStrategy) -> "EDAPlan":
+        """Adds a data inspection. Returns the plan, so calls can be chained."""
+        self._steps.append(PlanStep("inspect", strategy))
+        return self
+
+    def missing_values(self, strategy: MissingValuesanalysis = None) -> "EDAPlan":
+        """Adds a missing values analysis, SimpleMissingValuesAnalysis by default."""
+        self._steps.append(PlanStep("missing", strategy if strategy is not None else SimpleMissingValuesAnalysis()))
+        return self
+
+    def univariate(self, features=None, strategy: UnivariateAnalysisStrategy = None) -> "EDAPlan":
+        """
+        Adds univariate plots
+
+        Parameters:
+        features (str or list): The features/columns to plot. Defaults to every column.
+        strategy (UnivariateAnalysisStrategy): The strategy to use. Chosen from each column's dtype when not given.
+
+        Returns:
+        EDAPlan: The plan, so calls can be chained
+        """
+        features = [features] if isinstance(features, str) else features
+        self._steps.append(PlanStep("univariate", strategy, (features,)))
+        return self
+
+    def bivariate(self, feature1: str, feature2: str, strategy: BivariateAnalysisStrategy) -> "EDAPlan":
+        """Adds a bivariate plot of two features. Returns the plan, so calls can be chained."""
+        self._steps.append(PlanStep("bivariate", strategy, (feature1, feature2)))
+        return self
+
+    def categorical_vs_target(self, target: str = "SalePrice", features: list = None,
+                              strategy: BatchCategoricalVsNumericalAnalysis = None) -> "EDAPlan":
+        """
+        Adds box plots of the target for every category of the given features
+
+        Parameters:
+        target (str): The numerical feature/column to summarise
+        features (list): The categorical features/columns. Defaults to every non-numerical column.
+        strategy (BatchCategoricalVsNumericalAnalysis): The batch strategy to use
+
+        Returns:
+        EDAPlan: The plan, so calls can be chained
+        """
+        strategy = strategy if strategy is not None else BatchCategoricalVsNumericalAnalysis()
+        self._steps.append(PlanStep("categorical_vs_target", strategy, (target, features)))
+        return self
+
+    def multivariate(self, strategy: MultivariateAnalysisTemplate = None) -> "EDAPlan":
+        """Adds the correlation heatmap and pair plot, FastMultivariateAnalysis by default."""
+        self._steps.append(PlanStep("multivariate", strategy if strategy is not None else FastMultivariateAnalysis()))
+        return self
+
+    def _resolve(self, scan: SharedScan) -> List[PlanStep]:
+        # Expand column lists and default strategies into one step per figure
+        steps = []
+        for step in self._steps:
+            if step.kind == "univariate":
+                features = step.args[0] if step.args[0] is not None else list(scan.df.columns)
+                for name in features:
+                    strategy = step.strategy
+                    if strategy is None:
+                        numeric = name in scan.numeric_position
+                        strategy = NumericalUnivariateAnalysis() if numeric else CategoricalUnivariateAnalysis()
+                    steps.append(PlanStep("univariate", strategy, (name,)))
+            elif step.kind == "categorical_vs_target":
+                target, features = step.args
+                features = features if features is not None else scan.categorical_columns
+                steps += [PlanStep("bivariate", step.strategy, (name, target)) for name in features]
+            else:
+                steps.append(step)
+
+        unique = {}
+        for step in steps:
+            unique.setdefault(step.key(), step)
+        return list(unique.values())
+
+    def compile(self, df: pd.DataFrame, scan: SharedScan = None) -> CompiledPlan:
+        """
+        Optimizes the plan for a dataframe
+
+        Parameters:
+        df (pd.DataFrame): The dataframe the plan will run on
+        scan (SharedScan): A shared scan of df. Created when not given.
+
+        Returns:
+        CompiledPlan: The deduplicated steps, merged aggregates and shared computations
+        """
+        scan = scan if scan is not None else SharedScan(df)
+        plan = CompiledPlan(steps=self._resolve(scan), shared=[])
+        shared = []
+
+        def need(name):
+            if name not in shared:
+                shared.append(name)
+
+        for step in plan.steps:
+            if step.kind in ("inspect", "missing"):
+                plan.profile = True
+                if isinstance(step.strategy, BinnedMissingValuesAnalysis):
+                    need("null_mask")
+            elif step.kind == "univariate":
+                name = step.args[0]
+                if isinstance(step.strategy, NumericalUnivariateAnalysis):
+                    need("numeric_values")
+                elif isinstance(step.strategy, CategoricalUnivariateAnalysis):
+                    need(f"codes {name}")
+            elif step.kind == "bivariate" and isinstance(step.strategy, BatchCategoricalVsNumericalAnalysis):
+                feature, target = step.args
+                plan.summaries.setdefault((target, step.strategy.whis), []).append(feature)
+                need(f"order {target}")
+                need(f"codes {feature}")
+            elif step.kind == "multivariate" and isinstance(step.strategy, FastMultivariateAnalysis):
+                plan.correlations.setdefault(step.key(), step.strategy)
+                need("numeric_values")
+
+        if plan.profile:
+            need("numeric_sorted")
+            for name in scan.categorical_columns:
+                need(f"codes {name}")
+        # Compute the block first; the sort, orders and null mask all derive from it
+        rank = {"numeric_values": 0, "numeric_sorted": 1, "order": 2, "codes": 3, "null_mask": 4}
+        plan.shared = sorted(shared, key=lambda name: rank[name.split(" ")[0]])
+        return plan
+
+    def explain(self, df: pd.DataFrame) -> str:
+        """Returns a readable description of the optimized plan for a dataframe."""
+        return self.compile(df).explain()
+
+    def run(self, df: pd.DataFrame, render: bool = True) -> EDAResult:
+        """
+        Runs the plan: shared computations, then aggregates, then (optionally) the figures
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to be analysed, or a dataset handle such as SharedDataset
+        render (bool): Draw the figures and print the inspections. With False only the aggregates are computed.
+
+        Returns:
+        EDAResult: The profile, the aggregates keyed by step label and the time spent in each phase
+        """
+        timings = {}
+        df = as_dataframe(df)
+        scan = SharedScan(df)
+        start = time.perf_counter()
+        plan = self.compile(df, scan)
+        timings["compile"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in plan.shared:
+            if name.startswith("codes "):
+                scan.codes(name[len("codes "):])
+            elif name.startswith("order "):
+                scan.order(name[len("order "):])
+            else:
+                getattr(scan, name)
+        timings["scan"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        aggregates = {}
+        profile = profile_dataframe(df, scan=scan) if plan.profile else None
+        summaries = {
+            key: BatchCategoricalVsNumericalAnalysis(whis=key[1]).summarize(df, key[0], features, scan)
+            for key, features in plan.summaries.items()
+        }
+        correlations = {key: strategy.correlation_matrix(df, scan) for key, strategy in plan.correlations.items()}
+        for step in plan.steps:
+            if step.kind == "univariate":
+                aggregates[step.label] = step.strategy.compute(df, step.args[0], scan)
+            elif step.kind == "bivariate" and isinstance(step.strategy, BatchCategoricalVsNumericalAnalysis):
+                summary = summaries[(step.args[1], step.strategy.whis)]
+                aggregates[step.label] = summary[summary["feature"] == step.args[0]]
+            elif step.kind == "multivariate" and step.key() in correlations:
+                aggregates[step.label] = correlations[step.key()]
+        timings["aggregate"] = time.perf_counter() - start
+
+        if render:
+            start = time.perf_counter()
+            for step in plan.steps:
+                self._draw(step, df, scan, profile, aggregates.get(step.label))
+            timings["render"] = time.perf_counter() - start
+        return EDAResult(profile, aggregates, timings)
+
+    def _draw(self, step: PlanStep, df: pd.DataFrame, scan: SharedScan, profile: DataProfile, aggregates):
+        strategy = step.strategy
+        if step.kind == "inspect":
+            strategy.inspect(df, profile)
+        elif step.kind == "missing":
+            strategy.identify_missing_values(df, profile)
+            if isinstance(strategy, BinnedMissingValuesAnalysis):
+                strategy.visualize_missing_values(df, scan)
+            else:
+                strategy.visualize_missing_values(df)
+        elif step.kind == "univariate":
+            strategy.draw(aggregates, step.args[0])
+        elif step.kind == "bivariate" and isinstance(strategy, BatchCategoricalVsNumericalAnalysis):
+            strategy.plot(aggregates, *step.args)
+        elif step.kind == "bivariate":
+            strategy.analyze(df, *step.args)
+        elif aggregates is not None:
+            strategy.generate_correlation_heatmap(df, aggregates)
+            strategy.generate_pairplot(df, aggregates)
+        else:
+            strategy.analyze(df)
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    #load the data
+    #df = pd.read_csv(...data/housing.csv)
+
+    # Register everything, look at the optimized plan, then run it
+    # plan = EDAPlan.full(target="SalePrice")
+    # print(plan.explain(df))
+    # result = plan.run(df)
+
+    # Or pick the steps, and only compute the aggregates
+    # plan = EDAPlan().inspect(SummaryStatisticsInspection()).univariate(["SalePrice", "Neighborhood"])
+    # result = plan.run(df, render=False)
+    pass
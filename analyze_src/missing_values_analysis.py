@@ -2,34 +2,38 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from data_profile import DataProfile, SharedScan
+from dataset_handle import as_dataframe
 
 # Abstract base class for missing values Analysis
 # -----------------------------------------------
 # This class defines missing values analysis
 #  Subclasses must implement the methods to Identify and visualise the missing values
 class MissingValuesanalysis(ABC):
-    def analyze(self, df: pd.DataFrame):
+    def analyze(self, df: pd.DataFrame, profile: DataProfile = None):
         """
         Performs a complete missing values analysis by Idenifying null vales
 
         Parameters:
-        df (pd.DataFrame): The dataframe to be analysed
+        df (pd.DataFrame): The dataframe to be analysed, or a dataset handle such as SharedDataset
+        profile (DataProfile): A profile of df. Null counts are read from it when given.
 
         Returns:
         None: This method performs Analysis and Visualysation
         """
-        self.identify_missing_values(df)
+        df = as_dataframe(df)
+        self.identify_missing_values(df, profile)
         self.visualize_missing_values(df)
 
     @abstractmethod
-    def identify_missing_values(self,df: pd.DataFrame):
+    def identify_missing_values(self,df: pd.DataFrame, profile: DataProfile = None):
         """
         Identifies missing values
 
         Parameters:
         df (pd.DataFrame): The dataframe to be analysed
+        profile (DataProfile): A profile of df. Null counts are read from it when given.
 
         Returns:
         None: This method should prints the count of missing values
@@ -51,18 +55,19 @@ class MissingValuesanalysis(ABC):
     # ---------------------------------------------
     # This class implements methods to idenify and visualise missing values
 class SimpleMissingValuesAnalysis(MissingValuesanalysis):
-    def identify_missing_values(self, df: pd.DataFrame):
+    def identify_missing_values(self, df: pd.DataFrame, profile: DataProfile = None):
         """
         Prints the count of missing values in each column in the dataframe
 
         Parameters:
         df (pd.DataFrame): The dataframe to be analysed
+        profile (DataProfile): A profile of df. Null counts are read from it when given.
 
         Returns:
         None: This method should prints the count of missing values
         """
         print("\nMissing Values count by columns:")
-        missing_values = df.isnull().sum()
+        missing_values = profile.missing_values() if profile is not None else df.isnull().sum()
         print(missing_values[missing_values > 0])
 
     def visualize_missing_values(self, df: pd.DataFrame):
@@ -75,6 +80,9 @@ class SimpleMissingValuesAnalysis(MissingValuesanalysis):
         Returns:
         None: Displays a heatmap of missing values
         """ 
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         print("\nVisualizing Missing Values")
         plt.figure(figsize=(12, 8))
         sns.heatmap(df.isnull(), cbar=False, cmap="viridis")
@@ -82,6 +90,68 @@ class SimpleMissingValuesAnalysis(MissingValuesanalysis):
         plt.show()
 
 
+# Concrete class for missing values on large data
+# -----------------------------------------------
+# Rows are grouped into at most `n_bins` consecutive buckets and the heatmap
+# shows the fraction of missing values per bucket and column, so the image
+# size, not the number of rows, sets the render time.
+class BinnedMissingValuesAnalysis(SimpleMissingValuesAnalysis):
+    def __init__(self, n_bins: int = 500):
+        """
+        Initialises the binned missing values analysis
+
+        Parameters:
+        n_bins (int): Maximum number of row buckets in the heatmap
+
+        Returns:
+        None
+        """
+        self.n_bins = n_bins
+
+    def missing_fraction(self, df: pd.DataFrame, scan: SharedScan = None) -> pd.DataFrame:
+        """
+        Computes the fraction of missing values per row bucket and column
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to be analysed
+        scan (SharedScan): A shared scan of df to read the null mask from, if one exists
+
+        Returns:
+        pd.DataFrame: (buckets x columns) missing fractions, indexed by each bucket's first row
+        """
+        if len(df) == 0:
+            return pd.DataFrame(columns=df.columns, dtype="float64")
+        mask = (scan.null_mask if scan is not None else df.isnull()).to_numpy()
+        n_bins = min(self.n_bins, len(df))
+        starts = (np.arange(n_bins) * len(df)) // n_bins
+        sizes = np.diff(np.append(starts, len(df)))
+        fractions = np.add.reduceat(mask, starts, axis=0, dtype=np.int64) / sizes[:, None]
+        return pd.DataFrame(fractions, index=starts, columns=df.columns)
+
+    def visualize_missing_values(self, df: pd.DataFrame, scan: SharedScan = None):
+        """
+        Creates a heatmap of the missing value fraction per row bucket
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to be analysed
+        scan (SharedScan): A shared scan of df to read the null mask from, if one exists
+
+        Returns:
+        None: Displays a heatmap of missing values
+        """
+        import matplotlib.pyplot as plt
+
+        print("\nVisualizing Missing Values")
+        fractions = self.missing_fraction(df, scan)
+        plt.figure(figsize=(12, 8))
+        plt.imshow(fractions.to_numpy(), aspect="auto", interpolation="nearest", cmap="viridis", vmin=0, vmax=1)
+        plt.colorbar(label="fraction missing")
+        plt.xticks(range(len(fractions.columns)), fractions.columns, rotation=90)
+        plt.ylabel("row bucket")
+        plt.title("Missing values heatmap")
+        plt.show()
+
+
 # Example Usage
 if __name__ == "__main___":
     # Exampe usage of the SimpleMissingValuesAnalysis class.
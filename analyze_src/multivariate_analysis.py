@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import seaborn as sns
+
+from data_profile import SharedScan
+from dataset_handle import as_dataframe
 
 
 # Abstract base class for multivariate Analysis
@@ -15,11 +17,12 @@ class MultivariateAnalysisTemplate(ABC):
         perform a comprehensive multivariate analysis by generating a correlation heatmap and pair plot.
 
         Parameters:
-        df (pd.DataFrame): The datafrmae containing the data to be analyzed
+        df (pd.DataFrame): The datafrmae containing the data to be analyzed, or a dataset handle such as SharedDataset
 
         Returns:
         None: This method orchastrates the multivariate analysis process
         """
+        df = as_dataframe(df)
         self.generate_correlation_heatmap(df)
         self.generate_pairplot(df)
     
@@ -62,6 +65,9 @@ class SimpleMultivariateAnalysis(MultivariateAnalysisTemplate):
         Returns
         None: Displays a heatmap showing correlation between Numerical values
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(12, 10))
         sns.heatmap(df.corr(), annot=True, fmt=".2f", cmap="coolwarm")
         plt.title("correlation heatmap")
@@ -76,10 +82,166 @@ class SimpleMultivariateAnalysis(MultivariateAnalysisTemplate):
         Returns
         None: Displays a paiplot for the selected features
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         sns.pairplot(df)
         plt.suptitle("Pair plot of selected features", y=1.02)
         plt.show()
 
+# Concrete class for fast Multivariate Analysis on wide tables
+# ------------------------------------------------------------
+# Correlations come from float32 matrix products (BLAS) instead of a loop over
+# column pairs, optionally on a uniform row sample: a single product of the
+# standardised columns when nothing is missing, and four products of the
+# pairwise-complete sums otherwise. The pair plot only shows the target and
+# the features most correlated with it, with a cap on points per panel.
+class FastMultivariateAnalysis(MultivariateAnalysisTemplate):
+    def __init__(self, target: str = "SalePrice", top_k: int = 5, max_points: int = 2000,
+                 sample_size: int = None, seed: int = None):
+        """
+        Initialises the fast multivariate analysis
+
+        Parameters:
+        target (str): The column the pair plot features are selected against
+        top_k (int): Number of features, besides the target, shown in the pair plot
+        max_points (int): Maximum number of rows drawn in each pair plot panel
+        sample_size (int): If set, correlations are computed on a uniform sample of this many rows
+        seed (int): Seed for the row samples
+
+        Returns:
+        None
+        """
+        self.target = target
+        self.top_k = top_k
+        self.max_points = max_points
+        self.sample_size = sample_size
+        self.seed = seed
+
+    def _sample_rows(self, n_rows: int, size: int) -> np.ndarray:
+        if size is None or n_rows <= size:
+            return None
+        return np.sort(np.random.default_rng(self.seed).choice(n_rows, size=size, replace=False))
+
+    def _sample(self, df: pd.DataFrame, size: int) -> pd.DataFrame:
+        rows = self._sample_rows(len(df), size)
+        return df if rows is None else df.iloc[rows]
+
+    def analyze(self, df: pd.DataFrame):
+        """
+        Generates the correlation heatmap and pair plot from a single correlation pass
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the data to be analyzed, or a dataset handle such as SharedDataset
+
+        Returns:
+        None: This method orchestrates the multivariate analysis process
+        """
+        df = as_dataframe(df)
+        corr = self.correlation_matrix(df)
+        self.generate_correlation_heatmap(df, corr)
+        self.generate_pairplot(df, corr)
+
+    def correlation_matrix(self, df: pd.DataFrame, scan: SharedScan = None) -> pd.DataFrame:
+        """
+        Computes the correlation matrix of the numerical features
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the data to be analyzed
+        scan (SharedScan): A shared scan of df to read the numerical block from, if one exists
+
+        Returns:
+        pd.DataFrame: Pearson correlation between every pair of numerical features
+        """
+        if scan is not None:
+            columns = scan.numeric_columns
+            rows = self._sample_rows(len(df), self.sample_size)
+            values = scan.numeric_values if rows is None else scan.numeric_values[rows]
+            values = values.astype(np.float32)
+        else:
+            numeric = self._sample(df.select_dtypes(include="number"), self.sample_size)
+            columns = numeric.columns
+            values = numeric.to_numpy(dtype=np.float32, na_value=np.nan)
+        valid = ~np.isnan(values)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Centring and scaling first keeps float32 sums of large columns (e.g. PID) well conditioned
+            scaled = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0)
+            centered = np.where(valid, scaled, np.float32(0.0))
+            if valid.all():
+                norms = np.sqrt(np.einsum("ij,ij->j", centered, centered))
+                standardised = centered / norms
+                corr = standardised.T @ standardised
+            else:
+                # Pairwise-complete sums, as df.corr() uses, still as matrix products
+                mask = valid.astype(np.float32)
+                n = (mask.T @ mask).astype(np.float64)
+                sum_x = (centered.T @ mask).astype(np.float64)
+                sum_xx = ((centered * centered).T @ mask).astype(np.float64)
+                sum_xy = (centered.T @ centered).astype(np.float64)
+                cov = n * sum_xy - sum_x * sum_x.T
+                corr = cov / np.sqrt((n * sum_xx - sum_x * sum_x) * (n * sum_xx.T - sum_x.T * sum_x.T))
+        corr = np.clip(corr, -1.0, 1.0)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def select_features(self, df: pd.DataFrame, corr: pd.DataFrame = None) -> list:
+        """
+        Selects the target and the top_k features most correlated with it (by absolute value)
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the data to be analyzed
+        corr (pd.DataFrame): A correlation matrix from correlation_matrix, computed when not given
+
+        Returns:
+        list: The target followed by the selected feature names
+        """
+        corr = corr if corr is not None else self.correlation_matrix(df)
+        if self.target not in corr.columns:
+            raise ValueError(f"The target {self.target} is not a numerical column")
+        strength = corr[self.target].drop(self.target).abs().dropna()
+        return [self.target] + list(strength.nlargest(self.top_k).index)
+
+    def generate_correlation_heatmap(self, df: pd.DataFrame, corr: pd.DataFrame = None):
+        """
+        Generates and displays a correlation heatmap for the numerical features
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the data to be analyzed
+        corr (pd.DataFrame): A correlation matrix from correlation_matrix, computed when not given
+
+        Returns
+        None: Displays a heatmap showing correlation between Numerical values
+        """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        corr = corr if corr is not None else self.correlation_matrix(df)
+        plt.figure(figsize=(12, 10))
+        # Annotations are unreadable (and slow) past a couple of dozen columns
+        sns.heatmap(corr, annot=len(corr) <= 20, fmt=".2f", cmap="coolwarm")
+        plt.title("correlation heatmap")
+        plt.show()
+
+    def generate_pairplot(self, df: pd.DataFrame, corr: pd.DataFrame = None):
+        """
+        Generates and displays a pairplot of the target and its most correlated features
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the data to be analysed
+        corr (pd.DataFrame): A correlation matrix from correlation_matrix, computed when not given
+
+        Returns
+        None: Displays a paiplot for the selected features
+        """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        features = self.select_features(df, corr)
+        sns.pairplot(self._sample(df[features], self.max_points))
+        plt.suptitle(f"Pair plot of {self.target} and its top {self.top_k} correlated features", y=1.02)
+        plt.show()
+
+
 # Example Usage
 if __name__ == "__main___":
     # Exampe usage of the SimpleMultivariateAnalysis class.
@@ -91,5 +253,9 @@ if __name__ == "__main___":
     # multivariate_analyzer = SimpleMultivariateAnalysis()
     # Execute the multivariate analysis
     # multivariate_analyzer.analyze(selected_features)
+
+    # On wide tables, correlate everything and pair plot only the strongest features
+    # multivariate_analyzer = FastMultivariateAnalysis(target="SalePrice", top_k=5, max_points=2000)
+    # multivariate_analyzer.analyze(df)
     pass
         
\ No newline at end of file
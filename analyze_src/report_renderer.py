@@ -0,0 +1,210 @@
+import os
+import re
+import html
+import json
+import time
+import warnings
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+import pandas as pd
+
+from bivariate_analysis import (
+    CategoricalVsNumericalAnalysis,
+    DensityNumericalVsNumericalAnalysis,
+    NumericalVsNumericalAnalysis,
+)
+from dataset_handle import as_dataframe
+from missing_values_analysis import BinnedMissingValuesAnalysis
+from multivariate_analysis import FastMultivariateAnalysis
+from univariate_analysis import CategoricalUnivariateAnalysis, NumericalUnivariateAnalysis
+
+
+# Report plan
+# -----------
+# A figure task names one strategy method call, e.g. the `analyze` method of a
+# NumericalUnivariateAnalysis with ("SalePrice",). Every figure the call opens
+# is saved; nothing is shown.
+@dataclass
+class FigureTask:
+    name: str
+    strategy: object
+    method: str = "analyze"
+    args: tuple = ()
+
+
+@dataclass
+class FigureResult:
+    name: str
+    files: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str = None
+
+
+@dataclass
+class ReportResult:
+    output_dir: str
+    index_path: str
+    wall_seconds: float
+    figures: List[FigureResult] = field(default_factory=list)
+
+
+def default_eda_plan(df: pd.DataFrame, target: str = "SalePrice", scatter_limit: int = 20_000) -> List[FigureTask]:
+    """
+    Builds the full EDA plan: every feature against every applicable strategy
+
+    Parameters:
+    df (pd.DataFrame): The dataframe to be analysed
+    target (str): The numerical column the bivariate plots are drawn against
+    scatter_limit (int): Above this many rows, numerical pairs are drawn as density plots instead of scatter plots
+
+    Returns:
+    List[FigureTask]: Univariate plots for every column, bivariate plots against the target,
+        the missing values heatmap, the correlation heatmap and the pair plot
+    """
+    numeric = list(df.select_dtypes(include="number").columns)
+    categorical = [name for name in df.columns if name not in set(numeric)]
+
+    tasks = [FigureTask(f"univariate {name}", NumericalUnivariateAnalysis(), "analyze", (name,)) for name in numeric]
+    tasks += [FigureTask(f"univariate {name}", CategoricalUnivariateAnalysis(), "analyze", (name,)) for name in categorical]
+    if target in numeric:
+        pair_strategy = NumericalVsNumericalAnalysis() if len(df) <= scatter_limit else DensityNumericalVsNumericalAnalysis()
+        tasks += [
+            FigureTask(f"{name} vs {target}", pair_strategy, "analyze", (name, target))
+            for name in numeric if name != target
+        ]
+        tasks += [
+            FigureTask(f"{name} vs {target}", CategoricalVsNumericalAnalysis(), "analyze", (name, target))
+            for name in categorical
+        ]
+    tasks.append(FigureTask("missing values heatmap", BinnedMissingValuesAnalysis(), "visualize_missing_values"))
+    multivariate = FastMultivariateAnalysis(target=target)
+    tasks.append(FigureTask("correlation heatmap", multivariate, "generate_correlation_heatmap"))
+    if target in numeric:
+        tasks.append(FigureTask("pair plot", multivariate, "generate_pairplot"))
+    return tasks
+
+
+# Worker side
+# -----------
+# Each worker receives the dataframe once, through the pool initializer, and
+# draws on the non-interactive Agg backend. Given a dataset handle such as
+# SharedDataset, only the handle is pickled and each worker maps the columns.
+_WORKER_FRAME: pd.DataFrame = None
+
+
+def _init_worker(df: pd.DataFrame):
+    global _WORKER_FRAME
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend("Agg")
+    # plt.show() is a no-op on Agg; silence its "non-interactive" warning
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+    _WORKER_FRAME = as_dataframe(df)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower()
+
+
+def _render_task(task: FigureTask, output_dir: str, formats: tuple) -> FigureResult:
+    import matplotlib.pyplot as plt
+
+    result = FigureResult(task.name)
+    start = time.perf_counter()
+    try:
+        plt.close("all")
+        getattr(task.strategy, task.method)(_WORKER_FRAME, *task.args)
+        numbers = plt.get_fignums()
+        for i, number in enumerate(numbers):
+            suffix = f"_{i + 1}" if len(numbers) > 1 else ""
+            for extension in formats:
+                path = os.path.join(output_dir, f"{_slug(task.name)}{suffix}.{extension}")
+                plt.figure(number).savefig(path, bbox_inches="tight")
+                result.files.append(os.path.basename(path))
+    except Exception:
+        result.error = traceback.format_exc()
+    finally:
+        plt.close("all")
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+# Report renderer
+# ---------------
+def _write_index(output_dir: str, figures: List[FigureResult], wall_seconds: float) -> str:
+    rows = []
+    for figure in figures:
+        if figure.error is not None:
+            body = f"<pre>{html.escape(figure.error)}</pre>"
+        else:
+            # Preview the PNGs when there are any; every file is still linked from its preview
+            previews = [name for name in figure.files if name.endswith(".png")] or figure.files
+            body = "".join(
+                f'<a href="{html.escape(name)}"><img src="{html.escape(name)}" width="480"></a>'
+                for name in previews
+            )
+        rows.append(
+            f"<tr><td>{html.escape(figure.name)}</td><td>{figure.seconds:.2f}s</td><td>{body}</td></tr>"
+        )
+    page = (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>EDA report</title></head><body>\n"
+        f"<h1>EDA report</h1>\n<p>{len(figures)} figures rendered in {wall_seconds:.2f}s wall-clock.</p>\n"
+        "<table border=\"1\" cellpadding=\"4\">\n<tr><th>Figure</th><th>Time</th><th>Output</th></tr>\n"
+        + "\n".join(rows)
+        + "\n</table>\n</body></html>\n"
+    )
+    index_path = os.path.join(output_dir, "index.html")
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return index_path
+
+
+def render_report(
+    df: pd.DataFrame,
+    tasks: List[FigureTask] = None,
+    output_dir: str = "eda_report",
+    formats: tuple = ("png",),
+    max_workers: int = None,
+) -> ReportResult:
+    """
+    Renders an EDA plan headlessly in a process pool
+
+    Parameters:
+    df (pd.DataFrame): The dataframe to be analysed, or a dataset handle such as SharedDataset
+    tasks (List[FigureTask]): The figures to draw. Defaults to default_eda_plan(df).
+    output_dir (str): Directory the figures, index.html and timings.json are written to
+    formats (tuple): Image formats to save, e.g. ("png", "svg")
+    max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+    ReportResult: Paths, total wall-clock time and per-figure timings
+    """
+    tasks = tasks if tasks is not None else default_eda_plan(as_dataframe(df))
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(df,)) as executor:
+        futures = [executor.submit(_render_task, task, output_dir, tuple(formats)) for task in tasks]
+        figures = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - start
+
+    index_path = _write_index(output_dir, figures, wall_seconds)
+    with open(os.path.join(output_dir, "timings.json"), "w") as f:
+        json.dump({"wall_seconds": wall_seconds, "figures": [asdict(figure) for figure in figures]}, f, indent=2)
+    return ReportResult(output_dir, index_path, wall_seconds, figures)
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    #load the data
+    #df = pd.read_csv(...data/housing.csv)
+
+    # Render every feature x strategy figure to eda_report/index.html
+    # report = render_report(df, output_dir="eda_report", formats=("png", "svg"), max_workers=4)
+    # print(f"{len(report.figures)} figures in {report.wall_seconds:.1f}s")
+    pass
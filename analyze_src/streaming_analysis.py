@@ -0,0 +1,154 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from basic_data_inspection import DataInspectionStrategy, DataInspector
+from bivariate_analysis import Bi_Analysis, BivariateAnalysisStrategy
+from missing_values_analysis import SimpleMissingValuesAnalysis
+from multivariate_analysis import SimpleMultivariateAnalysis
+from streaming_stats import ReservoirSample, StreamingProfiler
+
+
+# Streaming EDA over an iterator of chunks
+# ----------------------------------------
+# Consumes the data once, keeping only mergeable accumulators (see
+# streaming_stats.py for their error bounds) and a fixed-size uniform sample.
+# Inspections and missing value counts read from the streamed profile,
+# univariate plots from the sketches, the correlation heatmap from the
+# streaming covariance, and the bivariate plots and pair plot are drawn from
+# the sample.
+class StreamingAnalysis:
+    def __init__(self, sample_size: int = 10_000, seed: int = None, **profiler_options):
+        """
+        Initialises the streaming analysis
+
+        Parameters:
+        sample_size (int): Number of rows kept in the uniform sample used for scatter, box and pair plots
+        seed (int): Seed for the sketches and the sample, for reproducible results
+        **profiler_options: Extra keyword arguments for StreamingProfiler (top_k, quantiles, sketch_k, ...)
+
+        Returns:
+        None
+        """
+        self.profiler = StreamingProfiler(seed=seed, **profiler_options)
+        self.reservoir = ReservoirSample(sample_size, seed)
+
+    def consume(self, chunks: Iterable[pd.DataFrame]) -> "StreamingAnalysis":
+        """
+        Streams every chunk through the accumulators
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): Chunks of rows, e.g. from ZipDataIngestion.ingest_chunks
+
+        Returns:
+        StreamingAnalysis: self, so calls can be chained
+        """
+        for chunk in chunks:
+            self.profiler.update(chunk)
+            self.reservoir.update(chunk)
+        return self
+
+    def merge(self, other: "StreamingAnalysis") -> "StreamingAnalysis":
+        """Adds the state of an analysis that consumed other chunks of the same data."""
+        self.profiler.merge(other.profiler)
+        self.reservoir.merge(other.reservoir)
+        return self
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        return self.reservoir.sample
+
+    def inspect(self, strategy: DataInspectionStrategy):
+        """
+        Runs a data inspection strategy against the streamed profile
+
+        Parameters:
+        strategy (DataInspectionStrategy): The inspection to run
+
+        Returns:
+        None: Prints the inspection results
+        """
+        DataInspector(strategy).execute_inspection(self.sample, self.profiler.profile())
+
+    def identify_missing_values(self):
+        """Prints the count of missing values in each column, from the streamed counts."""
+        SimpleMissingValuesAnalysis().identify_missing_values(self.sample, self.profiler.profile())
+
+    def univariate(self, feature: str, bins: int = 30):
+        """
+        Plots the distribution of a feature from the sketches
+
+        Parameters:
+        feature (str): The name of the feature/column to be analysed
+        bins (int): Number of histogram bins for a numerical feature
+
+        Returns:
+        None: Displays a histogram (numerical) or a bar plot of the most frequent values (categorical)
+        """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        plt.figure(figsize=(10, 6))
+        if feature in self.profiler.sketches:
+            sketch = self.profiler.sketches[feature]
+            i = self.profiler.numeric_columns.index(feature)
+            edges = np.linspace(self.profiler.moments.min[i], self.profiler.moments.max[i], bins + 1)
+            cdf = sketch.cdf(edges)
+            cdf[0] = 0.0
+            counts = np.diff(cdf) * sketch.n
+            plt.bar(edges[:-1], counts, width=np.diff(edges), align="edge", edgecolor="white")
+            plt.ylabel("Frequency")
+        else:
+            top = self.profiler.heavy_hitters[feature].top(self.profiler.heavy_hitters[feature].capacity)
+            plt.bar(top.index.astype(str), top.to_numpy(), color=sns.color_palette("muted", len(top)))
+            plt.ylabel("count")
+            plt.xticks(rotation=45)
+        plt.title(f"Distribution of {feature}")
+        plt.xlabel(feature)
+        plt.show()
+
+    def bivariate(self, strategy: BivariateAnalysisStrategy, feature1: str, feature2: str):
+        """
+        Runs a bivariate analysis strategy on the uniform sample
+
+        Parameters:
+        strategy (BivariateAnalysisStrategy): The strategy to be used
+        feature1 (str): The name of the first feature/column to be analysed.
+        feature2 (str): The name of the second feature/column to be analysed.
+
+        Returns:
+        None: Displays the strategy's plot
+        """
+        Bi_Analysis(strategy).execute_analysis(self.sample, feature1, feature2)
+
+    def correlation_heatmap(self):
+        """Displays a heatmap of the streamed correlation matrix of the numerical features."""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        plt.figure(figsize=(12, 10))
+        sns.heatmap(self.profiler.correlation(), annot=True, fmt=".2f", cmap="coolwarm")
+        plt.title("correlation heatmap")
+        plt.show()
+
+    def pairplot(self, features: list = None):
+        """Displays a pair plot of the selected features, drawn from the uniform sample."""
+        sample = self.sample[features] if features is not None else self.sample
+        SimpleMultivariateAnalysis().generate_pairplot(sample)
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    # Stream the data in chunks
+    # chunks = ZipDataIngestion().ingest_chunks("../data/archive.zip", chunksize=100_000)
+
+    # analysis = StreamingAnalysis(sample_size=10_000).consume(chunks)
+    # analysis.inspect(SummaryStatisticsInspection())
+    # analysis.identify_missing_values()
+    # analysis.univariate("SalePrice")
+    # analysis.bivariate(NumericalVsNumericalAnalysis(), "Gr Liv Area", "SalePrice")
+    # analysis.correlation_heatmap()
+    pass
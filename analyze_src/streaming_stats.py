@@ -0,0 +1,501 @@
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_profile import DataProfile
+
+
+# Streaming statistics for datasets larger than memory
+# -----------------------------------------------------
+# Every accumulator here consumes one chunk at a time through `update` and can
+# be combined with another accumulator of the same kind through `merge`, so
+# chunks can be processed in any order or in separate processes.
+#
+# Error bounds relative to the in-memory path (profile_dataframe, df.corr):
+# - RunningMoments: count, mean, std, min and max are exact up to floating
+#   point rounding (Chan et al. pairwise update of Welford's algorithm).
+# - StreamingCovariance: pairwise-complete correlations are exact up to
+#   floating point rounding, same definition as df.corr().
+# - QuantileSketch: a KLL-style compactor sketch. Each compaction at level h
+#   moves a rank by at most 2**h, so the rank error is at most
+#   levels / k of n in the worst case; with random compaction offsets it is
+#   typically below 1 / k (about 0.5% of n for k=200).
+# - HyperLogLog: distinct counts have a relative standard error of
+#   1.04 / sqrt(2**p), about 1.6% for p=12; small counts use linear counting
+#   and are close to exact.
+# - CountMinTopK: counts never underestimate and overestimate by at most
+#   e / width * n with probability 1 - exp(-depth) (0.13% of n, 98% for the
+#   defaults).
+# - ReservoirSample: a uniform sample without replacement of fixed size.
+def _hash_values(values: np.ndarray, hash_key: str = "0123456789123456") -> np.ndarray:
+    """Returns 64-bit hashes of non-null values. Numbers are hashed as float64 so int and float chunks agree."""
+    if values.dtype.kind in "iufb":
+        values = values.astype("float64")
+    else:
+        values = values.astype(str).astype(object)
+    return pd.util.hash_array(values, hash_key=hash_key, categorize=False)
+
+
+class RunningMoments:
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            new_mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + m2 + delta * delta * self.count * count / total, 0.0)
+        self.mean = new_mean
+        self.count = total
+        self.min = np.fmin(self.min, minimum)
+        self.max = np.fmax(self.max, maximum)
+
+    def update(self, values: np.ndarray):
+        """Adds a (rows x columns) float array; NaN marks missing values."""
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.where(valid, values, 0.0).sum(axis=0) / count, 0.0)
+            centered = np.where(valid, values - mean, 0.0)
+        m2 = (centered * centered).sum(axis=0)
+        minimum = np.where(valid, values, np.inf).min(axis=0, initial=np.inf)
+        maximum = np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+        self._combine(count, mean, m2, minimum, maximum)
+
+    def merge(self, other: "RunningMoments"):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def take(self, positions: Sequence[int]) -> "RunningMoments":
+        """Returns the accumulator of the given columns only."""
+        taken = RunningMoments(len(positions))
+        for name in ("count", "mean", "m2", "min", "max"):
+            setattr(taken, name, getattr(self, name)[positions])
+        return taken
+
+    @property
+    def std(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+
+class StreamingCovariance:
+    def __init__(self, n_columns: int):
+        self.shift = None
+        self.n = np.zeros((n_columns, n_columns))
+        self.sum_x = np.zeros((n_columns, n_columns))
+        self.sum_xx = np.zeros((n_columns, n_columns))
+        self.sum_xy = np.zeros((n_columns, n_columns))
+
+    def update(self, values: np.ndarray):
+        """Adds a (rows x columns) float array. Sums are kept per column pair over rows where both are present."""
+        valid = ~np.isnan(values)
+        if self.shift is None:
+            # Shifting by a rough centre keeps the raw sums from cancelling catastrophically.
+            # Columns without values in this chunk are shifted by 0.
+            count = valid.sum(axis=0)
+            self.shift = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(count, 1)
+        mask = valid.astype("float64")
+        x = np.where(valid, values - self.shift, 0.0)
+        self.n += mask.T @ mask
+        self.sum_x += x.T @ mask
+        self.sum_xx += (x * x).T @ mask
+        self.sum_xy += x.T @ x
+
+    def merge(self, other: "StreamingCovariance"):
+        if self.shift is None:
+            self.shift = other.shift
+        if other.shift is None:
+            return
+        # Re-express the other accumulator's sums around this shift
+        d = (other.shift - self.shift)[:, None]
+        other_sum_x = other.sum_x + d * other.n
+        self.sum_xx += other.sum_xx + 2 * d * other.sum_x + d * d * other.n
+        self.sum_xy += other.sum_xy + d * other.sum_x.T + other.sum_x * d.T + d * d.T * other.n
+        self.sum_x += other_sum_x
+        self.n += other.n
+
+    def take(self, positions: Sequence[int]) -> "StreamingCovariance":
+        """Returns the accumulator of the given columns only."""
+        taken = StreamingCovariance(len(positions))
+        taken.shift = None if self.shift is None else self.shift[positions]
+        grid = np.ix_(positions, positions)
+        for name in ("n", "sum_x", "sum_xx", "sum_xy"):
+            setattr(taken, name, getattr(self, name)[grid])
+        return taken
+
+    def correlation(self) -> np.ndarray:
+        """Returns the pairwise-complete Pearson correlation matrix."""
+        sum_y = self.sum_x.T
+        sum_yy = self.sum_xx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.n * self.sum_xy - self.sum_x * sum_y
+            var_x = self.n * self.sum_xx - self.sum_x * self.sum_x
+            var_y = self.n * sum_yy - sum_y * sum_y
+            corr = cov / np.sqrt(var_x * var_y)
+        return np.clip(corr, -1.0, 1.0)
+
+
+class QuantileSketch:
+    def __init__(self, k: int = 200, seed: int = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self.k:
+                items = np.sort(items)
+                # An odd item stays behind so the total weight is preserved exactly
+                keep, items = (items[-1:], items[:-1]) if len(items) % 2 else (np.empty(0), items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items, cumulative = self._weighted_items()
+        ranks = np.asarray(qs, dtype="float64") * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return items[positions]
+
+    def cdf(self, points: Sequence[float]) -> np.ndarray:
+        """Returns the approximate fraction of values <= each point."""
+        if self.n == 0:
+            return np.zeros(len(points))
+        items, cumulative = self._weighted_items()
+        positions = np.searchsorted(items, np.asarray(points, dtype="float64"), side="right")
+        below = np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0.0)
+        return below / cumulative[-1]
+
+
+class HyperLogLog:
+    def __init__(self, p: int = 12):
+        if not 11 <= p <= 16:
+            raise ValueError("HyperLogLog precision must be between 11 and 16")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        hashes = _hash_values(values)
+        index = (hashes & np.uint64((1 << self.p) - 1)).astype(np.intp)
+        remainder = hashes >> np.uint64(self.p)
+        # With p >= 11 the remaining 64 - p bits fit in a float64 mantissa, so frexp gives the exact bit length
+        _, bit_length = np.frexp(remainder.astype("float64"))
+        rank = (64 - self.p) - bit_length + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype("float64"))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class CountMinTopK:
+    def __init__(self, k: int = 5, width: int = 2048, depth: int = 4, capacity: int = None):
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity if capacity is not None else 4 * k
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.n = 0
+        self.candidates: Dict[object, int] = {}
+        self._hash_keys = [f"countminsketch{row:02d}" for row in range(depth)]
+
+    def _buckets(self, values: np.ndarray) -> np.ndarray:
+        return np.stack([
+            (_hash_values(values, key) % np.uint64(self.width)).astype(np.intp) for key in self._hash_keys
+        ])
+
+    def estimate(self, values: Sequence) -> np.ndarray:
+        values = np.asarray(values, dtype=object)
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        buckets = self._buckets(values)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+    def update(self, values: np.ndarray):
+        counts = pd.Series(values).value_counts()
+        if len(counts) == 0:
+            return
+        uniques = np.asarray(counts.index, dtype=object)
+        buckets = self._buckets(uniques)
+        for row in range(self.depth):
+            np.add.at(self.table[row], buckets[row], counts.to_numpy())
+        self.n += int(counts.sum())
+        self._refresh_candidates(list(self.candidates) + list(uniques))
+
+    def merge(self, other: "CountMinTopK"):
+        self.table += other.table
+        self.n += other.n
+        self._refresh_candidates(list(self.candidates) + list(other.candidates))
+
+    def _refresh_candidates(self, values: list):
+        values = list(dict.fromkeys(values))
+        estimates = self.estimate(values)
+        order = np.argsort(-estimates, kind="stable")[:self.capacity]
+        self.candidates = {values[i]: int(estimates[i]) for i in order}
+
+    def top(self, k: int = None) -> pd.Series:
+        k = k if k is not None else self.k
+        items = sorted(self.candidates.items(), key=lambda item: -item[1])[:k]
+        return pd.Series([count for _, count in items], index=[value for value, _ in items], dtype="int64")
+
+
+class ReservoirSample:
+    def __init__(self, size: int = 10_000, seed: int = None):
+        self.size = size
+        self.sample: pd.DataFrame = None
+        self._keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def _keep_smallest(self, frame: pd.DataFrame, keys: np.ndarray):
+        # Keeping the rows with the smallest uniform random keys is a uniform sample, and mergeable
+        if len(keys) > self.size:
+            chosen = np.argpartition(keys, self.size)[:self.size]
+            frame, keys = frame.iloc[chosen], keys[chosen]
+        self.sample = frame.reset_index(drop=True)
+        self._keys = keys
+
+    def update(self, chunk: pd.DataFrame):
+        keys = self._rng.random(len(chunk))
+        if self.sample is None:
+            self._keep_smallest(chunk, keys)
+        else:
+            self._keep_smallest(pd.concat([self.sample, chunk], ignore_index=True), np.concatenate([self._keys, keys]))
+
+    def merge(self, other: "ReservoirSample"):
+        if other.sample is None:
+            return
+        if self.sample is None:
+            self._keep_smallest(other.sample, other._keys)
+        else:
+            self._keep_smallest(
+                pd.concat([self.sample, other.sample], ignore_index=True),
+                np.concatenate([self._keys, other._keys]),
+            )
+
+
+# Streaming profiler
+# ------------------
+# Combines the accumulators above into a DataProfile, so the inspection
+# strategies in basic_data_inspection.py work unchanged on data that never
+# fits in memory at once.
+#
+# Without a schema the numerical/categorical split is read off the first
+# chunk, where a sparse column (e.g. Pool QC) may be all missing and parsed
+# as float. A column that later arrives with a non-numerical dtype is moved to
+# the categorical accumulators: values seen before the move still count
+# towards its non-null and distinct counts, but not towards its top values.
+class StreamingProfiler:
+    def __init__(
+        self,
+        top_k: int = 5,
+        quantiles: Sequence[float] = (0.25, 0.5, 0.75),
+        sketch_k: int = 200,
+        hll_precision: int = 12,
+        seed: int = None,
+    ):
+        self.top_k = top_k
+        self.quantiles = tuple(quantiles)
+        self.sketch_k = sketch_k
+        self.hll_precision = hll_precision
+        self.seed = seed
+        self.dtypes: pd.Series = None
+        self.numeric_columns: List[str] = []
+        self.categorical_columns: List[str] = []
+        self.n_rows = 0
+
+    def _start(self, chunk: pd.DataFrame):
+        self.dtypes = chunk.dtypes
+        self.numeric_columns = list(chunk.select_dtypes(include="number").columns)
+        self.categorical_columns = [name for name in chunk.columns if name not in set(self.numeric_columns)]
+        n = len(self.numeric_columns)
+        self.moments = RunningMoments(n)
+        self.covariance = StreamingCovariance(n)
+        self.sketches = {name: QuantileSketch(self.sketch_k, self.seed) for name in self.numeric_columns}
+        self.distinct = {name: HyperLogLog(self.hll_precision) for name in chunk.columns}
+        self.heavy_hitters = {name: CountMinTopK(self.top_k) for name in self.categorical_columns}
+        self.non_null = {name: 0 for name in self.categorical_columns}
+
+    def _to_categorical(self, names: List[str], dtypes: pd.Series):
+        """Moves numerical columns to the categorical accumulators, keeping their counts so far."""
+        moved = set(names)
+        keep = [i for i, name in enumerate(self.numeric_columns) if name not in moved]
+        for i, name in enumerate(self.numeric_columns):
+            if name in moved:
+                self.non_null[name] = int(self.moments.count[i])
+                self.heavy_hitters[name] = CountMinTopK(self.top_k)
+                del self.sketches[name]
+        self.moments = self.moments.take(keep)
+        self.covariance = self.covariance.take(keep)
+        self.numeric_columns = [self.numeric_columns[i] for i in keep]
+        self.categorical_columns = [name for name in self.dtypes.index if name not in set(self.numeric_columns)]
+        self.dtypes = self.dtypes.copy()
+        self.dtypes[names] = dtypes[names]
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingProfiler":
+        """Adds one chunk of rows."""
+        if self.dtypes is None:
+            self._start(chunk)
+        changed = [name for name in self.numeric_columns if not pd.api.types.is_numeric_dtype(chunk[name].dtype)]
+        if changed:
+            self._to_categorical(changed, chunk.dtypes)
+        self.n_rows += len(chunk)
+
+        values = chunk[self.numeric_columns].to_numpy(dtype="float64", na_value=np.nan)
+        self.moments.update(values)
+        self.covariance.update(values)
+        for i, name in enumerate(self.numeric_columns):
+            column = values[:, i]
+            column = column[~np.isnan(column)]
+            self.sketches[name].update(column)
+            self.distinct[name].update(column)
+
+        for name in self.categorical_columns:
+            column = chunk[name].dropna().to_numpy(dtype=object)
+            self.non_null[name] += len(column)
+            self.distinct[name].update(column)
+            self.heavy_hitters[name].update(column)
+        return self
+
+    def consume(self, chunks: Iterable[pd.DataFrame]) -> "StreamingProfiler":
+        """Adds every chunk of an iterator, e.g. ZipDataIngestion.ingest_chunks."""
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def merge(self, other: "StreamingProfiler") -> "StreamingProfiler":
+        """Adds the state of a profiler that saw other chunks of the same columns."""
+        if other.dtypes is None:
+            return self
+        if self.dtypes is None:
+            self._start(pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in other.dtypes.items()}))
+        # A column categorical on either side is categorical in the merge
+        changed = [name for name in self.numeric_columns if name in set(other.categorical_columns)]
+        if changed:
+            self._to_categorical(changed, other.dtypes)
+        positions = [other.numeric_columns.index(name) for name in self.numeric_columns]
+        self.n_rows += other.n_rows
+        self.moments.merge(other.moments.take(positions))
+        self.covariance.merge(other.covariance.take(positions))
+        for name in self.numeric_columns:
+            self.sketches[name].merge(other.sketches[name])
+        for name in self.categorical_columns:
+            if name in other.heavy_hitters:
+                self.non_null[name] += other.non_null[name]
+                self.heavy_hitters[name].merge(other.heavy_hitters[name])
+            else:
+                self.non_null[name] += int(other.moments.count[other.numeric_columns.index(name)])
+        for name, hll in self.distinct.items():
+            hll.merge(other.distinct[name])
+        return self
+
+    def correlation(self) -> pd.DataFrame:
+        """Returns the correlation matrix of the numerical columns."""
+        return pd.DataFrame(self.covariance.correlation(), index=self.numeric_columns, columns=self.numeric_columns)
+
+    def profile(self) -> DataProfile:
+        """Returns the DataProfile of everything seen so far."""
+        if self.dtypes is None:
+            raise ValueError("No chunks have been profiled yet")
+        has_values = self.moments.count > 0
+        numeric = {
+            "count": self.moments.count,
+            "mean": np.where(has_values, self.moments.mean, np.nan),
+            "std": self.moments.std,
+            "min": np.where(has_values, self.moments.min, np.nan),
+        }
+        sketch_quantiles = np.array([self.sketches[name].quantiles(self.quantiles) for name in self.numeric_columns])
+        for j, q in enumerate(self.quantiles):
+            numeric[f"{q:.0%}"] = sketch_quantiles[:, j] if len(self.numeric_columns) else np.empty(0)
+        numeric["max"] = np.where(has_values, self.moments.max, np.nan)
+        numeric = pd.DataFrame(numeric, index=self.numeric_columns)
+
+        rows = {}
+        top_values = {}
+        for name in self.categorical_columns:
+            top = self.heavy_hitters[name].top()
+            top.name = name
+            top_values[name] = top
+            rows[name] = {
+                "count": self.non_null[name],
+                "unique": int(round(self.distinct[name].estimate())),
+                "top": top.index[0] if len(top) else np.nan,
+                "freq": int(top.iloc[0]) if len(top) else np.nan,
+            }
+        categorical = pd.DataFrame.from_dict(rows, orient="index", columns=["count", "unique", "top", "freq"])
+
+        non_null = pd.concat([numeric["count"], categorical["count"]]).astype("int64").reindex(self.dtypes.index)
+        cardinality = pd.Series(
+            {name: int(round(hll.estimate())) for name, hll in self.distinct.items()}
+        ).reindex(self.dtypes.index)
+        columns = pd.DataFrame({
+            "dtype": self.dtypes,
+            "non_null": non_null,
+            "null_count": self.n_rows - non_null,
+            "cardinality": cardinality,
+        })
+        return DataProfile(
+            n_rows=self.n_rows,
+            columns=columns,
+            numeric=numeric,
+            categorical=categorical,
+            top_k=top_values,
+        )
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    # Stream the data in chunks
+    # chunks = ZipDataIngestion().ingest_chunks("../data/archive.zip", chunksize=100_000)
+
+    # Profile without holding the data in memory and inspect the profile
+    # profiler = StreamingProfiler().consume(chunks)
+    # inspector = DataInspector(SummaryStatisticsInspection())
+    # inspector.execute_inspection(None, profiler.profile())
+    pass
@@ -1,16 +1,24 @@
+import os
+import pickle
+import hashlib
+import weakref
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import seaborn as sns
+
+from data_profile import SharedScan
+from dataset_handle import as_dataframe
 
 
 # Abstract class for univariate analysis method
 # ---------------------------------------------
 # This class defines a common interface for univariate anaysis strategies
-# Subclasses must implement the Analyze method
+# Subclasses must implement the compute and draw methods: compute reduces the
+# feature to small aggregates (histogram counts, value counts, ...) and draw
+# plots those aggregates, so the aggregates can be cached and reused.
 class UnivariateAnalysisStrategy(ABC):
-    @abstractmethod
     def analyze(self, df: pd.DataFrame, feature: str):
         """
         Performs univariate analysis on a specific feature of the dataframe
@@ -18,7 +26,40 @@ class UnivariateAnalysisStrategy(ABC):
         Parameters:
         df (pd.DataFrame): The dataframe containing the data
         Feature (str) : The name of the feature/ column to be analysed
-        
+
+        Returns:
+        None: This method visualises the distribution of the feature
+        """
+        self.draw(self.compute(df, feature), feature)
+
+    def cache_key(self) -> tuple:
+        """Returns the strategy name and the parameters its aggregates depend on."""
+        return (type(self).__name__,) + tuple(sorted(vars(self).items()))
+
+    @abstractmethod
+    def compute(self, df: pd.DataFrame, feature: str, scan: SharedScan = None) -> dict:
+        """
+        Computes the aggregates needed to plot a feature
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the data
+        Feature (str) : The name of the feature/ column to be analysed
+        scan (SharedScan): A shared scan of df to read the column from, if one exists
+
+        Returns:
+        dict: The aggregates, independent of the size of the data
+        """
+        pass
+
+    @abstractmethod
+    def draw(self, aggregates: dict, feature: str):
+        """
+        Plots previously computed aggregates
+
+        Parameters:
+        aggregates (dict): The output of compute
+        Feature (str) : The name of the feature/ column to be analysed
+
         Returns:
         None: This method visualises the distribution of the feature
         """
@@ -28,21 +69,94 @@ class UnivariateAnalysisStrategy(ABC):
 # concrete strategy for numerical features
 # ----------------------------------------
 # This strategy analyses numerical features by plotting their Distribution
+# The KDE is a binned KDE: values are linearly binned onto a regular grid and
+# convolved with a Gaussian kernel through the FFT, which costs
+# O(n + grid log grid) instead of evaluating the kernel for every (value, grid) pair.
 class NumericalUnivariateAnalysis(UnivariateAnalysisStrategy):
-    def analyze(self, df: pd.DataFrame, feature: str):
+    def __init__(self, bins: int = 30, kde_grid: int = 512):
         """
-        Plots the distribution of numerical features using Histogram and KDE
+        Initialises the numerical strategy
+
+        Parameters:
+        bins (int): Number of histogram bins
+        kde_grid (int): Number of grid points the KDE is evaluated on
+
+        Returns:
+        None
+        """
+        self.bins = bins
+        self.kde_grid = kde_grid
+
+    def _binned_kde(self, values: np.ndarray):
+        low, high = values.min(), values.max()
+        # Scott's rule, the seaborn default
+        bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5) if len(values) > 1 else 0.0
+        if bandwidth == 0 or high == low:
+            return np.array([low]), np.array([0.0])
+
+        # Pad by three bandwidths so the tails are not cut off
+        low, high = low - 3 * bandwidth, high + 3 * bandwidth
+        grid = np.linspace(low, high, self.kde_grid)
+        step = grid[1] - grid[0]
+
+        # Linear binning: each value splits its weight between its two nearest grid points
+        position = (values - low) / step
+        left = np.floor(position).astype(int)
+        weight = position - left
+        counts = np.bincount(left, weights=1 - weight, minlength=self.kde_grid + 1)
+        counts += np.bincount(left + 1, weights=weight, minlength=self.kde_grid + 1)
+        counts = counts[:self.kde_grid]
+
+        # Circular convolution is safe because the padding keeps the wrapped-around mass negligible
+        size = 2 * self.kde_grid
+        offsets = np.fft.fftfreq(size, d=1 / size) * step
+        kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+        density = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel), size)[:self.kde_grid]
+        return grid, np.maximum(density, 0.0) / len(values)
+
+    def compute(self, df: pd.DataFrame, feature: str, scan: SharedScan = None) -> dict:
+        """
+        Computes histogram counts and a binned KDE of a numerical feature
 
         Parameters:
         df (pd.DataFrame): The dataframe containing the data
         Feature (str) : The name of the numerical feature/ column to be analysed
-        
+        scan (SharedScan): A shared scan of df to read the column from, if one exists
+
+        Returns:
+        dict: counts, edges, kde_x and kde_y (scaled to the histogram counts)
+        """
+        if scan is not None:
+            values = scan.numeric_column(feature)
+        else:
+            values = df[feature].to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)]
+        counts, edges = np.histogram(values, bins=self.bins)
+        kde_x, kde_y = self._binned_kde(values) if len(values) else (np.empty(0), np.empty(0))
+        # Scale the density to counts per histogram bin, as seaborn does for histplot(kde=True)
+        kde_y = kde_y * len(values) * (edges[1] - edges[0])
+        return {"counts": counts, "edges": edges, "kde_x": kde_x, "kde_y": kde_y}
+
+    def draw(self, aggregates: dict, feature: str):
+        """
+        Plots the distribution of numerical features using Histogram and KDE
+
+        Parameters:
+        aggregates (dict): The output of compute
+        Feature (str) : The name of the numerical feature/ column to be analysed
+
         Returns:
         None: Displays a histogram with a KDE plot.
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
 
+        edges = aggregates["edges"]
+        color = sns.color_palette()[0]
         plt.figure(figsize=(10, 6))
-        sns.histplot(df[feature], kde=True, bins=30)
+        plt.bar(edges[:-1], aggregates["counts"], width=np.diff(edges), align="edge",
+                color=color, alpha=0.5, edgecolor="white")
+        plt.plot(aggregates["kde_x"], aggregates["kde_y"], color=color)
         plt.title(f"Distribution of {feature}")
         plt.xlabel(feature)
         plt.ylabel("Frequency")
@@ -52,41 +166,158 @@ class NumericalUnivariateAnalysis(UnivariateAnalysisStrategy):
 # ----------------------------------------
 # This strategy analyses categorical features by plotting their  frequency Distribution
 class CategoricalUnivariateAnalysis(UnivariateAnalysisStrategy):
-    def analyze(self, df: pd.DataFrame, feature: str):
+    def compute(self, df: pd.DataFrame, feature: str, scan: SharedScan = None) -> dict:
         """
-        Plots distribution of a categorical feature using a bar plot
+        Counts the values of a categorical feature
 
         Parameters:
         df (pd.DataFrame): The dataframe containing the data
         Feature (str) : The name of the categorical feature/column to be analysed
-        
+        scan (SharedScan): A shared scan of df to read the category codes from, if one exists
+
+        Returns:
+        dict: counts, a pd.Series of counts in order of first appearance (category order for categoricals)
+        """
+        codes, uniques = (scan if scan is not None else SharedScan(df)).codes(feature)
+        counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(uniques)), index=uniques, name="count")
+        counts.index.name = feature
+        return {"counts": counts[counts > 0]}
+
+    def draw(self, aggregates: dict, feature: str):
+        """
+        Plots distribution of a categorical feature using a bar plot
+
+        Parameters:
+        aggregates (dict): The output of compute
+        Feature (str) : The name of the categorical feature/column to be analysed
+
         Returns:
-        None: Displays a bar plot showing the frequency of each category 
+        None: Displays a bar plot showing the frequency of each category
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
 
+        counts = aggregates["counts"]
         plt.figure(figsize=(10, 6))
-        sns.countplot(x=feature, data=df, palette="muted")
+        plt.bar(counts.index.astype(str), counts.to_numpy(), color=sns.color_palette("muted", len(counts)))
         plt.title(f"Distribution of {feature}")
         plt.xlabel(feature)
         plt.ylabel("count")
         plt.xticks(rotation=45)
         plt.show()
 
+
+# Memoized store of univariate aggregates
+# ---------------------------------------
+# Aggregates are keyed by the fingerprint of the column's data, the column
+# name and the strategy's parameters, so a column that did not change between
+# dataset versions is never recomputed. The store is a bounded LRU in memory
+# and can also persist entries to a directory to share them across sessions.
+def column_fingerprint(df: pd.DataFrame, feature: str) -> str:
+    """Returns a hash of a column's values and dtype."""
+    column = df[feature]
+    hashes = pd.util.hash_pandas_object(column, index=False).to_numpy()
+    sha = hashlib.sha256(hashes.tobytes())
+    sha.update(str(column.dtype).encode())
+    return sha.hexdigest()
+
+
+class AggregateStore:
+    def __init__(self, max_entries: int = 1024, cache_dir: str = None):
+        """
+        Initialises the aggregate store
+
+        Parameters:
+        max_entries (int): Number of aggregates kept in memory
+        cache_dir (str): If set, aggregates are also written to and read from this directory
+
+        Returns:
+        None
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._fingerprints = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def fingerprint(self, data, df: pd.DataFrame, feature: str) -> str:
+        """
+        Returns column_fingerprint(df, feature), hashing each column of a dataset object once
+
+        The hashes are remembered per object (id) and column until the object is garbage collected, so
+        repeated analyses of the same frame skip the O(n) pass. Frames modified in place in between
+        keep their old fingerprint; pass an explicit fingerprint for those.
+
+        Parameters:
+        data: The object the caller passed in: a DataFrame or a dataset handle
+        df (pd.DataFrame): data as a DataFrame
+        feature (str): The column
+
+        Returns:
+        str: The fingerprint
+        """
+        if id(data) not in self._fingerprints:
+            try:
+                # Ids are reused once the object is gone, so forget its hashes then
+                weakref.finalize(data, self._fingerprints.pop, id(data), None)
+            except TypeError:
+                # Objects without weak references are hashed every time
+                return column_fingerprint(df, feature)
+            self._fingerprints[id(data)] = {}
+        hashes = self._fingerprints[id(data)]
+        if feature not in hashes:
+            hashes[feature] = column_fingerprint(df, feature)
+        return hashes[feature]
+
+    def _path(self, key: tuple) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(repr(key).encode()).hexdigest() + ".pkl")
+
+    def get(self, key: tuple):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if self.cache_dir is not None and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as f:
+                aggregates = pickle.load(f)
+            self._remember(key, aggregates)
+            return aggregates
+        return None
+
+    def put(self, key: tuple, aggregates: dict):
+        self._remember(key, aggregates)
+        if self.cache_dir is not None:
+            with open(self._path(key), "wb") as f:
+                pickle.dump(aggregates, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _remember(self, key: tuple, aggregates: dict):
+        self._entries[key] = aggregates
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
 # Context class that uses a DataInspectionStrategy
 # ------------------------------------------------
 # Allows you to switch between different data inspection strategies
 class Analysis:
-    def __init__(self, strategy: UnivariateAnalysisStrategy):
+    def __init__(self, strategy: UnivariateAnalysisStrategy, store: AggregateStore = None):
         """
         Initialises the Analysis with a specific inspection
 
         Parameters:
         strategy (UnvariateAnalysisStrategyy): The strategy to be used
+        store (AggregateStore): Cache of computed aggregates. Share one store between
+            Analysis objects to reuse aggregates across strategies and datasets.
 
         Returns:
         None
         """
         self._strategy = strategy
+        self._store = store if store is not None else AggregateStore()
 
     def set_strategy(self, strategy: UnivariateAnalysisStrategy):
         """
@@ -100,17 +331,28 @@ class Analysis:
         """
         self._strategy = strategy
 
-    def execute_analysis(self, df: pd.DataFrame, feature: str):
+    def execute_analysis(self, df: pd.DataFrame, feature: str, fingerprint: str = None):
         """
         Executes the inspection using the current strategy.
 
         Parameters:
-        df (pd.DataFrames): The dataframe to be inspected.
+        df (pd.DataFrames): The dataframe to be inspected, or a dataset handle such as SharedDataset.
+        feature (str): The name of the feature/column to be analysed
+        fingerprint (str): Identifier of the dataset version, e.g. the archive hash from the
+            ingestion cache. When not given, the column's values are hashed once per frame (see
+            AggregateStore.fingerprint).
 
         Returns:
         None: Executes the strategys inspection method.
         """
-        self._strategy.analyze(df, feature)
+        data, df = df, as_dataframe(df, [feature])
+        fingerprint = fingerprint if fingerprint is not None else self._store.fingerprint(data, df, feature)
+        key = (fingerprint, feature) + self._strategy.cache_key()
+        aggregates = self._store.get(key)
+        if aggregates is None:
+            aggregates = self._strategy.compute(df, feature)
+            self._store.put(key, aggregates)
+        self._strategy.draw(aggregates, feature)
 
 # Example Usage
 if __name__ == "__main__":
@@ -126,4 +368,8 @@ if __name__ == "__main__":
     # Change strategy to summary Statistics and execute
     # inspector.set_strategy(NumericalUnivariateAnalysis)
     # inspector.execute_inspection(df)
+
+    # Share one store to reuse aggregates across analyses and dataset versions
+    # store = AggregateStore(cache_dir=".eda_aggregates")
+    # Analysis(NumericalUnivariateAnalysis(), store).execute_analysis(df, "SalePrice")
     pass
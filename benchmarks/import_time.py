@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+# Modules a short-lived worker imports for text-only work; none of them may pull in plotting libraries
+MODULES = [
+    "basic_data_inspection",
+    "data_profile",
+    "missing_values_analysis",
+    "univariate_analysis",
+    "bivariate_analysis",
+    "multivariate_analysis",
+    "streaming_stats",
+    "streaming_analysis",
+    "eda_plan",
+    "report_renderer",
+    "ingest_data",
+]
+HEAVY_MODULES = ["matplotlib", "matplotlib.pyplot", "seaborn"]
+
+_PROBE = """
+import json, sys, time
+sys.path[:0] = {path!r}
+start = time.perf_counter()
+import numpy, pandas
+baseline = time.perf_counter() - start
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"baseline": baseline, "seconds": seconds,
+                   "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+# Import-time budget
+# ------------------
+# Each module is imported in a fresh interpreter, after numpy and pandas so
+# that only the module's own cost is measured. A module fails the check when
+# it takes longer than the budget or leaves matplotlib or seaborn loaded.
+def measure_import(module: str, repeat: int = 3) -> dict:
+    """
+    Measures the import time of one module in fresh interpreters
+
+    Parameters:
+    module (str): The module name
+    repeat (int): Number of interpreters; the fastest import is reported
+
+    Returns:
+    dict: seconds (excluding numpy and pandas), baseline (numpy and pandas) and the heavy modules loaded
+    """
+    path = [os.path.join(REPO_ROOT, "src_"), os.path.join(REPO_ROOT, "analyze_src")]
+    code = _PROBE.format(path=path, module=module, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def check_budget(modules: List[str], budget: float, repeat: int = 3) -> List[str]:
+    """
+    Checks every module against the import-time budget
+
+    Parameters:
+    modules (List[str]): The modules to check
+    budget (float): Maximum seconds a module may add on top of numpy and pandas
+    repeat (int): Number of interpreters per module
+
+    Returns:
+    List[str]: One message per violation
+    """
+    violations = []
+    for module in modules:
+        run = measure_import(module, repeat)
+        print(f"{module:28s} {run['seconds'] * 1000:8.1f} ms  (numpy + pandas {run['baseline'] * 1000:.0f} ms)")
+        if run["seconds"] > budget:
+            violations.append(f"{module} took {run['seconds']:.3f}s to import, over the {budget:.3f}s budget")
+        if run["heavy"]:
+            violations.append(f"{module} imports {', '.join(run['heavy'])} at import time")
+    return violations
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of the analysis modules")
+    parser.add_argument("--budget", type=float, default=0.15, help="Seconds allowed on top of numpy and pandas")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args(argv)
+
+    violations = check_budget(args.modules, args.budget, args.repeat)
+    for message in violations:
+        print(f"OVER BUDGET {message}")
+    return 1 if violations else 0
+
+
+# Example Usage
+if __name__ == "__main__":
+    # python benchmarks/import_time.py --budget 0.15
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path[:0] = [os.path.join(REPO_ROOT, "src_"), BENCHMARK_DIR]
+
+from feature_engineering import ames_pipeline  # noqa: E402
+from prediction_engine import PredictionEngine  # noqa: E402
+from price_model import RidgeRegression  # noqa: E402
+from schema import get_schema  # noqa: E402
+from synthetic_data import AMES_CSV  # noqa: E402
+
+DEFAULT_BATCH_SIZES = [1, 16, 128, 1024]
+
+
+def load_records(path: str = AMES_CSV) -> List[dict]:
+    """Reads listings as csv.DictReader rows, the form a scoring request arrives in."""
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def train_engine(micro_batch: int = 256, path: str = AMES_CSV, alpha: float = 10.0) -> PredictionEngine:
+    """Fits the default Ames pipeline and a ridge model on the CSV and compiles them into an engine."""
+    schema = get_schema("ames_housing")
+    df = pd.read_csv(path, **schema.read_csv_options())
+    pipeline = ames_pipeline()
+    X, y = pipeline.fit_transform(df)
+    return PredictionEngine(pipeline, RidgeRegression(alpha).fit(X, y), batch_size=micro_batch)
+
+
+def dataframe_scorer(engine: PredictionEngine) -> Callable:
+    """The per-request DataFrame path the engine replaces: parse the request with the schema, then transform."""
+    read_options = get_schema("ames_housing").read_csv_options()
+
+    def score(records: List[dict]) -> np.ndarray:
+        text = io.StringIO()
+        writer = csv.DictWriter(text, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+        text.seek(0)
+        df = pd.read_csv(text, **read_options)
+        return engine.pipeline.inverse_target(engine.model.predict(engine.pipeline.transform(df)))
+
+    return score
+
+
+# Latency and throughput
+# ----------------------
+# Each request scores `batch_size` listings drawn from the Ames CSV. Latency is
+# the wall time of one request; throughput is listings scored per second over
+# all requests. A warm-up request runs first so one-off costs are excluded.
+def measure(score: Callable, records: List[dict], batch_size: int, n_requests: int, seed: int = 0) -> dict:
+    """
+    Times repeated scoring requests of one size
+
+    Parameters:
+    score (Callable): Function of a list of records returning predictions
+    records (List[dict]): The pool of listings to draw requests from
+    batch_size (int): Listings per request
+    n_requests (int): Number of timed requests
+    seed (int): Seed for drawing the requests
+
+    Returns:
+    dict: batch_size, requests, p50_ms, p99_ms, max_ms and rows_per_second
+    """
+    rng = np.random.default_rng(seed)
+    requests = [[records[i] for i in rng.integers(0, len(records), batch_size)] for _ in range(n_requests)]
+    score(requests[0])
+    latencies = np.empty(n_requests)
+    for i, request in enumerate(requests):
+        start = time.perf_counter()
+        score(request)
+        latencies[i] = time.perf_counter() - start
+    return {
+        "batch_size": batch_size,
+        "requests": n_requests,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "max_ms": float(latencies.max() * 1000),
+        "rows_per_second": float(batch_size * n_requests / latencies.sum()),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure prediction latency (p50/p99) and throughput")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per batch size")
+    parser.add_argument("--micro-batch", type=int, default=256, help="The engine's micro-batch size")
+    parser.add_argument("--compare-dataframe", action="store_true",
+                        help="Also time the per-request DataFrame path")
+    parser.add_argument("--max-p99-ms", type=float, default=None,
+                        help="Fail if any engine p99 is above this many milliseconds")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    records = load_records()
+    engine = train_engine(args.micro_batch)
+    scorers = {"engine": engine.predict_records}
+    if args.compare_dataframe:
+        scorers["dataframe"] = dataframe_scorer(engine)
+
+    results = []
+    print(f"{'path':10s} {'batch':>6s} {'p50 ms':>9s} {'p99 ms':>9s} {'rows/s':>10s}")
+    for batch_size in args.batch_sizes:
+        for path, score in scorers.items():
+            result = {"path": path, **measure(score, records, batch_size, args.requests)}
+            results.append(result)
+            print(f"{path:10s} {batch_size:6d} {result['p50_ms']:9.3f} {result['p99_ms']:9.3f} "
+                  f"{result['rows_per_second']:10.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.max_p99_ms is not None:
+        slow = [r for r in results if r["path"] == "engine" and r["p99_ms"] > args.max_p99_ms]
+        for result in slow:
+            print(f"OVER BUDGET batch {result['batch_size']}: p99 {result['p99_ms']:.3f} ms > {args.max_p99_ms} ms")
+        return 1 if slow else 0
+    return 0
+
+
+# Example Usage
+if __name__ == "__main__":
+    # python benchmarks/prediction_latency.py --batch-sizes 1 16 128 1024 --compare-dataframe
+    sys.exit(main())
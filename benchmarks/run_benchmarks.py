@@ -0,0 +1,324 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path[:0] = [os.path.join(REPO_ROOT, "src_"), os.path.join(REPO_ROOT, "analyze_src"), BENCHMARK_DIR]
+
+from basic_data_inspection import DataTypesInspection, SummaryStatisticsInspection  # noqa: E402
+from bivariate_analysis import (  # noqa: E402
+    BatchCategoricalVsNumericalAnalysis,
+    CategoricalVsNumericalAnalysis,
+    DensityNumericalVsNumericalAnalysis,
+    NumericalVsNumericalAnalysis,
+)
+from data_profile import profile_dataframe  # noqa: E402
+from eda_plan import EDAPlan  # noqa: E402
+from ingest_data import CompressedCSVIngestion, ParquetIngestion, ZipDataIngestion  # noqa: E402
+from missing_values_analysis import BinnedMissingValuesAnalysis, SimpleMissingValuesAnalysis  # noqa: E402
+from multivariate_analysis import FastMultivariateAnalysis, SimpleMultivariateAnalysis  # noqa: E402
+from synthetic_data import synthetic_ames, write_dataset  # noqa: E402
+from univariate_analysis import CategoricalUnivariateAnalysis, NumericalUnivariateAnalysis  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baselines", "baseline.json")
+DATA_DIR = os.path.join(BENCHMARK_DIR, ".data")
+
+# plt.show() is a no-op on Agg; silence its "non-interactive" warning
+warnings.filterwarnings("ignore", message=".*non-interactive.*")
+
+
+# Benchmark registry
+# ------------------
+# A benchmark is a function of a BenchmarkContext (the synthetic dataframe and
+# its files on disk). `max_rows` skips benchmarks whose cost is dominated by
+# drawing every row (e.g. scatter plots, the full missing values heatmap) at
+# sizes where they would take minutes.
+@dataclass
+class Benchmark:
+    name: str
+    function: Callable
+    max_rows: int = None
+
+
+@dataclass
+class BenchmarkContext:
+    df: object
+    paths: Dict[str, str]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rows: int
+    seconds: float
+    min_seconds: float
+    peak_mb: float
+    repeats: int
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, max_rows: int = None):
+    """Registers a benchmark function under a name."""
+    def decorator(function):
+        BENCHMARKS[name] = Benchmark(name, function, max_rows)
+        return function
+    return decorator
+
+
+def _draw(call, *args):
+    call(*args)
+    plt.close("all")
+
+
+# Ingestion
+@benchmark("ingest.zip")
+def _ingest_zip(ctx):
+    ZipDataIngestion().ingest(ctx.paths["zip"])
+
+
+@benchmark("ingest.zip.ames_schema")
+def _ingest_zip_schema(ctx):
+    ZipDataIngestion(schema="ames_housing").ingest(ctx.paths["zip"])
+
+
+@benchmark("ingest.csv")
+def _ingest_csv(ctx):
+    CompressedCSVIngestion().ingest(ctx.paths["csv"])
+
+
+@benchmark("ingest.csv.gz")
+def _ingest_gz(ctx):
+    CompressedCSVIngestion().ingest(ctx.paths["gz"])
+
+
+@benchmark("ingest.parquet")
+def _ingest_parquet(ctx):
+    if "parquet" in ctx.paths:
+        ParquetIngestion().ingest(ctx.paths["parquet"])
+
+
+# Inspection and missing values
+@benchmark("inspect.data_types")
+def _data_types(ctx):
+    DataTypesInspection().inspect(ctx.df)
+
+
+@benchmark("inspect.summary_statistics")
+def _summary_statistics(ctx):
+    SummaryStatisticsInspection().inspect(ctx.df)
+
+
+@benchmark("profile_dataframe")
+def _profile(ctx):
+    profile_dataframe(ctx.df)
+
+
+@benchmark("missing.identify")
+def _identify_missing(ctx):
+    SimpleMissingValuesAnalysis().identify_missing_values(ctx.df)
+
+
+@benchmark("missing.heatmap", max_rows=100_000)
+def _missing_heatmap(ctx):
+    _draw(SimpleMissingValuesAnalysis().visualize_missing_values, ctx.df)
+
+
+@benchmark("missing.binned_heatmap")
+def _binned_missing_heatmap(ctx):
+    _draw(BinnedMissingValuesAnalysis().visualize_missing_values, ctx.df)
+
+
+# Univariate and bivariate plots
+@benchmark("univariate.numerical")
+def _univariate_numerical(ctx):
+    _draw(NumericalUnivariateAnalysis().analyze, ctx.df, "SalePrice")
+
+
+@benchmark("univariate.categorical")
+def _univariate_categorical(ctx):
+    _draw(CategoricalUnivariateAnalysis().analyze, ctx.df, "Neighborhood")
+
+
+@benchmark("bivariate.scatter", max_rows=1_000_000)
+def _scatter(ctx):
+    _draw(NumericalVsNumericalAnalysis().analyze, ctx.df, "Gr Liv Area", "SalePrice")
+
+
+@benchmark("bivariate.density")
+def _density(ctx):
+    _draw(DensityNumericalVsNumericalAnalysis().analyze, ctx.df, "Gr Liv Area", "SalePrice")
+
+
+@benchmark("bivariate.boxplot", max_rows=1_000_000)
+def _boxplot(ctx):
+    _draw(CategoricalVsNumericalAnalysis().analyze, ctx.df, "Overall Qual", "SalePrice")
+
+
+@benchmark("bivariate.batch_summary")
+def _batch_summary(ctx):
+    BatchCategoricalVsNumericalAnalysis().summarize(ctx.df, "SalePrice")
+
+
+# Multivariate
+@benchmark("multivariate.simple_heatmap")
+def _simple_heatmap(ctx):
+    _draw(SimpleMultivariateAnalysis().generate_correlation_heatmap, ctx.df.select_dtypes(include="number"))
+
+
+@benchmark("multivariate.fast_heatmap")
+def _fast_heatmap(ctx):
+    _draw(FastMultivariateAnalysis().generate_correlation_heatmap, ctx.df)
+
+
+@benchmark("eda_plan.aggregates")
+def _eda_plan(ctx):
+    EDAPlan.full().run(ctx.df, render=False)
+
+
+# Runner
+# ------
+def _measure(function: Callable, ctx: BenchmarkContext, repeat: int):
+    # The inspections print their results; keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _measure_quietly(function, ctx, repeat)
+
+
+def _measure_quietly(function: Callable, ctx: BenchmarkContext, repeat: int):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function(ctx)
+        times.append(time.perf_counter() - start)
+    # One more run under tracemalloc for the peak; it slows the code down, so it is not timed
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), min(times), peak / 2**20
+
+
+def run_benchmarks(sizes: List[int], only: str = None, repeat: int = 3, seed: int = 0) -> List[BenchmarkResult]:
+    """
+    Runs every registered benchmark at every size
+
+    Parameters:
+    sizes (List[int]): Row counts of the synthetic datasets
+    only (str): If set, only benchmarks whose name contains this string are run
+    repeat (int): Number of timed runs; the median and the minimum are reported
+    seed (int): Seed of the synthetic data
+
+    Returns:
+    List[BenchmarkResult]: Median and minimum seconds and the peak traced memory of each benchmark
+    """
+    selected = [bench for name, bench in BENCHMARKS.items() if only is None or only in name]
+    results = []
+    for n_rows in sizes:
+        df = synthetic_ames(n_rows, seed)
+        paths = write_dataset(df, os.path.join(DATA_DIR, str(n_rows)))
+        ctx = BenchmarkContext(df, paths)
+        for bench in selected:
+            if bench.max_rows is not None and n_rows > bench.max_rows:
+                continue
+            seconds, min_seconds, peak_mb = _measure(bench.function, ctx, repeat)
+            result = BenchmarkResult(bench.name, n_rows, seconds, min_seconds, peak_mb, repeat)
+            print(f"{bench.name:32s} {n_rows:>10d} rows {seconds:10.4f}s {peak_mb:10.1f} MB", flush=True)
+            results.append(result)
+    return results
+
+
+def compare(results: List[BenchmarkResult], baseline: dict, threshold: float = 0.2) -> List[str]:
+    """
+    Compares results against a baseline
+
+    Parameters:
+    results (List[BenchmarkResult]): The new results
+    baseline (dict): A baseline written by save_results
+    threshold (float): Relative slowdown (or memory growth) above which a result is a regression
+
+    Returns:
+    List[str]: One message per regression
+    """
+    previous = {(entry["name"], entry["rows"]): entry for entry in baseline["results"]}
+    regressions = []
+    for result in results:
+        entry = previous.get((result.name, result.rows))
+        if entry is None:
+            continue
+        # The minimum is the least noisy estimate of the true cost
+        for metric, unit in (("min_seconds", "s"), ("peak_mb", " MB")):
+            old, new = entry[metric], getattr(result, metric)
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(
+                    f"{result.name} at {result.rows} rows: {metric} {old:.4f}{unit} -> {new:.4f}{unit} "
+                    f"(+{new / old - 1:.0%})"
+                )
+    return regressions
+
+
+def save_results(results: List[BenchmarkResult], path: str):
+    """Writes results, with the machine they ran on, as a JSON baseline."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion and EDA hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="Row counts of the synthetic datasets (10^3 to 10^7)")
+    parser.add_argument("--only", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative regression threshold")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with these results")
+    parser.add_argument("--output", help="Also write these results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.only, args.repeat)
+    if args.output:
+        save_results(results, args.output)
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+# Example Usage
+if __name__ == "__main__":
+    # python benchmarks/run_benchmarks.py --sizes 1000 100000 --save-baseline
+    # python benchmarks/run_benchmarks.py --sizes 1000 100000 --threshold 0.2
+    sys.exit(main())
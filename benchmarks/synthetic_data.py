@@ -0,0 +1,93 @@
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AMES_CSV = os.path.join(REPO_ROOT, "analyze_src", "extracted_data", "AmesHousing.csv")
+
+
+# Synthetic Ames-shaped data
+# --------------------------
+# Rows are bootstrapped from the real AmesHousing.csv, whole rows at a time,
+# so every column keeps its dtype, null rate and value distribution, and the
+# columns keep their correlations. The identifiers (Order, PID) are renumbered
+# so they stay unique. Note that at 10^7 rows the frame takes several GB.
+def synthetic_ames(n_rows: int, seed: int = 0, source: str = AMES_CSV) -> pd.DataFrame:
+    """
+    Generates an Ames-shaped dataframe
+
+    Parameters:
+    n_rows (int): Number of rows to generate
+    seed (int): Seed for the row sampling
+    source (str): Path of the AmesHousing.csv the rows are sampled from
+
+    Returns:
+    pd.DataFrame: A dataframe with the columns and dtypes of the source
+    """
+    ames = pd.read_csv(source)
+    rows = np.random.default_rng(seed).integers(0, len(ames), size=n_rows)
+
+    columns = {}
+    for name in ames.columns:
+        column = ames[name]
+        if pd.api.types.is_numeric_dtype(column):
+            columns[name] = column.to_numpy()[rows]
+        else:
+            # Sample the codes rather than the strings, then decode once
+            codes, uniques = pd.factorize(column, use_na_sentinel=True)
+            sampled = pd.Categorical.from_codes(codes[rows], uniques)
+            columns[name] = pd.Series(sampled).astype(column.dtype).to_numpy()
+    df = pd.DataFrame(columns)
+    if "Order" in df:
+        df["Order"] = np.arange(1, n_rows + 1)
+    if "PID" in df:
+        df["PID"] = ames["PID"].min() + np.arange(n_rows)
+    return df
+
+
+def write_dataset(df: pd.DataFrame, directory: str, formats: tuple = ("csv", "zip", "gz", "parquet")) -> dict:
+    """
+    Writes a dataframe in each of the formats the ingestors read
+
+    Parameters:
+    df (pd.DataFrame): The dataframe to write
+    directory (str): Directory the files are written to
+    formats (tuple): Any of "csv", "zip", "gz" and "parquet" (skipped without pyarrow)
+
+    Returns:
+    dict: Path of each written file, keyed by format
+    """
+    os.makedirs(directory, exist_ok=True)
+    if "PID" in df and pd.api.types.is_integer_dtype(df["PID"]):
+        # The source file zero-pads PID to 10 characters, which the ames_housing schema checks
+        df = df.assign(PID=df["PID"].map("{:010d}".format))
+    paths = {}
+    csv_path = os.path.join(directory, "AmesHousing.csv")
+    df.to_csv(csv_path, index=False)
+    if "csv" in formats:
+        paths["csv"] = csv_path
+    if "zip" in formats:
+        paths["zip"] = os.path.join(directory, "archive.zip")
+        with zipfile.ZipFile(paths["zip"], "w", compression=zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.write(csv_path, "AmesHousing.csv")
+    if "gz" in formats:
+        paths["gz"] = os.path.join(directory, "AmesHousing.csv.gz")
+        df.to_csv(paths["gz"], index=False, compression="gzip")
+    if "parquet" in formats:
+        try:
+            paths["parquet"] = os.path.join(directory, "AmesHousing.parquet")
+            df.to_parquet(paths["parquet"], index=False)
+        except ImportError:
+            paths.pop("parquet")
+    return paths
+
+
+# Example Usage
+if __name__ == "__main__":
+    # Example
+
+    # df = synthetic_ames(100_000)
+    # paths = write_dataset(df, "benchmarks/.data/100000")
+    pass
@@ -0,0 +1,158 @@
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from ingest_data import DataIngestorFactory
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+
+# Per-archive outcome of a batch
+# ------------------------------
+@dataclass
+class ArchiveReport:
+    path: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: str = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchIngestionResult:
+    frame: pd.DataFrame
+    reports: List[ArchiveReport] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[ArchiveReport]:
+        return [report for report in self.reports if not report.ok]
+
+
+# Worker side
+# -----------
+# Workers send back columnar buffers instead of a pickled DataFrame: an Arrow
+# IPC stream when pyarrow is installed, otherwise one NumPy array per column
+# (pickle protocol 5 ships those as raw buffers).
+def _frame_to_buffers(df: pd.DataFrame):
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return {name: df[name].to_numpy() for name in df.columns}
+
+
+def _buffers_to_frame(buffers) -> pd.DataFrame:
+    if pa is not None and isinstance(buffers, pa.Buffer):
+        return pa.ipc.open_stream(buffers).read_all().to_pandas()
+    return pd.DataFrame(buffers)
+
+
+def _ingest_archive(path: str, ingestor_options: dict):
+    """Ingests one archive in a worker process and never raises, so one bad archive cannot sink the batch."""
+    start = time.perf_counter()
+    try:
+        ingestor = DataIngestorFactory.get_data_ingestor_for_path(path, **ingestor_options)
+        df = ingestor.ingest(path)
+        return _frame_to_buffers(df), len(df), time.perf_counter() - start, None
+    except Exception:
+        return None, 0, time.perf_counter() - start, traceback.format_exc()
+
+
+def align_categories(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """Gives categorical columns the union of their categories so pd.concat keeps them categorical."""
+    for name in frames[0].columns:
+        columns = [frame[name] for frame in frames if name in frame.columns]
+        if not all(isinstance(column.dtype, pd.CategoricalDtype) for column in columns):
+            continue
+        categories = pd.api.types.union_categoricals(columns).categories
+        for frame in frames:
+            if name in frame.columns:
+                frame[name] = frame[name].cat.set_categories(categories)
+    return frames
+
+
+# Batch ingestor
+# --------------
+# Fans archives out to a process pool and combines the successful ones in the
+# order the paths were given, whatever order the workers finish in.
+class BatchIngestor:
+    def __init__(self, max_workers: int = None, source_column: str = None, **ingestor_options):
+        """
+        Initialises the batch ingestor.
+
+        Parameters:
+        max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+        source_column (str): If set, a column of this name records the archive each row came from.
+        **ingestor_options: Keyword arguments used to build each archive's ingestor (e.g. schema)
+
+        Returns:
+        None
+        """
+        self.max_workers = max_workers
+        self.source_column = source_column
+        self.ingestor_options = ingestor_options
+
+    def ingest(self, file_paths: List[str]) -> BatchIngestionResult:
+        """
+        Ingests many archives in parallel.
+
+        Parameters:
+        file_paths (List[str]): Archives (or any registered file type) to ingest
+
+        Returns:
+        BatchIngestionResult: The combined DataFrame in input order and one report per archive
+        """
+        reports = [ArchiveReport(path) for path in file_paths]
+        frames = [None] * len(file_paths)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(_ingest_archive, path, self.ingestor_options)
+                for path in file_paths
+            ]
+            for i, future in enumerate(futures):
+                try:
+                    buffers, rows, seconds, error = future.result()
+                except Exception:
+                    # The worker process itself died (e.g. killed for memory)
+                    buffers, rows, seconds, error = None, 0, 0.0, traceback.format_exc()
+                reports[i].rows = rows
+                reports[i].seconds = seconds
+                reports[i].error = error
+                if error is None:
+                    frames[i] = _buffers_to_frame(buffers)
+
+        frames = [
+            self._tag(frame, report.path) for frame, report in zip(frames, reports)
+            if frame is not None
+        ]
+        combined = pd.concat(align_categories(frames), ignore_index=True) if frames else pd.DataFrame()
+        return BatchIngestionResult(combined, reports)
+
+    def _tag(self, df: pd.DataFrame, path: str) -> pd.DataFrame:
+        if self.source_column is not None:
+            df[self.source_column] = np.full(len(df), path, dtype=object)
+        return df
+
+
+# Example usage:
+if __name__ == "__main__":
+    # batch_ingestor = BatchIngestor(max_workers=4, source_column="source", schema="ames_housing")
+    # result = batch_ingestor.ingest(sorted(glob.glob("../data/*.zip")))
+    # for report in result.reports:
+    #     print(report.path, report.rows, f"{report.seconds:.2f}s", "ok" if report.ok else report.error)
+    # df = result.frame
+    pass
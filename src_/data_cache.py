@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+
+import pandas as pd
+
+from ingest_data import DataIngestor
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+    feather = None
+
+
+# Columnar frame storage
+# ----------------------
+# Frames are written as uncompressed Feather in a single record batch and read
+# through a memory map, so loading makes one copy of each column rather than
+# reading the file into Arrow memory first. With zero_copy, numerical columns
+# without missing values are returned as read-only views of the map instead,
+# and loading costs little more than the page faults for the columns touched.
+FRAME_EXTENSION = ".feather" if feather is not None else ".pkl"
+
+
+def write_frame(df: pd.DataFrame, path: str):
+    """Atomically writes a DataFrame as uncompressed Feather, or as a pickle without pyarrow."""
+    tmp_path = path + ".tmp"
+    if feather is not None:
+        table = pa.Table.from_pandas(df)
+        # One record batch keeps columns contiguous, which zero-copy reads need
+        feather.write_feather(table, tmp_path, compression="uncompressed", chunksize=max(len(df), 1))
+    else:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def read_frame(path: str, zero_copy: bool = False) -> pd.DataFrame:
+    """
+    Reads a DataFrame written by write_frame
+
+    Parameters:
+    path (str): Path of the file
+    zero_copy (bool): Return numerical columns without missing values as read-only views of the
+        memory-mapped Feather file; in-place assignment to them raises. Other columns are copied.
+
+    Returns:
+    pd.DataFrame: The frame
+    """
+    if path.endswith(".feather"):
+        table = feather.read_table(path, memory_map=True)
+        if zero_copy:
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        return table.to_pandas()
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# Content-addressed cache for ingested datasets
+# ---------------------------------------------
+# Wraps any DataIngestor. The cache key is the SHA-256 of the source file plus
+# the ingestor's read options, so a changed archive or changed options always
+# misses. Entries are stored as uncompressed Feather files (read through a
+# memory map) when pyarrow is installed, and as pickles otherwise. Hits are
+# copied out of the map, so callers may modify the returned frame.
+class CachedDataIngestor(DataIngestor):
+    INDEX_FILE = "index.json"
+
+    def __init__(self, ingestor: DataIngestor, cache_dir: str = ".ingest_cache", max_bytes: int = 2 * 1024**3):
+        """
+        Initialises the cache around an existing ingestor.
+
+        Parameters:
+        ingestor (DataIngestor): The ingestor used on a cache miss
+        cache_dir (str): Directory holding the cached files and the index
+        max_bytes (int): Total size the cache may grow to before the least recently used entries are evicted
+
+        Returns:
+        None
+        """
+        self.ingestor = ingestor
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    # Index handling
+    # --------------
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"entries": {}, "digests": {}}
+
+    def _save_index(self):
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self._index_path())
+
+    # Keys
+    # ----
+    def _file_digest(self, file_path: str) -> str:
+        """Returns the SHA-256 of a file, reusing the last digest while size and mtime are unchanged."""
+        stat = os.stat(file_path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        known = self._index["digests"].get(file_path)
+        if known is not None and known["signature"] == signature:
+            return known["sha256"]
+
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+        self._index["digests"][file_path] = {"signature": signature, "sha256": digest}
+        return digest
+
+    def _options_key(self) -> str:
+        # Underscore attributes are per-run state (e.g. the last memory report), not read options
+        settings = {name: value for name, value in vars(self.ingestor).items() if not name.startswith("_")}
+        options = {"ingestor": type(self.ingestor).__name__, "options": settings}
+        return json.dumps(options, sort_keys=True, default=repr)
+
+    def cache_key(self, file_path: str) -> str:
+        """
+        Returns the cache key for a source file.
+
+        Parameters:
+        file_path (str): Path to the source file
+
+        Returns:
+        str: Hex digest of the file contents combined with the read options
+        """
+        file_path = os.path.abspath(file_path)
+        sha = hashlib.sha256()
+        sha.update(self._file_digest(file_path).encode())
+        sha.update(self._options_key().encode())
+        return sha.hexdigest()
+
+    # Storage
+    # -------
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + FRAME_EXTENSION)
+
+    # Public API
+    # ----------
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """
+        Returns the DataFrame for a file, parsing it only on a cache miss.
+
+        Parameters:
+        file_path (str): Path to the source file
+
+        Returns:
+        pd.DataFrame: The ingested data
+        """
+        key = self.cache_key(file_path)
+        entry = self._index["entries"].get(key)
+        if entry is not None and os.path.exists(entry["path"]):
+            entry["last_access"] = time.time()
+            self._save_index()
+            return read_frame(entry["path"])
+
+        df = self.ingestor.ingest(file_path)
+        path = self._entry_path(key)
+        write_frame(df, path)
+        self._index["entries"][key] = {
+            "path": path,
+            "source": os.path.abspath(file_path),
+            "size": os.path.getsize(path),
+            "last_access": time.time(),
+        }
+        self._evict()
+        self._save_index()
+        return df
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = self._index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]["size"]
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._index["entries"].pop(key)
+        if os.path.exists(entry["path"]):
+            os.remove(entry["path"])
+
+    def invalidate(self, file_path: str = None) -> int:
+        """
+        Drops cached entries.
+
+        Parameters:
+        file_path (str): Drop only the entries built from this source file. Drops everything when None.
+
+        Returns:
+        int: Number of entries removed
+        """
+        source = os.path.abspath(file_path) if file_path is not None else None
+        keys = [
+            key for key, entry in self._index["entries"].items()
+            if source is None or entry["source"] == source
+        ]
+        for key in keys:
+            self._remove(key)
+        if source is None:
+            self._index["digests"] = {}
+        else:
+            self._index["digests"].pop(source, None)
+        self._save_index()
+        return len(keys)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # from ingest_data import ZipDataIngestion
+    # cached_ingestor = CachedDataIngestor(ZipDataIngestion(), cache_dir=".ingest_cache")
+    # df = cached_ingestor.ingest("../data/archive.zip")  # parses the CSV
+    # df = cached_ingestor.ingest("../data/archive.zip")  # reads the cached copy
+    # cached_ingestor.invalidate("../data/archive.zip")
+    pass
@@ -0,0 +1,405 @@
+import os
+import operator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ingest_data import DataIngestor
+
+
+# Rule context
+# ------------
+# Converts each column a rule reads to a NumPy array once per evaluation, so
+# rules that share a column share the conversion.
+class RuleContext:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._values = {}
+
+    def values(self, name: str) -> np.ndarray:
+        """Returns a column as float64, with NaN for missing values."""
+        if name not in self._values:
+            self._values[name] = self.df[name].to_numpy(dtype="float64", na_value=np.nan)
+        return self._values[name]
+
+
+# Data quality rules
+# ------------------
+# Each rule declares what a bad row looks like and evaluates to a boolean
+# violation mask with one vectorized expression over whole columns. Missing
+# values never violate a rule except NotNullRule. Rules with severity "error"
+# mark rows for quarantine; "warning" rules are only counted.
+@dataclass(frozen=True)
+class Rule(ABC):
+    name: str
+
+    @property
+    def severity(self) -> str:
+        return "error"
+
+    @abstractmethod
+    def columns(self) -> Tuple[str, ...]:
+        """Returns the columns the rule reads."""
+        pass
+
+    @abstractmethod
+    def violations(self, context: RuleContext) -> np.ndarray:
+        """
+        Evaluates the rule
+
+        Parameters:
+        context (RuleContext): The frame being validated, with its converted columns
+
+        Returns:
+        np.ndarray: Boolean mask, True for rows that violate the rule
+        """
+        pass
+
+
+@dataclass(frozen=True)
+class RangeRule(Rule):
+    column: str = None
+    min: float = None
+    max: float = None
+    level: str = "error"
+
+    @property
+    def severity(self) -> str:
+        return self.level
+
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def violations(self, context: RuleContext) -> np.ndarray:
+        values = context.values(self.column)
+        mask = np.zeros(len(values), dtype=bool)
+        # Comparisons with NaN are False, so missing values never violate
+        if self.min is not None:
+            mask |= values < self.min
+        if self.max is not None:
+            mask |= values > self.max
+        return mask
+
+
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+
+
+@dataclass(frozen=True)
+class CompareRule(Rule):
+    left: str = None
+    op: str = "<="
+    right: str = None
+    offset: float = 0.0
+    level: str = "error"
+
+    @property
+    def severity(self) -> str:
+        return self.level
+
+    def columns(self) -> Tuple[str, ...]:
+        return (self.left, self.right)
+
+    def violations(self, context: RuleContext) -> np.ndarray:
+        """Flags rows where `left op right + offset` does not hold."""
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown comparison operator: {self.op}")
+        left, right = context.values(self.left), context.values(self.right) + self.offset
+        holds = _OPERATORS[self.op](left, right)
+        return ~holds & ~np.isnan(left) & ~np.isnan(right)
+
+
+@dataclass(frozen=True)
+class AllowedValuesRule(Rule):
+    column: str = None
+    values: Tuple[str, ...] = ()
+    level: str = "error"
+
+    @property
+    def severity(self) -> str:
+        return self.level
+
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def violations(self, context: RuleContext) -> np.ndarray:
+        column = context.df[self.column]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Check each category once, then look the answer up by code
+            allowed = np.append(column.cat.categories.isin(self.values), True)
+            return ~allowed[column.cat.codes.to_numpy()]
+        return ~(column.isin(self.values).to_numpy() | column.isna().to_numpy())
+
+
+@dataclass(frozen=True)
+class NotNullRule(Rule):
+    column: str = None
+    level: str = "error"
+
+    @property
+    def severity(self) -> str:
+        return self.level
+
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def violations(self, context: RuleContext) -> np.ndarray:
+        return context.df[self.column].isna().to_numpy()
+
+
+@dataclass(frozen=True)
+class OutlierRule(Rule):
+    column: str = None
+    k: float = 3.0
+    level: str = "warning"
+
+    @property
+    def severity(self) -> str:
+        return self.level
+
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def violations(self, context: RuleContext) -> np.ndarray:
+        """Flags values more than k interquartile ranges outside the quartiles."""
+        values = context.values(self.column)
+        if np.isnan(values).all():
+            return np.zeros(len(values), dtype=bool)
+        # nanquantile selects by partitioning, which is linear in the row count
+        q1, q3 = np.nanquantile(values, [0.25, 0.75])
+        reach = self.k * (q3 - q1)
+        return (values < q1 - reach) | (values > q3 + reach)
+
+
+@dataclass(frozen=True)
+class ExpressionRule(Rule):
+    expression: str = None
+    level: str = "error"
+
+    @property
+    def severity(self) -> str:
+        return self.level
+
+    def columns(self) -> Tuple[str, ...]:
+        return ()
+
+    def violations(self, context: RuleContext) -> np.ndarray:
+        """Flags rows where a DataFrame.eval expression (which describes valid rows) is False."""
+        valid = context.df.eval(self.expression)
+        return ~np.asarray(valid, dtype=bool)
+
+
+# Validation report
+# -----------------
+@dataclass
+class ValidationReport:
+    n_rows: int
+    masks: pd.DataFrame
+    severities: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def counts(self) -> pd.Series:
+        """Number of violating rows per rule."""
+        return self.masks.sum().astype("int64")
+
+    @property
+    def invalid(self) -> np.ndarray:
+        """Boolean mask of the rows that violate at least one error rule."""
+        errors = [name for name, severity in self.severities.items() if severity == "error"]
+        if not errors:
+            return np.zeros(self.n_rows, dtype=bool)
+        return self.masks[errors].to_numpy().any(axis=1)
+
+    def summary(self) -> pd.DataFrame:
+        """Returns the severity, violation count and violation rate of every rule."""
+        counts = self.counts
+        return pd.DataFrame({
+            "severity": pd.Series(self.severities),
+            "violations": counts,
+            "rate": counts / self.n_rows if self.n_rows else 0.0,
+        })
+
+    def failed_rules(self, rows: np.ndarray) -> pd.Series:
+        """Returns, for the given row positions, the names of the rules each row violates."""
+        masks = self.masks.to_numpy()[rows]
+        names = np.asarray(self.masks.columns)
+        return pd.Series([", ".join(names[row]) for row in masks], index=rows)
+
+
+# Rule set
+# --------
+# A named collection of rules. Missing columns are reported as a ValueError
+# up front rather than as a KeyError halfway through.
+@dataclass(frozen=True)
+class RuleSet:
+    name: str
+    rules: Tuple[Rule, ...] = field(default_factory=tuple)
+
+    def evaluate(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        Evaluates every rule against a dataframe
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to be validated
+
+        Returns:
+        ValidationReport: Per-rule violation masks, counts and severities
+        """
+        missing = sorted({name for rule in self.rules for name in rule.columns() if name not in df.columns})
+        if missing:
+            raise ValueError(f"Columns required by the {self.name} rules are missing: {missing}")
+        context = RuleContext(df)
+        masks = {rule.name: rule.violations(context) for rule in self.rules}
+        return ValidationReport(
+            n_rows=len(df),
+            masks=pd.DataFrame(masks, index=df.index, columns=[rule.name for rule in self.rules]),
+            severities={rule.name: rule.severity for rule in self.rules},
+        )
+
+
+# Rule set registry
+# -----------------
+RULE_SET_REGISTRY: Dict[str, RuleSet] = {}
+
+
+def register_rule_set(rule_set: RuleSet) -> RuleSet:
+    """Adds a rule set to the registry and returns it."""
+    RULE_SET_REGISTRY[rule_set.name] = rule_set
+    return rule_set
+
+
+def get_rule_set(rule_set) -> RuleSet:
+    """Returns a registered rule set by name, or the rule set itself if one is passed."""
+    if isinstance(rule_set, RuleSet):
+        return rule_set
+    if rule_set not in RULE_SET_REGISTRY:
+        raise ValueError(f"No rule set registered under the name: {rule_set}")
+    return RULE_SET_REGISTRY[rule_set]
+
+
+# Ames housing rules
+# ------------------
+AMES_NEIGHBORHOODS = (
+    "Blmngtn", "Blueste", "BrDale", "BrkSide", "ClearCr", "CollgCr", "Crawfor", "Edwards",
+    "Gilbert", "Greens", "GrnHill", "IDOTRR", "Landmrk", "MeadowV", "Mitchel", "NAmes",
+    "NPkVill", "NWAmes", "NoRidge", "NridgHt", "OldTown", "SWISU", "Sawyer", "SawyerW",
+    "Somerst", "StoneBr", "Timber", "Veenker",
+)
+
+AMES_HOUSING_RULES = register_rule_set(RuleSet("ames_housing", (
+    RangeRule("lot_area_positive", column="Lot Area", min=1),
+    RangeRule("sale_price_positive", column="SalePrice", min=1),
+    RangeRule("overall_qual_range", column="Overall Qual", min=1, max=10),
+    RangeRule("mo_sold_range", column="Mo Sold", min=1, max=12),
+    CompareRule("built_before_sold", left="Year Built", op="<=", right="Yr Sold"),
+    CompareRule("remodeled_after_built", left="Year Remod/Add", op=">=", right="Year Built"),
+    # Garages can be finished the year after the sale; later years are typos (e.g. 2207)
+    CompareRule("garage_built_before_sold", left="Garage Yr Blt", op="<=", right="Yr Sold", offset=1),
+    AllowedValuesRule("known_neighborhood", column="Neighborhood", values=AMES_NEIGHBORHOODS),
+    # The dataset's documentation recommends removing houses over 4000 sq ft before modelling
+    RangeRule("gr_liv_area_max", column="Gr Liv Area", max=4000),
+    OutlierRule("gr_liv_area_outlier", column="Gr Liv Area", k=3.0),
+)))
+
+
+# Validating ingestor
+# -------------------
+# Wraps any DataIngestor and validates every frame it returns. On violations
+# it can raise, quarantine the offending rows (they are removed from the
+# returned frame and kept, with the rules they failed, in last_quarantine and
+# optionally in a CSV file), or only report.
+class ValidatingIngestor(DataIngestor):
+    ACTIONS = ("raise", "quarantine", "report")
+
+    def __init__(self, ingestor: DataIngestor, rules="ames_housing", on_violation: str = "quarantine",
+                 quarantine_dir: str = None):
+        """
+        Initialises the validation around an existing ingestor
+
+        Parameters:
+        ingestor (DataIngestor): The ingestor that reads the data
+        rules (RuleSet | str): Rule set, or the name of a registered rule set
+        on_violation (str): "raise", "quarantine" or "report"
+        quarantine_dir (str): If set, quarantined rows are also written there as CSV
+
+        Returns:
+        None
+        """
+        if on_violation not in self.ACTIONS:
+            raise ValueError(f"on_violation must be one of {self.ACTIONS}, got: {on_violation}")
+        self.ingestor = ingestor
+        self.rules = get_rule_set(rules)
+        self.on_violation = on_violation
+        self.quarantine_dir = quarantine_dir
+        self._last_report = None
+        self._last_quarantine = None
+
+    @property
+    def last_report(self) -> ValidationReport:
+        """Validation report of the last ingest."""
+        return self._last_report
+
+    @property
+    def last_quarantine(self) -> pd.DataFrame:
+        """Rows removed by the last ingest, with a failed_rules column (None unless quarantining)."""
+        return self._last_quarantine
+
+    def validate(self, df: pd.DataFrame, source: str = None) -> pd.DataFrame:
+        """
+        Validates a frame and applies the on_violation action
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to be validated
+        source (str): Path the frame was read from, used to name the quarantine file
+
+        Returns:
+        pd.DataFrame: The frame, without the quarantined rows when quarantining
+        """
+        report = self.rules.evaluate(df)
+        self._last_report = report
+        self._last_quarantine = None
+        invalid = report.invalid
+        if not invalid.any() or self.on_violation == "report":
+            return df
+
+        if self.on_violation == "raise":
+            counts = report.summary()
+            failing = counts[(counts["severity"] == "error") & (counts["violations"] > 0)]["violations"]
+            raise ValueError(
+                f"{int(invalid.sum())} rows violate the {self.rules.name} rules: "
+                + ", ".join(f"{name} ({count})" for name, count in failing.items())
+            )
+
+        rows = np.flatnonzero(invalid)
+        quarantine = df.iloc[rows].copy()
+        quarantine["failed_rules"] = report.failed_rules(rows).to_numpy()
+        self._last_quarantine = quarantine
+        if self.quarantine_dir is not None:
+            os.makedirs(self.quarantine_dir, exist_ok=True)
+            name = os.path.basename(source) if source is not None else "data"
+            quarantine.to_csv(os.path.join(self.quarantine_dir, f"{name}.quarantine.csv"), index=False)
+        return df.iloc[np.flatnonzero(~invalid)]
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """
+        Ingests a file and validates it
+
+        Parameters:
+        file_path (str): Path of the file to ingest
+
+        Returns:
+        pd.DataFrame: The validated data
+        """
+        return self.validate(self.ingestor.ingest(file_path), file_path)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # ingestor = ValidatingIngestor(ZipDataIngestion(schema="ames_housing"), rules="ames_housing",
+    #                               on_violation="quarantine", quarantine_dir="../data/quarantine")
+    # df = ingestor.ingest("../data/archive.zip")
+    # print(ingestor.last_report.summary())
+    # print(ingestor.last_quarantine[["Order", "failed_rules"]])
+    pass
@@ -0,0 +1,443 @@
+import os
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ingest_data import DataIngestor
+
+# Floor for bin proportions, so empty bins do not make PSI infinite
+PROPORTION_FLOOR = 1e-4
+
+
+def _category_buckets(series: pd.Series, categories: pd.Index, other: int, missing: int) -> np.ndarray:
+    """Returns each value's position in `categories`, `other` for unseen values and `missing` for missing ones."""
+    # Look up the few distinct values rather than every row
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    lookup = categories.get_indexer(uniques)
+    lookup[lookup == -1] = other
+    return np.append(lookup, missing)[codes]
+
+
+# Batch sketch
+# ------------
+# Per-column counts over the reference profile's buckets. Numerical columns
+# are counted into the profile's quantile bins and categorical columns into
+# its categories plus one "other" bucket for values the reference never saw;
+# the last bucket of every row counts missing values. Rows are padded to the
+# widest column, so all columns are scored with whole-matrix operations.
+# Counting is one searchsorted or one factorize plus a bincount per column.
+# Sketches of consecutive batches add up, which is what lets a monitor
+# accumulate a window of batches without keeping their rows.
+@dataclass
+class BatchSketch:
+    n_rows: int
+    numeric: np.ndarray
+    categorical: np.ndarray
+
+    def __add__(self, other: "BatchSketch") -> "BatchSketch":
+        return BatchSketch(self.n_rows + other.n_rows, self.numeric + other.numeric,
+                           self.categorical + other.categorical)
+
+
+# Reference profile
+# -----------------
+# The compact summary of the training data that new batches are compared
+# with: quantile bin edges and counts for numerical columns, the most frequent
+# categories and their counts for categorical ones, and missing counts for
+# both. It serializes to a small JSON document (it can also be stored in the
+# ModelRegistry), and scoring never needs the reference rows again.
+# Build it with the same ingestor and schema as the batches it will score:
+# the schema keeps the "NA" literal as a category where plain pd.read_csv
+# turns it into a missing value, which would read as drift.
+class ReferenceProfile:
+    def __init__(self, numeric: Dict[str, dict], categorical: Dict[str, dict], n_rows: int):
+        """
+        Builds the profile from its serialized parts; use ReferenceProfile.build for a dataframe
+
+        Parameters:
+        numeric (Dict[str, dict]): Per column, "edges" (interior bin edges) and "counts" (bins, then missing)
+        categorical (Dict[str, dict]): Per column, "categories" and "counts" (categories, other, then missing)
+        n_rows (int): Number of reference rows
+
+        Returns:
+        None
+        """
+        self.numeric = numeric
+        self.categorical = categorical
+        self.n_rows = n_rows
+        self._edges = [np.asarray(numeric[name]["edges"], dtype=np.float64) for name in numeric]
+        self._categories = [pd.Index(categorical[name]["categories"]) for name in categorical]
+        self._numeric_width = max((len(edges) + 2 for edges in self._edges), default=0)
+        self._categorical_width = max((len(categories) + 2 for categories in self._categories), default=0)
+        self.reference = BatchSketch(
+            n_rows,
+            self._pad([numeric[name]["counts"] for name in numeric], self._numeric_width),
+            self._pad([categorical[name]["counts"] for name in categorical], self._categorical_width),
+        )
+
+    @staticmethod
+    def _pad(rows: List[list], width: int) -> np.ndarray:
+        """Right-aligns the missing count of every row in the last column."""
+        out = np.zeros((len(rows), width), dtype=np.int64)
+        for i, counts in enumerate(rows):
+            out[i, :len(counts) - 1] = counts[:-1]
+            out[i, -1] = counts[-1]
+        return out
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, columns: Sequence[str] = None, bins: int = 10, max_categories: int = 50,
+              exclude: Sequence[str] = ("Order", "PID")) -> "ReferenceProfile":
+        """
+        Profiles the reference (training) data
+
+        Parameters:
+        df (pd.DataFrame): The reference data
+        columns (Sequence[str]): Columns to monitor. Defaults to every column not in `exclude`.
+        bins (int): Number of quantile bins per numerical column; ties can merge bins
+        max_categories (int): Most frequent categories kept per categorical column; the rest count as "other"
+        exclude (Sequence[str]): Identifier columns that are never monitored
+
+        Returns:
+        ReferenceProfile: The profile
+        """
+        columns = [name for name in (columns if columns is not None else df.columns) if name not in exclude]
+        numeric_columns = [name for name in columns
+                           if pd.api.types.is_numeric_dtype(df[name]) and not pd.api.types.is_bool_dtype(df[name])]
+        categorical_columns = [name for name in columns if name not in numeric_columns]
+
+        numeric = {}
+        if numeric_columns:
+            values = df[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            probabilities = np.linspace(0, 1, bins + 1)[1:-1]
+            for position, name in enumerate(numeric_columns):
+                column = values[:, position]
+                valid = column[~np.isnan(column)]
+                edges = np.unique(np.quantile(valid, probabilities)) if len(valid) else np.empty(0)
+                numeric[name] = {"edges": edges.tolist(), "counts": None}
+
+        categorical = {}
+        for name in categorical_columns:
+            frequencies = df[name].value_counts(dropna=True)
+            frequencies = frequencies[frequencies > 0].iloc[:max_categories]
+            categorical[name] = {"categories": frequencies.index.tolist(), "counts": None}
+
+        # Count the reference with the same code path as the batches
+        for spec in numeric.values():
+            spec["counts"] = [0] * (len(spec["edges"]) + 2)
+        for spec in categorical.values():
+            spec["counts"] = [0] * (len(spec["categories"]) + 2)
+        sketch = cls(numeric, categorical, len(df)).sketch(df)
+        for row, spec in zip(sketch.numeric, numeric.values()):
+            spec["counts"] = np.concatenate([row[:len(spec["edges"]) + 1], row[-1:]]).tolist()
+        for row, spec in zip(sketch.categorical, categorical.values()):
+            spec["counts"] = np.concatenate([row[:len(spec["categories"]) + 1], row[-1:]]).tolist()
+        return cls(numeric, categorical, len(df))
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.numeric) + list(self.categorical)
+
+    def sketch(self, df: pd.DataFrame) -> BatchSketch:
+        """
+        Counts a batch into the profile's buckets
+
+        Parameters:
+        df (pd.DataFrame): The batch; it must have every monitored column
+
+        Returns:
+        BatchSketch: The batch's counts
+        """
+        missing_columns = [name for name in self.columns if name not in df.columns]
+        if missing_columns:
+            raise ValueError(f"The batch is missing monitored columns: {', '.join(missing_columns)}")
+
+        numeric = np.zeros((len(self.numeric), self._numeric_width), dtype=np.int64)
+        for position, (name, edges) in enumerate(zip(self.numeric, self._edges)):
+            values = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            buckets = np.searchsorted(edges, values, side="right")
+            buckets[np.isnan(values)] = self._numeric_width - 1
+            numeric[position] = np.bincount(buckets, minlength=self._numeric_width)
+
+        categorical = np.zeros((len(self.categorical), self._categorical_width), dtype=np.int64)
+        for position, (name, categories) in enumerate(zip(self.categorical, self._categories)):
+            # Unseen values go to the "other" bucket right after the categories, missing ones to the last
+            buckets = _category_buckets(df[name], categories, len(categories), self._categorical_width - 1)
+            categorical[position] = np.bincount(buckets, minlength=self._categorical_width)
+        return BatchSketch(len(df), numeric, categorical)
+
+    # Serialization
+    def to_dict(self) -> dict:
+        return {"n_rows": self.n_rows, "numeric": self.numeric, "categorical": self.categorical}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "ReferenceProfile":
+        return cls(state["numeric"], state["categorical"], state["n_rows"])
+
+    def save(self, path: str):
+        """Atomically writes the profile as JSON."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ReferenceProfile":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# Drift statistics
+# ----------------
+# All statistics work on count matrices with one row per column, so a batch is
+# scored with a handful of array operations whatever the number of columns.
+def population_stability_index(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """PSI per row of two count matrices, over all buckets including missing values."""
+    p = np.maximum(reference / np.maximum(reference.sum(axis=1, keepdims=True), 1), PROPORTION_FLOOR)
+    q = np.maximum(current / np.maximum(current.sum(axis=1, keepdims=True), 1), PROPORTION_FLOOR)
+    used = (reference > 0) | (current > 0)
+    return np.where(used, (q - p) * np.log(q / p), 0.0).sum(axis=1)
+
+
+def binned_ks(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """
+    Kolmogorov-Smirnov distance per row, from the binned CDFs of the non-missing values
+
+    It is evaluated at the reference bin edges only, so it is a lower bound of the exact statistic.
+    """
+    reference, current = reference[:, :-1], current[:, :-1]
+    p = np.cumsum(reference, axis=1) / np.maximum(reference.sum(axis=1, keepdims=True), 1)
+    q = np.cumsum(current, axis=1) / np.maximum(current.sum(axis=1, keepdims=True), 1)
+    return np.abs(p - q).max(axis=1) if reference.shape[1] else np.zeros(len(reference))
+
+
+def ks_p_value(statistic: np.ndarray, n_reference: np.ndarray, n_current: np.ndarray) -> np.ndarray:
+    """Asymptotic two-sample KS p-value, from the Kolmogorov distribution."""
+    n_effective = n_reference * n_current / np.maximum(n_reference + n_current, 1)
+    lam = (np.sqrt(n_effective) + 0.12 + 0.11 / np.sqrt(np.maximum(n_effective, 1e-12))) * statistic
+    k = np.arange(1, 101)[:, None]
+    terms = 2 * (-1.0) ** (k - 1) * np.exp(-2 * k ** 2 * lam[None, :] ** 2)
+    return np.clip(np.where(lam < 1e-3, 1.0, terms.sum(axis=0)), 0.0, 1.0)
+
+
+def chi_square(reference: np.ndarray, current: np.ndarray):
+    """
+    Chi-square goodness of fit of the current non-missing counts against the reference frequencies
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray, np.ndarray]: Statistic, degrees of freedom and an approximate p-value
+        (Wilson-Hilferty) per row
+    """
+    reference, current = reference[:, :-1], current[:, :-1]
+    used = (reference > 0) | (current > 0)
+    # Half a count of smoothing keeps buckets the reference never saw finite
+    smoothed = np.where(used, reference + 0.5, 0.0)
+    expected = smoothed / np.maximum(smoothed.sum(axis=1, keepdims=True), 1e-12) * current.sum(axis=1, keepdims=True)
+    statistic = np.where(used, (current - expected) ** 2 / np.maximum(expected, 1e-12), 0.0).sum(axis=1)
+    dof = np.maximum(used.sum(axis=1) - 1, 1)
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / np.sqrt(2 / (9 * dof))
+    p_value = 0.5 * np.array([math.erfc(value / math.sqrt(2)) for value in z])
+    return statistic, dof, p_value
+
+
+# Drift report
+# ------------
+@dataclass
+class DriftReport:
+    scores: pd.DataFrame
+    n_rows: int
+    n_reference: int
+
+    @property
+    def drifted(self) -> List[str]:
+        """Columns whose status is "drift"."""
+        return self.scores.index[self.scores["status"] == "drift"].tolist()
+
+    def summary(self) -> pd.DataFrame:
+        """The columns that are not stable, largest PSI first and unscored ("insufficient") ones last."""
+        return self.scores[self.scores["status"] != "stable"].sort_values("psi", ascending=False)
+
+
+# Drift monitor
+# -------------
+# Scores batches against a reference profile. score() looks at one batch;
+# update() adds a batch to a running window and report() scores the whole
+# window, so slow drifts that no single small batch shows still surface.
+# PSI sets the status (by the usual 0.1 / 0.25 rule of thumb); the KS and
+# chi-square p-values are reported alongside, but with large batches they
+# flag even negligible shifts. Proportions from a handful of rows say nothing
+# about drift (an empty batch would score PSI ~6.8 on every column), so below
+# `min_rows` the scores are NaN and the status is "insufficient".
+class DriftMonitor:
+    def __init__(self, reference: ReferenceProfile, psi_warning: float = 0.1, psi_drift: float = 0.25,
+                 min_rows: int = 30):
+        """
+        Initialises the monitor
+
+        Parameters:
+        reference (ReferenceProfile): The training data profile
+        psi_warning (float): PSI from which a column is reported as "warning"
+        psi_drift (float): PSI from which a column is reported as "drift"
+        min_rows (int): Rows a batch needs to be scored, and non-missing values a column needs for KS and
+            chi-square
+
+        Returns:
+        None
+        """
+        self.reference = reference
+        self.psi_warning = psi_warning
+        self.psi_drift = psi_drift
+        self.min_rows = min_rows
+        self._window = None
+
+    def compare(self, sketch: BatchSketch) -> DriftReport:
+        """
+        Scores a sketch against the reference
+
+        Parameters:
+        sketch (BatchSketch): Counts of the batch or window
+
+        Returns:
+        DriftReport: One row of scores per monitored column
+        """
+        reference = self.reference.reference
+        enough_rows = sketch.n_rows >= self.min_rows
+        frames = []
+        if len(self.reference.numeric):
+            n_reference = reference.numeric[:, :-1].sum(axis=1)
+            n_current = sketch.numeric[:, :-1].sum(axis=1)
+            enough_values = enough_rows & (n_current >= self.min_rows)
+            ks = np.where(enough_values, binned_ks(reference.numeric, sketch.numeric), np.nan)
+            frames.append(pd.DataFrame({
+                "kind": "numeric",
+                "psi": population_stability_index(reference.numeric, sketch.numeric) if enough_rows else np.nan,
+                "ks": ks,
+                "ks_p_value": np.where(enough_values, ks_p_value(ks, n_reference, n_current), np.nan),
+                "missing_reference": reference.numeric[:, -1] / max(reference.n_rows, 1),
+                "missing_current": sketch.numeric[:, -1] / max(sketch.n_rows, 1),
+            }, index=list(self.reference.numeric)))
+        if len(self.reference.categorical):
+            statistic, dof, p_value = chi_square(reference.categorical, sketch.categorical)
+            enough_values = enough_rows & (sketch.categorical[:, :-1].sum(axis=1) >= self.min_rows)
+            frames.append(pd.DataFrame({
+                "kind": "categorical",
+                "psi": population_stability_index(reference.categorical, sketch.categorical) if enough_rows else np.nan,
+                "chi2": np.where(enough_values, statistic, np.nan),
+                "chi2_dof": dof,
+                "chi2_p_value": np.where(enough_values, p_value, np.nan),
+                "missing_reference": reference.categorical[:, -1] / max(reference.n_rows, 1),
+                "missing_current": sketch.categorical[:, -1] / max(sketch.n_rows, 1),
+            }, index=list(self.reference.categorical)))
+        scores = pd.concat(frames) if frames else pd.DataFrame(columns=["kind", "psi"])
+        scores["status"] = np.select(
+            [scores["psi"].isna(), scores["psi"] >= self.psi_drift, scores["psi"] >= self.psi_warning],
+            ["insufficient", "drift", "warning"], "stable")
+        return DriftReport(scores, sketch.n_rows, reference.n_rows)
+
+    def score(self, df: pd.DataFrame) -> DriftReport:
+        """Scores one batch against the reference."""
+        return self.compare(self.reference.sketch(df))
+
+    def update(self, df: pd.DataFrame) -> DriftReport:
+        """Adds a batch to the window and returns the batch's own report."""
+        sketch = self.reference.sketch(df)
+        self._window = sketch if self._window is None else self._window + sketch
+        return self.compare(sketch)
+
+    def report(self) -> DriftReport:
+        """Scores every batch added since the last reset."""
+        if self._window is None:
+            raise ValueError("No batches in the window; call update() first")
+        return self.compare(self._window)
+
+    def reset(self):
+        self._window = None
+
+
+# Drift-monitoring ingestor
+# -------------------------
+# Wraps any DataIngestor and scores every ingested frame against the
+# reference, keeping the report in last_report and optionally appending a
+# one-line JSON summary per ingest to a log file.
+class DriftMonitoringIngestor(DataIngestor):
+    ACTIONS = ("report", "raise")
+
+    def __init__(self, ingestor: DataIngestor, monitor: DriftMonitor, on_drift: str = "report",
+                 log_path: str = None):
+        """
+        Initialises the drift monitoring around an existing ingestor
+
+        Parameters:
+        ingestor (DataIngestor): The ingestor that reads the data
+        monitor (DriftMonitor): The monitor holding the reference profile
+        on_drift (str): "report", or "raise" to reject batches with drifted columns
+        log_path (str): If set, a JSON line per ingest is appended there
+
+        Returns:
+        None
+        """
+        if on_drift not in self.ACTIONS:
+            raise ValueError(f"on_drift must be one of {self.ACTIONS}, got: {on_drift}")
+        self.ingestor = ingestor
+        self.monitor = monitor
+        self.on_drift = on_drift
+        self.log_path = log_path
+        self._last_report = None
+
+    @property
+    def last_report(self) -> DriftReport:
+        """Drift report of the last ingest."""
+        return self._last_report
+
+    def _log(self, report: DriftReport, source: str):
+        record = {
+            "timestamp": time.time(),
+            "source": source,
+            "rows": report.n_rows,
+            "drifted": report.drifted,
+            "psi": {name: None if math.isnan(value) else round(float(value), 6)
+                    for name, value in report.scores["psi"].items()},
+        }
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """
+        Ingests a file and scores it for drift
+
+        Parameters:
+        file_path (str): Path of the file to ingest
+
+        Returns:
+        pd.DataFrame: The ingested data
+        """
+        df = self.ingestor.ingest(file_path)
+        report = self.monitor.update(df)
+        self._last_report = report
+        if self.log_path is not None:
+            self._log(report, file_path)
+        if self.on_drift == "raise" and report.drifted:
+            raise ValueError(f"{file_path} drifted from the reference in: {', '.join(report.drifted)}")
+        return df
+
+
+# Example usage:
+if __name__ == "__main__":
+    # from ingest_data import ZipDataIngestion
+
+    # reference = ReferenceProfile.build(ZipDataIngestion(schema="ames_housing").ingest("../data/archive.zip"))
+    # reference.save("ames_reference.json")
+
+    # monitor = DriftMonitor(ReferenceProfile.load("ames_reference.json"))
+    # ingestor = DriftMonitoringIngestor(ZipDataIngestion(schema="ames_housing"), monitor,
+    #                                    log_path="../data/drift.jsonl")
+    # df = ingestor.ingest("../data/new_listings.zip")
+    # print(ingestor.last_report.summary())
+    pass
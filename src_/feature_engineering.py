@@ -0,0 +1,514 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ingest_data import DataIngestor
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # pragma: no cover - scipy is optional
+    sparse = None
+
+
+# Ordinal levels used by the Ames quality and condition columns, worst first
+QUALITY_LEVELS = ("Po", "Fa", "TA", "Gd", "Ex")
+
+
+def _category_codes(series: pd.Series, categories: list) -> np.ndarray:
+    """Returns each value's position in `categories`, or -1 for missing and unseen values."""
+    # Look up the few distinct values rather than every row
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    lookup = np.append(pd.Index(categories).get_indexer(uniques), -1)
+    return lookup[codes]
+
+
+# Feature steps
+# -------------
+# A step reads some columns of the ingested frame and writes a block of the
+# feature matrix. fit() learns its state from the training frame with whole-
+# column NumPy operations; transform_into() fills a preallocated slice of the
+# output, so the pipeline never concatenates blocks. Constructor arguments are
+# listed in PARAMS and learned attributes in FITTED (ARRAYS marks the NumPy
+# ones), which is all to_dict() needs to serialize a fitted step.
+class FeatureStep(ABC):
+    PARAMS: Tuple[str, ...] = ("columns",)
+    FITTED: Tuple[str, ...] = ()
+    ARRAYS: Tuple[str, ...] = ()
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+
+    @abstractmethod
+    def fit(self, df: pd.DataFrame, y: np.ndarray = None) -> "FeatureStep":
+        """
+        Learns the step's state
+
+        Parameters:
+        df (pd.DataFrame): The training frame
+        y (np.ndarray): The transformed target, for steps that need it
+
+        Returns:
+        FeatureStep: The fitted step
+        """
+        pass
+
+    @abstractmethod
+    def feature_names(self) -> List[str]:
+        """Returns the names of the output columns."""
+        pass
+
+    @abstractmethod
+    def transform_into(self, df: pd.DataFrame, out: np.ndarray):
+        """
+        Writes the step's block of the feature matrix
+
+        Parameters:
+        df (pd.DataFrame): The frame to transform
+        out (np.ndarray): The block to fill, with one column per feature name
+
+        Returns:
+        None
+        """
+        pass
+
+    def transform_sparse(self, df: pd.DataFrame):
+        """Returns the step's block as a CSR matrix."""
+        out = np.empty((len(df), len(self.feature_names())), dtype=np.float32)
+        self.transform_into(df, out)
+        return sparse.csr_matrix(out)
+
+    @property
+    def is_fitted(self) -> bool:
+        return all(getattr(self, name, None) is not None for name in self.FITTED)
+
+    def to_dict(self) -> dict:
+        state = {"type": type(self).__name__, "params": {name: getattr(self, name) for name in self.PARAMS}}
+        fitted = {}
+        for name in self.FITTED:
+            value = getattr(self, name, None)
+            fitted[name] = value.tolist() if isinstance(value, np.ndarray) else value
+        state["fitted"] = fitted
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "FeatureStep":
+        step = STEP_TYPES[state["type"]](**state["params"])
+        for name, value in state["fitted"].items():
+            setattr(step, name, np.asarray(value) if isinstance(value, list) and name in step.ARRAYS else value)
+        return step
+
+
+# Numeric imputer
+# ---------------
+# Fills missing values with the column median, mean or a constant and can
+# log1p-transform skewed columns such as Lot Area. Optional indicator columns
+# record which values were imputed.
+class NumericImputer(FeatureStep):
+    PARAMS = ("columns", "strategy", "fill_value", "log_columns", "add_indicator")
+    FITTED = ("fill_values_", "indicator_columns_")
+    ARRAYS = ("fill_values_",)
+
+    def __init__(self, columns: Sequence[str], strategy: str = "median", fill_value: float = 0.0,
+                 log_columns: Sequence[str] = (), add_indicator: bool = False):
+        """
+        Parameters:
+        columns (Sequence[str]): The numeric columns
+        strategy (str): "median", "mean" or "constant"
+        fill_value (float): The fill value for strategy="constant", and for columns that are entirely missing
+        log_columns (Sequence[str]): Columns to log1p-transform after imputation
+        add_indicator (bool): Add a 0/1 column for every column that had missing values when fitted
+        """
+        if strategy not in ("median", "mean", "constant"):
+            raise ValueError(f"Unknown imputation strategy {strategy!r}; expected 'median', 'mean' or 'constant'")
+        super().__init__(columns)
+        self.strategy = strategy
+        self.fill_value = fill_value
+        self.log_columns = list(log_columns)
+        self.add_indicator = add_indicator
+        self.fill_values_ = None
+        self.indicator_columns_ = None
+
+    def _values(self, df: pd.DataFrame) -> np.ndarray:
+        return df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def fit(self, df: pd.DataFrame, y: np.ndarray = None) -> "NumericImputer":
+        values = self._values(df)
+        missing = np.isnan(values)
+        if self.strategy == "constant":
+            fill = np.full(len(self.columns), self.fill_value, dtype=np.float64)
+        else:
+            reduce = np.nanmedian if self.strategy == "median" else np.nanmean
+            all_missing = missing.all(axis=0)
+            fill = np.full(len(self.columns), self.fill_value, dtype=np.float64)
+            if not all_missing.all():
+                fill[~all_missing] = reduce(values[:, ~all_missing], axis=0)
+        self.fill_values_ = fill
+        self.indicator_columns_ = [name for name, any_missing in zip(self.columns, missing.any(axis=0))
+                                   if any_missing] if self.add_indicator else []
+        return self
+
+    def feature_names(self) -> List[str]:
+        return self.columns + [f"{name}__missing" for name in self.indicator_columns_]
+
+    def transform_into(self, df: pd.DataFrame, out: np.ndarray):
+        values = self._values(df)
+        missing = np.isnan(values)
+        filled = np.where(missing, self.fill_values_, values)
+        if self.log_columns:
+            log_positions = [self.columns.index(name) for name in self.log_columns]
+            filled[:, log_positions] = np.log1p(np.maximum(filled[:, log_positions], 0.0))
+        n_columns = len(self.columns)
+        out[:, :n_columns] = filled
+        if self.indicator_columns_:
+            positions = [self.columns.index(name) for name in self.indicator_columns_]
+            out[:, n_columns:] = missing[:, positions]
+
+
+# Ordinal encoder
+# ---------------
+# Maps ordered levels to 1..n, e.g. Exter Qual Po..Ex to 1..5. Missing values
+# and levels outside the map (such as the "NA" literal kept by the schema for
+# "no basement") become 0, which sits below the worst level.
+class OrdinalEncoder(FeatureStep):
+    PARAMS = ("columns", "levels")
+
+    def __init__(self, columns: Sequence[str], levels: Sequence = QUALITY_LEVELS):
+        """
+        Parameters:
+        columns (Sequence[str]): The ordinal columns; they all share `levels`
+        levels (Sequence): The levels, worst first
+        """
+        super().__init__(columns)
+        self.levels = list(levels)
+
+    def fit(self, df: pd.DataFrame, y: np.ndarray = None) -> "OrdinalEncoder":
+        # The map is fixed, so there is nothing to learn
+        return self
+
+    def feature_names(self) -> List[str]:
+        return list(self.columns)
+
+    def transform_into(self, df: pd.DataFrame, out: np.ndarray):
+        for position, name in enumerate(self.columns):
+            out[:, position] = _category_codes(df[name], self.levels) + 1
+
+
+# One-hot encoder
+# ---------------
+# Learns the categories of each column, most frequent first, optionally
+# dropping rare ones. Unseen, rare and missing values encode as all zeros.
+# Each row has at most one non-zero per column, so the CSR form is built
+# straight from the category codes without a dense intermediate.
+class OneHotEncoder(FeatureStep):
+    PARAMS = ("columns", "min_frequency", "max_categories")
+    FITTED = ("categories_",)
+
+    def __init__(self, columns: Sequence[str], min_frequency: int = 1, max_categories: int = None):
+        """
+        Parameters:
+        columns (Sequence[str]): The categorical columns
+        min_frequency (int): Categories seen fewer times than this when fitted are dropped
+        max_categories (int): Keep at most this many categories per column
+        """
+        super().__init__(columns)
+        self.min_frequency = min_frequency
+        self.max_categories = max_categories
+        self.categories_ = None
+
+    def fit(self, df: pd.DataFrame, y: np.ndarray = None) -> "OneHotEncoder":
+        self.categories_ = {}
+        for name in self.columns:
+            counts = df[name].value_counts(dropna=True)
+            counts = counts[counts >= max(self.min_frequency, 1)]
+            if self.max_categories is not None:
+                counts = counts.iloc[:self.max_categories]
+            self.categories_[name] = counts.index.tolist()
+        return self
+
+    def feature_names(self) -> List[str]:
+        return [f"{name}={category}" for name in self.columns for category in self.categories_[name]]
+
+    def _global_codes(self, df: pd.DataFrame) -> np.ndarray:
+        """Returns an (n_rows, n_columns) array of output column positions, -1 where the row has no one."""
+        codes = np.empty((len(df), len(self.columns)), dtype=np.int64)
+        offset = 0
+        for position, name in enumerate(self.columns):
+            categories = self.categories_[name]
+            column_codes = _category_codes(df[name], categories).astype(np.int64)
+            codes[:, position] = np.where(column_codes >= 0, column_codes + offset, -1)
+            offset += len(categories)
+        return codes
+
+    def transform_into(self, df: pd.DataFrame, out: np.ndarray):
+        out[:] = 0
+        codes = self._global_codes(df)
+        rows, columns = np.nonzero(codes >= 0)
+        out[rows, codes[rows, columns]] = 1
+
+    def transform_sparse(self, df: pd.DataFrame):
+        codes = self._global_codes(df)
+        present = codes >= 0
+        indptr = np.zeros(len(df) + 1, dtype=np.int64)
+        np.cumsum(present.sum(axis=1), out=indptr[1:])
+        # Row-major order keeps the column indices of every row sorted
+        indices = codes[present]
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(df), len(self.feature_names())))
+
+
+# Target encoder
+# --------------
+# Replaces each category with the mean of the transformed target for that
+# category, shrunk towards the global mean by `smoothing` pseudo-rows so rare
+# categories do not memorise their few prices. Unseen and missing values get
+# the global mean. Means are computed with one bincount per column.
+class TargetEncoder(FeatureStep):
+    PARAMS = ("columns", "smoothing")
+    FITTED = ("categories_", "encodings_", "global_mean_")
+
+    def __init__(self, columns: Sequence[str], smoothing: float = 10.0):
+        """
+        Parameters:
+        columns (Sequence[str]): The high-cardinality categorical columns, e.g. Neighborhood
+        smoothing (float): Weight of the global mean, in rows
+        """
+        super().__init__(columns)
+        self.smoothing = smoothing
+        self.categories_ = None
+        self.encodings_ = None
+        self.global_mean_ = None
+
+    def fit(self, df: pd.DataFrame, y: np.ndarray = None) -> "TargetEncoder":
+        if y is None:
+            raise ValueError("TargetEncoder needs the target to fit")
+        y = np.asarray(y, dtype=np.float64)
+        self.global_mean_ = float(y.mean())
+        self.categories_, self.encodings_ = {}, {}
+        for name in self.columns:
+            categories = df[name].dropna().unique().tolist()
+            codes = _category_codes(df[name], categories)
+            valid = codes >= 0
+            counts = np.bincount(codes[valid], minlength=len(categories))
+            sums = np.bincount(codes[valid], weights=y[valid], minlength=len(categories))
+            encodings = (sums + self.smoothing * self.global_mean_) / (counts + self.smoothing)
+            self.categories_[name] = categories
+            self.encodings_[name] = encodings.tolist()
+        return self
+
+    def feature_names(self) -> List[str]:
+        return [f"{name}__target" for name in self.columns]
+
+    def transform_into(self, df: pd.DataFrame, out: np.ndarray):
+        for position, name in enumerate(self.columns):
+            codes = _category_codes(df[name], self.categories_[name])
+            # The extra last slot holds the global mean for code -1
+            lookup = np.append(np.asarray(self.encodings_[name], dtype=np.float64), self.global_mean_)
+            out[:, position] = lookup[codes]
+
+
+STEP_TYPES = {cls.__name__: cls for cls in (NumericImputer, OrdinalEncoder, OneHotEncoder, TargetEncoder)}
+
+
+# Feature pipeline
+# ----------------
+# Runs the steps side by side over the ingested frame and lays their blocks
+# out in one C-contiguous float32 matrix (or a CSR matrix when scipy is
+# installed). The target is log1p(SalePrice) by default. The fitted pipeline
+# saves to a small JSON file, so batch inference reloads it instead of
+# refitting.
+class FeaturePipeline:
+    def __init__(self, steps: List[FeatureStep], target: str = "SalePrice", log_target: bool = True,
+                 dtype=np.float32):
+        """
+        Initialises the pipeline
+
+        Parameters:
+        steps (List[FeatureStep]): The steps; their blocks appear in this order
+        target (str): The target column
+        log_target (bool): Model log1p of the target
+        dtype: dtype of the feature matrix
+
+        Returns:
+        None
+        """
+        self.steps = steps
+        self.target = target
+        self.log_target = log_target
+        self.dtype = np.dtype(dtype)
+        self._fitted = False
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._fitted
+
+    @property
+    def feature_names(self) -> List[str]:
+        return [name for step in self.steps for name in step.feature_names()]
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    def transform_target(self, df: pd.DataFrame) -> np.ndarray:
+        """Returns the target as float64, log1p-transformed if log_target is set."""
+        y = df[self.target].to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.log1p(y) if self.log_target else y
+
+    def inverse_target(self, y: np.ndarray) -> np.ndarray:
+        """Maps model outputs back to prices."""
+        y = np.asarray(y, dtype=np.float64)
+        return np.expm1(y) if self.log_target else y
+
+    def fit(self, df: pd.DataFrame) -> "FeaturePipeline":
+        """
+        Fits every step on the training frame
+
+        Parameters:
+        df (pd.DataFrame): The training frame, including the target column
+
+        Returns:
+        FeaturePipeline: The fitted pipeline
+        """
+        y = self.transform_target(df)
+        for step in self.steps:
+            step.fit(df, y)
+        self._fitted = True
+        return self
+
+    def transform(self, df: pd.DataFrame, sparse_output: bool = False):
+        """
+        Builds the feature matrix
+
+        Parameters:
+        df (pd.DataFrame): The frame to transform; the target column is not needed
+        sparse_output (bool): Return a CSR matrix instead of a dense array (needs scipy)
+
+        Returns:
+        np.ndarray or scipy.sparse.csr_matrix: One row per row of df
+        """
+        if not self._fitted:
+            raise ValueError("The pipeline is not fitted; call fit() or load a fitted pipeline")
+        if sparse_output:
+            if sparse is None:
+                raise ValueError("Sparse output requires scipy, which is not installed")
+            blocks = [step.transform_sparse(df) for step in self.steps]
+            return sparse.hstack(blocks, format="csr", dtype=self.dtype)
+
+        out = np.empty((len(df), self.n_features), dtype=self.dtype, order="C")
+        offset = 0
+        for step in self.steps:
+            width = len(step.feature_names())
+            step.transform_into(df, out[:, offset:offset + width])
+            offset += width
+        return out
+
+    def fit_transform(self, df: pd.DataFrame, sparse_output: bool = False) -> Tuple[object, np.ndarray]:
+        """Fits the pipeline and returns the feature matrix and the transformed target."""
+        self.fit(df)
+        return self.transform(df, sparse_output), self.transform_target(df)
+
+    def ingest(self, ingestor: DataIngestor, file_path: str, fit: bool = False,
+               sparse_output: bool = False) -> Tuple[object, np.ndarray]:
+        """
+        Ingests a file and turns it into model inputs
+
+        Parameters:
+        ingestor (DataIngestor): The ingestor, e.g. ZipDataIngestion(schema="ames_housing")
+        file_path (str): The file to ingest
+        fit (bool): Fit the pipeline on this file first
+        sparse_output (bool): Return a CSR matrix instead of a dense array
+
+        Returns:
+        Tuple: The feature matrix, and the transformed target (None if the file has no target column)
+        """
+        df = ingestor.ingest(file_path)
+        if fit:
+            self.fit(df)
+        y = self.transform_target(df) if self.target in df.columns else None
+        return self.transform(df, sparse_output), y
+
+    # Serialization
+    def to_dict(self) -> dict:
+        if not self._fitted:
+            raise ValueError("Only a fitted pipeline can be saved")
+        return {
+            "target": self.target,
+            "log_target": self.log_target,
+            "dtype": self.dtype.name,
+            "feature_names": self.feature_names,
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "FeaturePipeline":
+        pipeline = cls([FeatureStep.from_dict(step) for step in state["steps"]],
+                       target=state["target"], log_target=state["log_target"], dtype=state["dtype"])
+        pipeline._fitted = True
+        return pipeline
+
+    def save(self, path: str):
+        """Atomically writes the fitted pipeline as JSON."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FeaturePipeline":
+        """Loads a fitted pipeline written by save()."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# Default Ames pipeline
+# ---------------------
+AMES_NUMERIC_COLUMNS = [
+    "Lot Frontage", "Lot Area", "Overall Qual", "Overall Cond", "Year Built", "Year Remod/Add",
+    "Mas Vnr Area", "BsmtFin SF 1", "Bsmt Unf SF", "Total Bsmt SF", "1st Flr SF", "2nd Flr SF",
+    "Gr Liv Area", "Bsmt Full Bath", "Full Bath", "Half Bath", "Bedroom AbvGr", "Kitchen AbvGr",
+    "TotRms AbvGrd", "Fireplaces", "Garage Yr Blt", "Garage Cars", "Garage Area", "Wood Deck SF",
+    "Open Porch SF", "Enclosed Porch", "Screen Porch", "Pool Area", "Mo Sold", "Yr Sold",
+]
+AMES_LOG_COLUMNS = ["Lot Area", "Gr Liv Area", "1st Flr SF"]
+AMES_ORDINAL_COLUMNS = [
+    "Exter Qual", "Exter Cond", "Bsmt Qual", "Bsmt Cond", "Heating QC", "Kitchen Qual",
+    "Fireplace Qu", "Garage Qual", "Garage Cond", "Pool QC",
+]
+AMES_ONE_HOT_COLUMNS = [
+    "MS Zoning", "Lot Shape", "Land Contour", "Lot Config", "Bldg Type", "House Style", "Roof Style",
+    "Mas Vnr Type", "Foundation", "Central Air", "Garage Type", "Garage Finish", "Paved Drive",
+    "Sale Type", "Sale Condition",
+]
+AMES_TARGET_COLUMNS = ["Neighborhood", "MS SubClass", "Exterior 1st", "Exterior 2nd"]
+
+
+def ames_pipeline() -> FeaturePipeline:
+    """Returns an unfitted pipeline for the Ames housing columns, predicting log1p(SalePrice)."""
+    return FeaturePipeline([
+        NumericImputer(AMES_NUMERIC_COLUMNS, strategy="median", log_columns=AMES_LOG_COLUMNS, add_indicator=True),
+        OrdinalEncoder(AMES_ORDINAL_COLUMNS),
+        OneHotEncoder(AMES_ONE_HOT_COLUMNS, min_frequency=5),
+        TargetEncoder(AMES_TARGET_COLUMNS),
+    ])
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Example usage of the feature pipeline
+    # from ingest_data import ZipDataIngestion
+
+    # pipeline = ames_pipeline()
+    # X, y = pipeline.ingest(ZipDataIngestion(schema="ames_housing"), "../data/archive.zip", fit=True)
+    # pipeline.save("ames_features.json")
+
+    # Batch inference reuses the fitted state
+    # pipeline = FeaturePipeline.load("ames_features.json")
+    # X_new, _ = pipeline.ingest(ZipDataIngestion(schema="ames_housing"), "../data/new_listings.zip")
+    pass
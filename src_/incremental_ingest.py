@@ -0,0 +1,176 @@
+import os
+import json
+import hashlib
+import zipfile
+from typing import Iterator, List
+
+import pandas as pd
+
+from batch_ingest import align_categories
+from data_cache import FRAME_EXTENSION, read_frame, write_frame
+from ingest_data import DataIngestor, ZipDataIngestion
+
+
+# Incremental ZIP ingestion
+# -------------------------
+# Archives that grow by one CSV member per period (e.g. one file per month)
+# are ingested member by member. Each member's rows are stored in their own
+# Feather file, and a manifest records each member's CRC, size, timestamp,
+# row count and file. On a rerun only new or changed members are parsed and
+# written, and the files of removed members are deleted, so both parsing and
+# writing are proportional to the delta. The dataset is assembled from the
+# member files only when it is read; iter_members() reads them one at a time.
+class IncrementalZipIngestion(DataIngestor):
+    MANIFEST_FILE = "manifest.json"
+    MEMBERS_DIR = "members"
+
+    def __init__(self, state_dir: str = ".incremental_ingest", schema=None, **read_options):
+        """
+        Initialises the incremental ingestor.
+
+        Parameters:
+        state_dir (str): Directory holding the manifest and the stored member frames
+        schema (DatasetSchema | str): Schema passed on to ZipDataIngestion for every member
+        **read_options: Extra keyword arguments passed on to pd.read_csv
+
+        Returns:
+        None
+        """
+        self.state_dir = state_dir
+        self.schema = schema
+        self.read_options = read_options
+        self._last_parsed_members = []
+        os.makedirs(os.path.join(state_dir, self.MEMBERS_DIR), exist_ok=True)
+
+    @property
+    def last_parsed_members(self) -> List[str]:
+        """Members that were actually parsed on the last ingest."""
+        return self._last_parsed_members
+
+    # State handling
+    # --------------
+    def _manifest_path(self) -> str:
+        return os.path.join(self.state_dir, self.MANIFEST_FILE)
+
+    def _member_path(self, file_name: str) -> str:
+        return os.path.join(self.state_dir, self.MEMBERS_DIR, file_name)
+
+    @staticmethod
+    def _member_file(name: str, signature: dict) -> str:
+        # Member names may contain directories; a changed member gets a new file
+        digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+        return f"{digest}-{signature['crc']:08x}{FRAME_EXTENSION}"
+
+    def _options_key(self) -> str:
+        return json.dumps({"schema": self.schema, "options": self.read_options}, sort_keys=True, default=repr)
+
+    def _load_manifest(self, file_path: str) -> dict:
+        """Returns the stored manifest, or an empty one if it belongs to another archive or other options."""
+        empty = {"source": file_path, "options": self._options_key(), "members": {}}
+        try:
+            with open(self._manifest_path(), "r") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return empty
+        if manifest.get("source") != file_path or manifest.get("options") != self._options_key():
+            return empty
+        # Members whose stored frame went missing are parsed again
+        manifest["members"] = {
+            name: entry for name, entry in manifest.get("members", {}).items()
+            if "file" in entry and os.path.exists(self._member_path(entry["file"]))
+        }
+        return manifest
+
+    def _save_manifest(self, manifest: dict):
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    @staticmethod
+    def _signature(info: zipfile.ZipInfo) -> dict:
+        return {"crc": info.CRC, "size": info.file_size, "mtime": list(info.date_time)}
+
+    # Ingestion
+    # ---------
+    def refresh(self, file_path: str) -> List[str]:
+        """
+        Brings the stored member frames up to date with the archive, writing only new or changed members
+
+        Parameters:
+        file_path (str): Path to the .zip archive
+
+        Returns:
+        List[str]: The stored frame files, in member name order
+        """
+        if not zipfile.is_zipfile(file_path):
+            raise ValueError("The provided file is not a .zip file")
+        file_path = os.path.abspath(file_path)
+
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            members = {
+                info.filename: self._signature(info) for info in zip_ref.infolist()
+                if not info.is_dir() and info.filename.endswith(".csv")
+            }
+        if len(members) == 0:
+            raise FileNotFoundError("No CSV file found in the archive.")
+
+        manifest = self._load_manifest(file_path)
+        known = manifest["members"]
+        to_parse = [
+            name for name in sorted(members)
+            if name not in known or {key: known[name][key] for key in ("crc", "size", "mtime")} != members[name]
+        ]
+        self._last_parsed_members = to_parse
+
+        if to_parse or set(known) != set(members):
+            new_members = {name: entry for name, entry in known.items() if name in members}
+            for name in to_parse:
+                ingestor = ZipDataIngestion(member=name, schema=self.schema, **self.read_options)
+                df = ingestor.ingest(file_path)
+                file_name = self._member_file(name, members[name])
+                write_frame(df, self._member_path(file_name))
+                new_members[name] = dict(members[name], rows=len(df), file=file_name)
+            manifest["members"] = {name: new_members[name] for name in sorted(new_members)}
+            self._save_manifest(manifest)
+            # Only once the manifest no longer points at them
+            self._remove_unreferenced({entry["file"] for entry in manifest["members"].values()})
+        return [entry["file"] for entry in manifest["members"].values()]
+
+    def _remove_unreferenced(self, keep: set):
+        for file_name in os.listdir(os.path.join(self.state_dir, self.MEMBERS_DIR)):
+            if file_name not in keep:
+                os.remove(self._member_path(file_name))
+
+    def iter_members(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Refreshes the stored frames and yields them one member at a time, in member name order."""
+        for file_name in self.refresh(file_path):
+            yield read_frame(self._member_path(file_name))
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """
+        Brings the stored dataset up to date with the archive and returns it.
+
+        Parameters:
+        file_path (str): Path to the .zip archive
+
+        Returns:
+        pd.DataFrame: The rows of every CSV member, in member name order
+        """
+        frames = align_categories(list(self.iter_members(file_path)))
+        return pd.concat(frames, ignore_index=True)
+
+    def invalidate(self):
+        """Forgets the manifest and the stored member frames, so the next ingest parses everything."""
+        if os.path.exists(self._manifest_path()):
+            os.remove(self._manifest_path())
+        self._remove_unreferenced(set())
+
+
+# Example usage:
+if __name__ == "__main__":
+    # ingestor = IncrementalZipIngestion(state_dir=".incremental_ingest", schema="ames_housing")
+    # df = ingestor.ingest("../data/monthly_archive.zip")  # parses every member
+    # df = ingestor.ingest("../data/monthly_archive.zip")  # parses only new or changed members
+    # print(ingestor.last_parsed_members)
+    pass
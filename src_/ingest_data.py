@@ -1,10 +1,15 @@
 import os
 import glob
+import inspect
 import zipfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
 
 import pandas as pd
 
+from schema import get_schema
+
 
 # Abstract class for Data ingestior
 class DataIngestor(ABC):
@@ -14,47 +19,352 @@ class DataIngestor(ABC):
         pass
 
 
+# Ingestor registry
+# -----------------
+# Ingestors register themselves by file extension and/or by the magic bytes at
+# the start of the file, so new formats plug in without touching the factory.
+INGESTORS_BY_EXTENSION: Dict[str, type] = {}
+INGESTORS_BY_MAGIC: List[Tuple[bytes, type]] = []
+
+
+def register_ingestor(extensions: Tuple[str, ...] = (), magic: Tuple[bytes, ...] = ()):
+    """
+    Class decorator that registers a DataIngestor for extensions and magic bytes.
+
+    Parameters:
+    extensions (Tuple[str, ...]): File extensions such as ".zip" or ".csv.gz"
+    magic (Tuple[bytes, ...]): Leading bytes that identify the format
+
+    Returns:
+    Callable: The decorator, which returns the class unchanged
+    """
+    def decorator(cls):
+        for extension in extensions:
+            INGESTORS_BY_EXTENSION[extension.lower()] = cls
+        for signature in magic:
+            INGESTORS_BY_MAGIC.append((signature, cls))
+        return cls
+    return decorator
+
+
+# Base class for CSV based ingestors
+# ----------------------------------
+# Holds the optional schema (see schema.py), which sets compact dtypes and NA
+# handling and is validated after every full ingest, plus extra read options.
+class CSVDataIngestor(DataIngestor):
+    def __init__(self, schema=None, **read_options):
+        """
+        Initialises the CSV ingestor.
+
+        Parameters:
+        schema (DatasetSchema | str): Schema, or the name of a registered schema, to read the CSV with.
+        **read_options: Extra keyword arguments passed on to pd.read_csv. They override the schema options.
+
+        Returns:
+        None
+        """
+        self.schema = get_schema(schema) if schema is not None else None
+        self.read_options = read_options
+        self._last_memory_report = None
+
+    @property
+    def last_memory_report(self) -> pd.DataFrame:
+        """Memory saved by the schema on the last ingest, per column (None without a schema)."""
+        return self._last_memory_report
+
+    def _read_csv_options(self) -> dict:
+        options = self.schema.read_csv_options() if self.schema is not None else {}
+        options.update(self.read_options)
+        return options
+
+    def _apply_schema(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validates a fully ingested frame against the schema and records the memory report."""
+        if self.schema is None:
+            return df
+        problems = self.schema.validate(df)
+        if problems:
+            raise ValueError(f"Data does not match the {self.schema.name} schema: " + "; ".join(problems))
+        self._last_memory_report = self.schema.memory_report(df)
+        return df
+
+
 # Implement a concrete class for ZIP Ingestion
-class ZipDataIngestion(DataIngestor):
-    def ingest(self, file_path: str) -> pd.DataFrame:
-        """Extracts a .zip file and returns the contents as a pandas DataFrame."""
-        # Ensure the file is a .zip
-        if not file_path.endswith(".zip"):
-            raise ValueError("The provided file is not a .zip file")
-        
-        # Extract the zip file 
-        with zipfile.ZipFile(file_path, "r") as zip_ref:
-            zip_ref.extractall("extracted_data")
+# --------------------------------------------
+# The CSV member is parsed straight out of the archive with ZipFile.open, so
+# nothing is written to disk unless `extract_dir` is given explicitly.
+@register_ingestor(extensions=(".zip",), magic=(b"PK\x03\x04",))
+class ZipDataIngestion(CSVDataIngestor):
+    def __init__(self, member: str = None, extract_dir: str = None, schema=None, **read_options):
+        """
+        Initialises the ZIP ingestor.
 
-        # find the extraxcted CSV file (assuming there is one CSV file inside the zip)
-        extracted_files = os.listdir("extracted_data")
-        csv_files = [f for f in extracted_files if f.endswith(".csv")]
+        Parameters:
+        member (str): Name of the CSV member to read. Required when the archive holds more than one CSV.
+        extract_dir (str): If set, the archive is extracted there first (the old behaviour).
+        schema (DatasetSchema | str): Schema, or the name of a registered schema, to read the CSV with.
+        **read_options: Extra keyword arguments passed on to pd.read_csv. They override the schema options.
 
+        Returns:
+        None
+        """
+        super().__init__(schema=schema, **read_options)
+        self.member = member
+        self.extract_dir = extract_dir
+
+    def _find_csv_member(self, zip_ref: zipfile.ZipFile) -> str:
+        """Returns the name of the CSV member to read from an open archive."""
+        if self.member is not None:
+            if self.member not in zip_ref.namelist():
+                raise FileNotFoundError(f"{self.member} not found in the archive.")
+            return self.member
+
+        csv_files = [
+            info.filename for info in zip_ref.infolist()
+            if not info.is_dir() and info.filename.endswith(".csv")
+        ]
         if len(csv_files) == 0:
             raise FileNotFoundError("No CSV file found in the extracted data.")
-        
         if len(csv_files) > 1:
             raise ValueError("Multiple CSV files found. please specify which one to use")
-        else:
-            # Read the CSV into a DataFrame
-            csv_file_path = os.path.join("extracted_data", csv_files[0])
-            df = pd.read_csv(csv_file_path)
+        return csv_files[0]
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Reads the CSV inside a .zip file and returns the contents as a pandas DataFrame."""
+        # Ensure the file is a .zip
+        if not zipfile.is_zipfile(file_path):
+            raise ValueError("The provided file is not a .zip file")
+
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            csv_member = self._find_csv_member(zip_ref)
+
+            if self.extract_dir is not None:
+                # Extract the zip file and read the extracted copy
+                zip_ref.extract(csv_member, self.extract_dir)
+                csv_file_path = os.path.join(self.extract_dir, csv_member)
+                return self._apply_schema(pd.read_csv(csv_file_path, **self._read_csv_options()))
 
+            # Read the CSV member in place, without touching the disk
+            with zip_ref.open(csv_member) as csv_file:
+                df = pd.read_csv(csv_file, **self._read_csv_options())
 
         # Return the DataFrame 
-        return df
+        return self._apply_schema(df)
+
+    def ingest_chunks(self, file_path: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Streams the CSV inside a .zip file as DataFrames of at most `chunksize` rows.
+
+        Only one chunk is held in memory at a time, so peak memory does not
+        grow with the size of the archive.
+
+        Parameters:
+        file_path (str): Path to the .zip archive
+        chunksize (int): Number of rows per chunk
+
+        Returns:
+        Iterator[pd.DataFrame]: The CSV contents, chunk by chunk
+        """
+        if not zipfile.is_zipfile(file_path):
+            raise ValueError("The provided file is not a .zip file")
+
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            csv_member = self._find_csv_member(zip_ref)
+            with zip_ref.open(csv_member) as csv_file:
+                with pd.read_csv(csv_file, chunksize=chunksize, **self._read_csv_options()) as reader:
+                    for chunk in reader:
+                        yield chunk
     
 
+# Concrete class for plain and compressed CSV files
+# ------------------------------------------------
+# pandas infers gzip/bz2/xz compression from the extension; for files without
+# a telling extension the compression is taken from the magic bytes instead.
+@register_ingestor(
+    extensions=(".csv", ".csv.gz", ".gz", ".csv.bz2", ".bz2", ".csv.xz", ".xz"),
+    magic=(b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00"),
+)
+class CompressedCSVIngestion(CSVDataIngestor):
+    COMPRESSION_BY_MAGIC = {b"\x1f\x8b": "gzip", b"BZh": "bz2", b"\xfd7zXZ\x00": "xz"}
+
+    def _compression(self, file_path: str) -> str:
+        with open(file_path, "rb") as f:
+            head = f.read(6)
+        for signature, compression in self.COMPRESSION_BY_MAGIC.items():
+            if head.startswith(signature):
+                return compression
+        return None
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Reads a plain, gzip, bz2 or xz compressed CSV file into a pandas DataFrame."""
+        options = self._read_csv_options()
+        options.setdefault("compression", self._compression(file_path))
+        return self._apply_schema(pd.read_csv(file_path, **options))
+
+    def ingest_chunks(self, file_path: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Streams a plain or compressed CSV file as DataFrames of at most `chunksize` rows."""
+        options = self._read_csv_options()
+        options.setdefault("compression", self._compression(file_path))
+        with pd.read_csv(file_path, chunksize=chunksize, **options) as reader:
+            for chunk in reader:
+                yield chunk
+
+
+# Concrete class for Parquet files
+# --------------------------------
+@register_ingestor(extensions=(".parquet", ".pq"), magic=(b"PAR1",))
+class ParquetIngestion(DataIngestor):
+    def __init__(self, columns: List[str] = None, **read_options):
+        """
+        Initialises the Parquet ingestor.
+
+        Parameters:
+        columns (List[str]): Only read these columns. Reads all of them when None.
+        **read_options: Extra keyword arguments passed on to pd.read_parquet.
+
+        Returns:
+        None
+        """
+        self.columns = columns
+        self.read_options = read_options
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Reads a Parquet file into a pandas DataFrame."""
+        return pd.read_parquet(file_path, columns=self.columns, **self.read_options)
+
+
+# Concrete class for directories of shards
+# ----------------------------------------
+# Every file in the directory is read by the ingestor registered for it, in a
+# thread pool (decompression and parsing release the GIL). The shards are then
+# combined with a single pd.concat call, so the output is allocated once
+# instead of being regrown shard by shard. A directory may mix formats: the
+# shared options reach CSV based ingestors whole, and other ingestors only get
+# the ones their constructor names (so schema= never reaches pd.read_parquet).
+# Format specific options go in options_by_extension.
+class ShardedDirectoryIngestion(DataIngestor):
+    def __init__(self, pattern: str = "*", max_workers: int = None,
+                 options_by_extension: Dict[str, dict] = None, **ingestor_options):
+        """
+        Initialises the sharded directory ingestor.
+
+        Parameters:
+        pattern (str): Glob pattern selecting the shard files inside the directory
+        max_workers (int): Number of threads reading shards. Defaults to the ThreadPoolExecutor default.
+        options_by_extension (Dict[str, dict]): Extra options for the ingestors of one registered extension,
+            e.g. {".parquet": {"columns": [...]}}. They override the shared options.
+        **ingestor_options: Keyword arguments shared by every shard's ingestor (e.g. schema)
+
+        Returns:
+        None
+        """
+        self.pattern = pattern
+        self.max_workers = max_workers
+        self.options_by_extension = {
+            extension.lower(): options for extension, options in (options_by_extension or {}).items()
+        }
+        self.ingestor_options = ingestor_options
+
+    def shard_paths(self, directory: str) -> List[str]:
+        """Returns the shard files of a directory in a stable (sorted) order."""
+        paths = sorted(
+            path for path in glob.glob(os.path.join(directory, self.pattern))
+            if os.path.isfile(path)
+        )
+        if len(paths) == 0:
+            raise FileNotFoundError(f"No shards matching {self.pattern} found in {directory}")
+        return paths
+
+    def shard_options(self, path: str, ingestor_class: type) -> dict:
+        """Returns the constructor options for the ingestor of one shard."""
+        if issubclass(ingestor_class, CSVDataIngestor):
+            options = dict(self.ingestor_options)
+        else:
+            parameters = inspect.signature(ingestor_class).parameters
+            named = {
+                name for name, parameter in parameters.items()
+                if parameter.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            }
+            options = {name: value for name, value in self.ingestor_options.items() if name in named}
+
+        extension = _matching_extension(path, self.options_by_extension)
+        if extension is not None:
+            options.update(self.options_by_extension[extension])
+        return options
+
+    def _ingest_shard(self, path: str) -> pd.DataFrame:
+        ingestor_class = DataIngestorFactory.get_ingestor_class_for_path(path)
+        ingestor = ingestor_class(**self.shard_options(path, ingestor_class))
+        return ingestor.ingest(path)
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Reads every shard of a directory concurrently and returns them as one DataFrame."""
+        if not os.path.isdir(file_path):
+            raise ValueError("The provided path is not a directory")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = list(executor.map(self._ingest_shard, self.shard_paths(file_path)))
+        return pd.concat(frames, ignore_index=True)
+
+
+def _matching_extension(file_path: str, extensions) -> str:
+    """Returns the longest of `extensions` the file name ends with, or None."""
+    name = os.path.basename(file_path).lower()
+    matches = [extension for extension in extensions if name.endswith(extension)]
+    return max(matches, key=len) if matches else None
+
+
 # Implement a Factory to create Data Ingestors
 class DataIngestorFactory:
     @staticmethod
-    def get_data_ingestor(file_extension: str) -> DataIngestor:
-        """Returns the appropriate DataIngestor based on file extensions."""
-        if file_extension == ".zip":
-            return ZipDataIngestion
-        else:
+    def get_data_ingestor(file_extension: str, **options) -> DataIngestor:
+        """Returns an instance of the DataIngestor registered for a file extension."""
+        ingestor_class = INGESTORS_BY_EXTENSION.get(file_extension.lower())
+        if ingestor_class is None:
             raise ValueError(f"No ingestor for file extension: {file_extension}")
-        
+        return ingestor_class(**options)
+
+    @staticmethod
+    def get_data_ingestor_for_path(file_path: str, **options) -> DataIngestor:
+        """
+        Returns an ingestor instance for a path, looking at the path itself.
+
+        Directories get a ShardedDirectoryIngestion. Files are matched on their
+        longest registered extension (so ".csv.gz" wins over ".gz") and, failing
+        that, on their magic bytes.
+
+        Parameters:
+        file_path (str): Path to a file or a directory of shards
+        **options: Keyword arguments for the ingestor's constructor
+
+        Returns:
+        DataIngestor: The ingestor instance
+        """
+        if os.path.isdir(file_path):
+            return ShardedDirectoryIngestion(**options)
+        return DataIngestorFactory.get_ingestor_class_for_path(file_path)(**options)
+
+    @staticmethod
+    def get_ingestor_class_for_path(file_path: str) -> type:
+        """
+        Returns the DataIngestor class registered for a file.
+
+        Parameters:
+        file_path (str): Path to a file
+
+        Returns:
+        type: The ingestor class matched on the longest extension, or else on the magic bytes
+        """
+        extension = _matching_extension(file_path, INGESTORS_BY_EXTENSION)
+        if extension is not None:
+            return INGESTORS_BY_EXTENSION[extension]
+
+        with open(file_path, "rb") as f:
+            head = f.read(8)
+        for signature, ingestor_class in INGESTORS_BY_MAGIC:
+            if head.startswith(signature):
+                return ingestor_class
+        raise ValueError(f"No ingestor for file: {file_path}")
+
 
 # Example usage:
 if __name__ == "__main__":
@@ -66,7 +376,8 @@ if __name__ == "__main__":
 
     # # Get appropriate data insgestor 
     #data_ingestor = DataIngestorFactory.get_data_ingestor(file_extension)
+    #df = data_ingestor.ingest(file_path)
 
     # # Now df contains DataFrame from the exracted csv
     # print(df.head()) # Display the first few rows of the DataFrame
-    pass 
\ No newline at end of file
+    pass
@@ -0,0 +1,387 @@
+import os
+import time
+import asyncio
+import functools
+import dataclasses
+import zipfile
+import itertools
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+
+import pandas as pd
+
+from batch_ingest import align_categories
+from ingest_data import CSVDataIngestor, DataIngestorFactory
+
+
+# Job results and progress events
+# -------------------------------
+@dataclass
+class IngestionResult:
+    job_id: int
+    path: str
+    frame: pd.DataFrame = None
+    seconds: float = 0.0
+    cached: bool = False
+    error: BaseException = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ProgressEvent:
+    job_id: int
+    path: str
+    stage: str
+    rows: int = 0
+    estimated_bytes: int = 0
+    seconds: float = 0.0
+    error: str = None
+    timestamp: float = 0.0
+
+
+# Memory budget
+# -------------
+# Jobs reserve their estimated in-memory size before they start and release
+# it when they finish. A job that does not fit waits until enough is
+# released; a job larger than the whole budget runs alone.
+class MemoryBudget:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_use = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, n_bytes: int):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use == 0 or self.in_use + n_bytes <= self.max_bytes)
+            self.in_use += n_bytes
+
+    async def release(self, n_bytes: int):
+        async with self._condition:
+            self.in_use -= n_bytes
+            self._condition.notify_all()
+
+
+def estimate_bytes(path: str, factor: float = 2.0) -> int:
+    """
+    Estimates the memory a file takes once ingested
+
+    Parameters:
+    path (str): Path of a file or a directory of shards
+    factor (float): In-memory bytes per uncompressed byte of CSV
+
+    Returns:
+    int: The estimate, in bytes
+    """
+    if os.path.isdir(path):
+        return sum(estimate_bytes(os.path.join(path, name), factor) for name in os.listdir(path))
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zip_ref:
+            return int(sum(info.file_size for info in zip_ref.infolist()) * factor)
+    size = os.path.getsize(path)
+    # Stream-compressed files do not record their uncompressed size; assume a typical CSV ratio
+    if path.lower().endswith((".gz", ".bz2", ".xz")):
+        size *= 5
+    return int(size * factor)
+
+
+def _ingest(path: str, options: dict, chunksize: int = None, on_chunk=None) -> pd.DataFrame:
+    ingestor = DataIngestorFactory.get_data_ingestor_for_path(path, **options)
+    if chunksize is None or on_chunk is None or not hasattr(ingestor, "ingest_chunks"):
+        return ingestor.ingest(path)
+    chunks = []
+    for chunk in ingestor.ingest_chunks(path, chunksize=chunksize):
+        chunks.append(chunk)
+        on_chunk(len(chunk))
+    # Per-chunk categoricals only share categories after alignment
+    df = pd.concat(align_categories(chunks), ignore_index=True) if chunks else ingestor.ingest(path)
+    return ingestor._apply_schema(df) if isinstance(ingestor, CSVDataIngestor) else df
+
+
+def _copy_outcome(source: asyncio.Future, target: asyncio.Future):
+    """Resolves a caller's future from a job's, with the caller's own copy of the frame."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+        return
+    result = source.result()
+    if result.frame is not None:
+        result = dataclasses.replace(result, frame=result.frame.copy())
+    target.set_result(result)
+
+
+# Ingestion service
+# -----------------
+# An asyncio front end over the ingestor registry. Submitted paths go into a
+# bounded queue, so producers wait when it is full; `max_in_flight` workers
+# take jobs from it, reserve memory from the budget and run the ingestor in an
+# executor, so decompression and parsing never block the event loop.
+# Recently ingested frames stay in a warm LRU cache keyed by path, size,
+# modification time and options, and concurrent requests for the same file
+# share one job. Every caller receives its own copy of the frame, so one
+# consumer's in-place edits never reach the cache or another consumer. Every
+# stage is published as a ProgressEvent.
+class IngestionService:
+    def __init__(self, max_in_flight: int = 2, max_queue: int = 16, memory_budget: int = 2 * 1024**3,
+                 cache_entries: int = 8, cache_bytes: int = 1024**3, chunksize: int = None,
+                 executor: Executor = None, memory_factor: float = 2.0, **ingestor_options):
+        """
+        Initialises the service; call start() or use it as an async context manager
+
+        Parameters:
+        max_in_flight (int): Number of jobs ingesting at the same time
+        max_queue (int): Number of queued jobs before submit() waits
+        memory_budget (int): Bytes of estimated in-memory size the running jobs may reserve together
+        cache_entries (int): Number of ingested frames kept warm
+        cache_bytes (int): Total in-memory size of the warm frames
+        chunksize (int): If set, ingestors that can stream report progress every `chunksize` rows
+        executor (Executor): Where ingestion runs. Defaults to a thread pool of max_in_flight threads.
+        memory_factor (float): In-memory bytes per uncompressed byte of CSV, for the estimates
+        **ingestor_options: Keyword arguments for every ingestor, e.g. schema="ames_housing"
+
+        Returns:
+        None
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.memory_budget = memory_budget
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self.chunksize = chunksize
+        self.memory_factor = memory_factor
+        self.ingestor_options = ingestor_options
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._subscribers = []
+        self._job_ids = itertools.count(1)
+        self._workers = []
+        self._queue = None
+        self._budget = None
+
+    async def __aenter__(self) -> "IngestionService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self):
+        """Starts the workers."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="ingest")
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._budget = MemoryBudget(self.memory_budget)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+
+    async def stop(self, drain: bool = True):
+        """
+        Stops the workers and closes the progress streams
+
+        Parameters:
+        drain (bool): Finish the queued jobs first. Otherwise they are cancelled.
+
+        Returns:
+        None
+        """
+        if self._queue is None:
+            # Never started
+            return
+        if drain:
+            await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job_id, path, options, future in self._drain_queue():
+            future.cancel()
+        for subscriber in self._subscribers:
+            subscriber.put_nowait(None)
+        self._subscribers = []
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _drain_queue(self):
+        while not self._queue.empty():
+            yield self._queue.get_nowait()
+            self._queue.task_done()
+
+    # Progress
+    def subscribe(self) -> asyncio.Queue:
+        """Returns a queue receiving every ProgressEvent, and None once the service stops."""
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    async def events(self) -> AsyncIterator[ProgressEvent]:
+        """Yields every ProgressEvent until the service stops."""
+        queue = self.subscribe()
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            yield event
+
+    def _publish(self, job_id: int, path: str, stage: str, **fields):
+        event = ProgressEvent(job_id, path, stage, timestamp=time.time(), **fields)
+        for subscriber in self._subscribers:
+            subscriber.put_nowait(event)
+
+    # Warm cache
+    def _cache_key(self, path: str, options: dict) -> tuple:
+        stat = os.stat(path)
+        return (os.path.realpath(path), stat.st_size, stat.st_mtime_ns, repr(sorted(options.items())))
+
+    def _remember(self, key: tuple, df: pd.DataFrame):
+        self._cache[key] = df
+        self._cache.move_to_end(key)
+        total = sum(int(frame.memory_usage(index=False).sum()) for frame in self._cache.values())
+        while len(self._cache) > self.cache_entries or (total > self.cache_bytes and len(self._cache) > 1):
+            _, evicted = self._cache.popitem(last=False)
+            total -= int(evicted.memory_usage(index=False).sum())
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    # Jobs
+    async def submit(self, path: str, **options) -> "asyncio.Future[IngestionResult]":
+        """
+        Queues a file for ingestion, waiting while the queue is full
+
+        Parameters:
+        path (str): Path of a file or a directory of shards
+        **options: Ingestor options for this job, on top of the service's
+
+        Returns:
+        asyncio.Future[IngestionResult]: Resolves when the job finishes; it never raises
+        """
+        if self._queue is None:
+            raise ValueError("The service is not running; call start() first")
+        options = {**self.ingestor_options, **options}
+        job_id = next(self._job_ids)
+        future = asyncio.get_running_loop().create_future()
+
+        try:
+            key = self._cache_key(path, options)
+        except Exception as error:
+            # e.g. a missing file: fail this job without stopping the caller's loop
+            self._publish(job_id, path, "failed", error=f"{type(error).__name__}: {error}")
+            future.set_result(IngestionResult(job_id, path, error=error))
+            return future
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._publish(job_id, path, "cached", rows=len(self._cache[key]))
+            future.set_result(IngestionResult(job_id, path, self._cache[key].copy(), cached=True))
+            return future
+        if key in self._in_flight:
+            # Share the running job's result
+            shared = self._in_flight[key]
+            self._publish(job_id, path, "joined")
+            shared.add_done_callback(lambda done: _copy_outcome(done, future))
+            return future
+
+        # The job's own future holds the frame that goes into the cache; callers get copies
+        job = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = job
+        job.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        job.add_done_callback(lambda done: _copy_outcome(done, future))
+        await self._queue.put((job_id, path, options, job))
+        self._publish(job_id, path, "queued")
+        return future
+
+    async def ingest(self, path: str, **options) -> pd.DataFrame:
+        """Ingests a file through the service and returns the frame, raising the job's error if it failed."""
+        result = await (await self.submit(path, **options))
+        if result.error is not None:
+            raise result.error
+        return result.frame
+
+    async def consume(self, paths: asyncio.Queue) -> List[IngestionResult]:
+        """
+        Ingests every path put on an in-process queue until a None is received
+
+        Parameters:
+        paths (asyncio.Queue): Queue of paths; put None to end
+
+        Returns:
+        List[IngestionResult]: The results, in the order the paths were received
+        """
+        futures = []
+        while True:
+            path = await paths.get()
+            if path is None:
+                break
+            futures.append(await self.submit(path))
+        return list(await asyncio.gather(*futures))
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, path, options, future = await self._queue.get()
+            try:
+                await self._run(loop, job_id, path, options, future)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, loop, job_id: int, path: str, options: dict, future: asyncio.Future):
+        estimated = 0
+        start = time.perf_counter()
+        try:
+            estimated = estimate_bytes(path, self.memory_factor)
+            self._publish(job_id, path, "waiting", estimated_bytes=estimated)
+            await self._budget.acquire(estimated)
+        except BaseException as error:
+            estimated = 0
+            if not future.done():
+                future.set_result(IngestionResult(job_id, path, error=error))
+            if not isinstance(error, Exception):
+                raise
+            return
+        try:
+            self._publish(job_id, path, "started", estimated_bytes=estimated)
+            rows_read = [0]
+
+            def on_chunk(n_rows):
+                # Runs in the executor thread; hand the event to the loop
+                rows_read[0] += n_rows
+                loop.call_soon_threadsafe(functools.partial(self._publish, job_id, path, "progress", rows=rows_read[0]))
+
+            on_chunk = on_chunk if isinstance(self._executor, ThreadPoolExecutor) else None
+            df = await loop.run_in_executor(self._executor, _ingest, path, options, self.chunksize, on_chunk)
+            seconds = time.perf_counter() - start
+            self._remember(self._cache_key(path, options), df)
+            self._publish(job_id, path, "done", rows=len(df), seconds=seconds)
+            if not future.done():
+                future.set_result(IngestionResult(job_id, path, df, seconds))
+        except BaseException as error:
+            # Includes the CancelledError of stop(drain=False), so callers and joined duplicates never hang
+            seconds = time.perf_counter() - start
+            self._publish(job_id, path, "failed", seconds=seconds, error=f"{type(error).__name__}: {error}")
+            if not future.done():
+                future.set_result(IngestionResult(job_id, path, seconds=seconds, error=error))
+            if not isinstance(error, Exception):
+                raise
+        finally:
+            await self._budget.release(estimated)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # async def main():
+    #     async with IngestionService(max_in_flight=2, memory_budget=4 * 1024**3, chunksize=50_000) as service:
+    #         async def show_progress():
+    #             async for event in service.events():
+    #                 print(event.job_id, event.stage, event.rows)
+    #         progress = asyncio.create_task(show_progress())
+    #         df = await service.ingest("../data/archive.zip")
+    #         df = await service.ingest("../data/archive.zip")  # served from the warm cache
+    #
+    # asyncio.run(main())
+    pass
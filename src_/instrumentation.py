@@ -0,0 +1,359 @@
+import os
+import json
+import time
+import functools
+import threading
+import tracemalloc
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pandas as pd
+
+from ingest_data import DataIngestor
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource is POSIX only
+    resource = None
+
+
+# Call record
+# -----------
+# One record per instrumented call. `peak_rss_bytes` is the process high-water
+# mark after the call; `traced_peak_bytes` is the peak Python/numpy allocation
+# during the call and is only measured for outermost calls when memory tracing
+# is on. Rows and bytes come from the first DataFrame argument, or for
+# ingestors from the source file and the returned frame.
+@dataclass
+class CallRecord:
+    component: str
+    method: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows: int = None
+    bytes: int = None
+    rows_per_second: float = None
+    peak_rss_bytes: int = None
+    traced_peak_bytes: int = None
+    depth: int = 0
+    error: str = None
+    timestamp: float = 0.0
+
+
+# Sinks
+# -----
+class MetricsSink(ABC):
+    @abstractmethod
+    def emit(self, record: CallRecord):
+        """
+        Receives one call record
+
+        Parameters:
+        record (CallRecord): The measurements of one instrumented call
+
+        Returns:
+        None
+        """
+        pass
+
+
+class InMemorySink(MetricsSink):
+    def __init__(self, max_records: int = 100_000):
+        """Keeps the most recent `max_records` records in memory."""
+        self.records = deque(maxlen=max_records)
+
+    def emit(self, record: CallRecord):
+        self.records.append(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the records as a DataFrame, one row per call."""
+        return pd.DataFrame([asdict(record) for record in self.records], columns=list(CallRecord.__dataclass_fields__))
+
+    def summary(self) -> pd.DataFrame:
+        """Returns call counts and total/mean/max wall time per component and method, slowest first."""
+        frame = self.to_frame()
+        summary = frame.groupby(["component", "method"])["wall_seconds"].agg(["count", "sum", "mean", "max"])
+        return summary.sort_values("sum", ascending=False)
+
+
+class JSONLSink(MetricsSink):
+    def __init__(self, path: str):
+        """Appends every record as one JSON line to `path`."""
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record: CallRecord):
+        line = json.dumps(asdict(record)) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+
+class PrometheusSink(MetricsSink):
+    METRICS = (
+        ("calls_total", "counter", "Number of calls"),
+        ("errors_total", "counter", "Number of calls that raised"),
+        ("wall_seconds_total", "counter", "Wall-clock seconds spent in calls"),
+        ("cpu_seconds_total", "counter", "Process CPU seconds spent in calls"),
+        ("rows_total", "counter", "Input rows processed"),
+        ("bytes_total", "counter", "Input bytes processed"),
+        ("last_rows_per_second", "gauge", "Throughput of the last call"),
+        ("max_traced_peak_bytes", "gauge", "Largest traced allocation peak of a call"),
+    )
+
+    def __init__(self, prefix: str = "house_price"):
+        """
+        Aggregates records into counters served in the Prometheus text format
+
+        Parameters:
+        prefix (str): Prefix of every metric name
+
+        Returns:
+        None
+        """
+        self.prefix = prefix
+        self._values = {}
+        self._peak_rss = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def emit(self, record: CallRecord):
+        with self._lock:
+            values = self._values.setdefault((record.component, record.method), dict.fromkeys(
+                [name for name, _, _ in self.METRICS], 0.0))
+            values["calls_total"] += 1
+            values["errors_total"] += record.error is not None
+            values["wall_seconds_total"] += record.wall_seconds
+            values["cpu_seconds_total"] += record.cpu_seconds
+            values["rows_total"] += record.rows or 0
+            values["bytes_total"] += record.bytes or 0
+            if record.rows_per_second is not None:
+                values["last_rows_per_second"] = record.rows_per_second
+            values["max_traced_peak_bytes"] = max(values["max_traced_peak_bytes"], record.traced_peak_bytes or 0)
+            self._peak_rss = max(self._peak_rss, record.peak_rss_bytes or 0)
+
+    def render(self) -> str:
+        """Returns the current metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, kind, help_text in self.METRICS:
+                metric = f"{self.prefix}_{name}"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                for (component, method), values in sorted(self._values.items()):
+                    lines.append(f'{metric}{{component="{component}",method="{method}"}} {values[name]}')
+            metric = f"{self.prefix}_peak_rss_bytes"
+            lines += [f"# HELP {metric} Process resident set size high-water mark", f"# TYPE {metric} gauge",
+                      f"{metric} {self._peak_rss}"]
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        """
+        Serves the metrics on http://host:port/metrics from a daemon thread
+
+        Parameters:
+        host (str): Interface to bind; local only by default
+        port (int): Port to bind; 0 picks a free port (see server.server_address)
+
+        Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it
+        """
+        sink = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+
+# Instrumentation
+# ---------------
+# Wraps the entry points of the given base classes and all of their current
+# subclasses. Only methods a class defines itself are wrapped, so a call to an
+# inherited method is measured once, and reported under the instance's class. While disabled a
+# wrapper costs one attribute check before calling through; remove() restores
+# the original methods entirely. Subclasses defined after instrument() are not
+# wrapped until instrument() is called again. The compute/draw halves of the
+# univariate strategies, the batch summaries and the correlation matrix are
+# entry points too, since Analysis.execute_analysis and EDAPlan.run call them
+# directly rather than through analyze().
+ENTRY_POINTS = ("ingest", "inspect", "analyze", "compute", "draw", "summarize", "correlation_matrix",
+                "generate_correlation_heatmap", "generate_pairplot")
+
+
+def _input_size(args, result):
+    for value in args:
+        if isinstance(value, pd.DataFrame):
+            return len(value), int(value.memory_usage(index=False).sum())
+    # Ingestors: the source file's size and the rows it produced
+    rows = len(result) if isinstance(result, pd.DataFrame) else None
+    for value in args:
+        if isinstance(value, (str, os.PathLike)) and os.path.isfile(value):
+            return rows, os.path.getsize(value)
+    return rows, None
+
+
+def _peak_rss() -> int:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Instrumentation:
+    def __init__(self, sinks: List[MetricsSink], trace_memory: bool = False):
+        """
+        Holds the sinks and the patched methods; use instrument() to create one
+
+        Parameters:
+        sinks (List[MetricsSink]): Where the records are sent
+        trace_memory (bool): Also measure the traced allocation peak of outermost calls (slows calls down)
+
+        Returns:
+        None
+        """
+        self.sinks = list(sinks)
+        self.trace_memory = trace_memory
+        self.enabled = True
+        self._patched = []
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def patch(self, cls: type, name: str):
+        original = cls.__dict__[name]
+        if getattr(original, "__instrumented__", False):
+            return
+        component = cls.__name__
+        state = self
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            if not state.enabled:
+                return original(*args, **kwargs)
+            return state._measure(component, name, original, args, kwargs)
+
+        wrapper.__instrumented__ = True
+        setattr(cls, name, wrapper)
+        self._patched.append((cls, name, original))
+
+    def _measure(self, component: str, method: str, function, args, kwargs):
+        depth = getattr(self._local, "depth", 0)
+        trace = self.trace_memory and depth == 0
+        started_tracing = False
+        if trace:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        self._local.depth = depth + 1
+        result, error = None, None
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            result = function(*args, **kwargs)
+            return result
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._local.depth = depth
+            traced_peak = None
+            if trace:
+                traced_peak = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            # args[0] is the strategy or ingestor itself
+            rows, size = _input_size(args[1:], result)
+            record = CallRecord(
+                # Report the concrete class, e.g. FastMultivariateAnalysis for the inherited analyze
+                component=type(args[0]).__name__ if args else component,
+                method=method,
+                wall_seconds=wall,
+                cpu_seconds=cpu,
+                rows=rows,
+                bytes=size,
+                rows_per_second=rows / wall if rows is not None and wall > 0 else None,
+                peak_rss_bytes=_peak_rss(),
+                traced_peak_bytes=traced_peak,
+                depth=depth,
+                error=error,
+                timestamp=time.time(),
+            )
+            for sink in self.sinks:
+                sink.emit(record)
+
+    def remove(self):
+        """Restores every patched method."""
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched = []
+
+
+def _with_subclasses(cls: type) -> List[type]:
+    classes, pending = [], [cls]
+    while pending:
+        current = pending.pop()
+        if current not in classes:
+            classes.append(current)
+            pending.extend(current.__subclasses__())
+    return classes
+
+
+def instrument(*base_classes: type, sinks: List[MetricsSink] = None, methods=ENTRY_POINTS,
+               trace_memory: bool = False) -> Instrumentation:
+    """
+    Instruments the entry points of ingestors and EDA strategies
+
+    Parameters:
+    *base_classes (type): Base classes to instrument with all their subclasses, e.g. DataIngestor,
+        DataInspectionStrategy, UnivariateAnalysisStrategy. Defaults to DataIngestor.
+    sinks (List[MetricsSink]): Where the records are sent. Defaults to one InMemorySink.
+    methods (tuple): Names of the methods to wrap
+    trace_memory (bool): Also measure the traced allocation peak of outermost calls (slows calls down)
+
+    Returns:
+    Instrumentation: The handle, to disable(), enable() or remove() the instrumentation and reach the sinks
+    """
+    instrumentation = Instrumentation(sinks if sinks is not None else [InMemorySink()], trace_memory)
+    for base in base_classes or (DataIngestor,):
+        for cls in _with_subclasses(base):
+            for name in methods:
+                if name in cls.__dict__ and callable(cls.__dict__[name]):
+                    instrumentation.patch(cls, name)
+    return instrumentation
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Instrument ingestion and the EDA strategies, and serve the metrics locally
+    # prometheus = PrometheusSink()
+    # prometheus.serve(port=9464)
+    # memory = InMemorySink()
+    # hooks = instrument(DataIngestor, DataInspectionStrategy, UnivariateAnalysisStrategy,
+    #                    BivariateAnalysisStrategy, MultivariateAnalysisTemplate,
+    #                    sinks=[memory, prometheus, JSONLSink("metrics.jsonl")])
+    # df = ZipDataIngestion().ingest("../data/archive.zip")
+    # print(memory.summary())
+    # hooks.disable()
+    pass
@@ -0,0 +1,474 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_cache import FRAME_EXTENSION, read_frame, write_frame
+from feature_engineering import FeaturePipeline
+from ingest_data import DataIngestor
+from price_model import RidgeRegression
+
+
+def _file_sha256(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def dataset_fingerprint(ingestor: DataIngestor, file_path: str) -> str:
+    """
+    Identifies the data an artifact was trained on: the source contents plus how they were read
+
+    Parameters:
+    ingestor (DataIngestor): The ingestor that read the data. A CachedDataIngestor's own cache key is reused.
+    file_path (str): The ingested file, or directory of shards
+
+    Returns:
+    str: Hex SHA-256 digest
+    """
+    if callable(getattr(ingestor, "cache_key", None)):
+        return ingestor.cache_key(file_path)
+    sha = hashlib.sha256()
+    if os.path.isdir(file_path):
+        for name in sorted(os.listdir(file_path)):
+            sha.update(name.encode())
+            sha.update(_file_sha256(os.path.join(file_path, name)).encode())
+    else:
+        sha.update(_file_sha256(file_path).encode())
+    # Same rule as CachedDataIngestor: underscore attributes are per-run state, not read options
+    settings = {name: value for name, value in vars(ingestor).items() if not name.startswith("_")}
+    options = {"ingestor": type(ingestor).__name__, "options": settings}
+    sha.update(json.dumps(options, sort_keys=True, default=repr).encode())
+    return sha.hexdigest()
+
+
+# Artifact codecs
+# ---------------
+# A codec writes one kind of object into a version directory and reads it
+# back. Arrays are stored as .npy files and loaded with mmap_mode="r", so a
+# load maps the file instead of deserializing it and processes serving the same
+# version share its pages. New kinds are added with @register_codec, the same
+# way ingestors are registered.
+class ArtifactCodec(ABC):
+    kind: str = None
+
+    @abstractmethod
+    def handles(self, obj) -> bool:
+        pass
+
+    @abstractmethod
+    def save(self, obj, directory: str):
+        """Writes the object's files into the (empty) directory."""
+        pass
+
+    @abstractmethod
+    def load(self, directory: str):
+        """Reads the object back, memory-mapping large arrays."""
+        pass
+
+
+CODECS: List[ArtifactCodec] = []
+
+
+def register_codec(cls):
+    CODECS.append(cls())
+    return cls
+
+
+def _write_json(path: str, state):
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def _read_json(path: str):
+    with open(path) as f:
+        return json.load(f)
+
+
+@register_codec
+class RidgeRegressionCodec(ArtifactCodec):
+    kind = "ridge_regression"
+
+    def handles(self, obj) -> bool:
+        return isinstance(obj, RidgeRegression)
+
+    def save(self, obj: RidgeRegression, directory: str):
+        if not obj.is_fitted:
+            raise ValueError("Only a fitted model can be registered")
+        np.save(os.path.join(directory, "coef.npy"), obj.coef_)
+        _write_json(os.path.join(directory, "model.json"), {"alpha": obj.alpha, "intercept": obj.intercept_})
+
+    def load(self, directory: str) -> RidgeRegression:
+        state = _read_json(os.path.join(directory, "model.json"))
+        model = RidgeRegression(alpha=state["alpha"])
+        model.coef_ = np.load(os.path.join(directory, "coef.npy"), mmap_mode="r")
+        model.intercept_ = state["intercept"]
+        return model
+
+
+@register_codec
+class FeaturePipelineCodec(ArtifactCodec):
+    kind = "feature_pipeline"
+
+    def handles(self, obj) -> bool:
+        return isinstance(obj, FeaturePipeline)
+
+    def save(self, obj: FeaturePipeline, directory: str):
+        obj.save(os.path.join(directory, "pipeline.json"))
+
+    def load(self, directory: str) -> FeaturePipeline:
+        return FeaturePipeline.load(os.path.join(directory, "pipeline.json"))
+
+
+@register_codec
+class FrameCodec(ArtifactCodec):
+    # EDA profiles, validation reports and other tables. Like the arrays, numerical columns
+    # without missing values load as read-only views of the memory-mapped Feather file
+    kind = "frame"
+
+    def handles(self, obj) -> bool:
+        return isinstance(obj, pd.DataFrame)
+
+    def save(self, obj: pd.DataFrame, directory: str):
+        write_frame(obj, os.path.join(directory, "frame" + FRAME_EXTENSION))
+
+    def load(self, directory: str) -> pd.DataFrame:
+        return read_frame(os.path.join(directory, "frame" + FRAME_EXTENSION), zero_copy=True)
+
+
+@register_codec
+class ArrayCodec(ArtifactCodec):
+    kind = "array"
+
+    def handles(self, obj) -> bool:
+        return isinstance(obj, np.ndarray)
+
+    def save(self, obj: np.ndarray, directory: str):
+        np.save(os.path.join(directory, "array.npy"), obj)
+
+    def load(self, directory: str) -> np.ndarray:
+        return np.load(os.path.join(directory, "array.npy"), mmap_mode="r")
+
+
+@register_codec
+class JSONCodec(ArtifactCodec):
+    kind = "json"
+
+    def handles(self, obj) -> bool:
+        return isinstance(obj, (dict, list))
+
+    def save(self, obj, directory: str):
+        _write_json(os.path.join(directory, "data.json"), obj)
+
+    def load(self, directory: str):
+        return _read_json(os.path.join(directory, "data.json"))
+
+
+def _codec_for_object(obj) -> ArtifactCodec:
+    for codec in CODECS:
+        if codec.handles(obj):
+            return codec
+    raise ValueError(f"No registered codec can store a {type(obj).__name__}")
+
+
+def _codec_for_kind(kind: str) -> ArtifactCodec:
+    for codec in CODECS:
+        if codec.kind == kind:
+            return codec
+    raise ValueError(f"No registered codec for artifact kind {kind!r}")
+
+
+# Artifact metadata
+# -----------------
+@dataclass
+class ArtifactVersion:
+    name: str
+    version: int
+    kind: str
+    content_hash: str
+    created: float
+    files: List[str]
+    dataset_fingerprint: str = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    tags: Dict[str, str] = field(default_factory=dict)
+
+
+# Model registry
+# --------------
+# Artifacts live under root/<name>/v<version>/ next to a metadata.json. A
+# version is written into a staging directory and renamed into place, so
+# readers never see a half-written one, and its content hash covers every
+# file. Registering content and lineage (dataset fingerprint, metrics, params
+# and tags) identical to an existing version returns that version instead of
+# a copy; the same bytes with different lineage get a new version, so the
+# metadata never goes stale. Aliases such as "production" point at versions
+# and can be moved without touching the artifacts. Version numbers are never
+# reused: a deleted version leaves a tombstone file in its directory, so a
+# (name, version) pair always names the same content, in every process that
+# caches it. Loaded objects stay in a
+# bounded LRU keyed by (name, version), so switching between hot versions
+# costs a dictionary lookup; evicted ones reload cheaply through mmap.
+class ModelRegistry:
+    METADATA_FILE = "metadata.json"
+    ALIASES_FILE = "aliases.json"
+    TOMBSTONE_FILE = "DELETED"
+
+    def __init__(self, root: str = "model_registry", cache_size: int = 4):
+        """
+        Opens (or creates) a registry
+
+        Parameters:
+        root (str): The registry directory
+        cache_size (int): Number of loaded artifacts kept in memory
+
+        Returns:
+        None
+        """
+        self.root = root
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    # Paths
+    def _name_dir(self, name: str) -> str:
+        if not name or os.sep in name or name.startswith("."):
+            raise ValueError(f"Invalid artifact name: {name!r}")
+        return os.path.join(self.root, name)
+
+    def _version_dir(self, name: str, version: int) -> str:
+        return os.path.join(self._name_dir(name), f"v{version}")
+
+    def _version_numbers(self, name: str) -> List[int]:
+        """Every version number ever taken, deleted ones included."""
+        name_dir = self._name_dir(name)
+        if not os.path.isdir(name_dir):
+            return []
+        return [int(entry[1:]) for entry in os.listdir(name_dir) if entry[:1] == "v" and entry[1:].isdigit()]
+
+    @staticmethod
+    def _content_hash(directory: str, files: List[str]) -> str:
+        sha = hashlib.sha256()
+        for name in files:
+            sha.update(name.encode())
+            sha.update(_file_sha256(os.path.join(directory, name)).encode())
+        return sha.hexdigest()
+
+    # Writing
+    def register(self, name: str, obj, metrics: Dict[str, float] = None, params: dict = None,
+                 dataset_fingerprint: str = None, tags: Dict[str, str] = None) -> ArtifactVersion:
+        """
+        Stores an object as the next version of an artifact
+
+        Parameters:
+        name (str): Artifact name, e.g. "ames_ridge" or "ames_features"
+        obj: A fitted RidgeRegression, a fitted FeaturePipeline, a DataFrame (e.g. an EDA profile),
+            a NumPy array or JSON-serializable data
+        metrics (Dict[str, float]): Evaluation metrics, e.g. {"cv_rmse": 0.129}
+        params (dict): Hyperparameters
+        dataset_fingerprint (str): See dataset_fingerprint()
+        tags (Dict[str, str]): Free-form labels
+
+        Returns:
+        ArtifactVersion: The new version, or the existing one with identical content and metadata
+        """
+        codec = _codec_for_object(obj)
+        name_dir = self._name_dir(name)
+        os.makedirs(name_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=name_dir)
+        try:
+            codec.save(obj, staging)
+            files = sorted(os.listdir(staging))
+            content_hash = self._content_hash(staging, files)
+            # Compare the metadata as it reads back from JSON (tuples become lists, keys strings)
+            lineage = json.loads(json.dumps([dataset_fingerprint, metrics or {}, params or {}, tags or {}]))
+            for existing in self.versions(name):
+                if existing.content_hash == content_hash and lineage == [
+                        existing.dataset_fingerprint, existing.metrics, existing.params, existing.tags]:
+                    return existing
+
+            while True:
+                version = max(self._version_numbers(name), default=0) + 1
+                record = ArtifactVersion(name, version, codec.kind, content_hash, time.time(), files,
+                                         dataset_fingerprint, dict(metrics or {}), dict(params or {}),
+                                         dict(tags or {}))
+                _write_json(os.path.join(staging, self.METADATA_FILE), asdict(record))
+                # mkdtemp creates the directory private to this user
+                os.chmod(staging, 0o755)
+                try:
+                    # Fails if another writer took this version number first
+                    os.rename(staging, self._version_dir(name, version))
+                    return record
+                except OSError:
+                    if not os.path.isdir(self._version_dir(name, version)):
+                        raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def set_alias(self, name: str, alias: str, version: int):
+        """Points an alias such as "production" at a version."""
+        self.metadata(name, version)
+        aliases = self.aliases(name)
+        aliases[alias] = version
+        self._write_aliases(name, aliases)
+
+    def _write_aliases(self, name: str, aliases: Dict[str, int]):
+        path = os.path.join(self._name_dir(name), self.ALIASES_FILE)
+        _write_json(path + ".tmp", aliases)
+        os.replace(path + ".tmp", path)
+
+    def delete(self, name: str, version: int):
+        """Deletes a version, leaving a tombstone so its number is not reused; aliases pointing at it are removed."""
+        with self._lock:
+            self._cache.pop((name, version), None)
+        version_dir = self._version_dir(name, version)
+        if not os.path.isdir(version_dir):
+            return
+        # The tombstone keeps the directory non-empty, so register() can never rename a new version onto it
+        _write_json(os.path.join(version_dir, self.TOMBSTONE_FILE), {"deleted": time.time()})
+        # Removing the metadata first hides the version from readers at once
+        metadata_path = os.path.join(version_dir, self.METADATA_FILE)
+        if os.path.exists(metadata_path):
+            os.remove(metadata_path)
+        for entry in os.listdir(version_dir):
+            path = os.path.join(version_dir, entry)
+            if entry == self.TOMBSTONE_FILE:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+        aliases = self.aliases(name)
+        if any(v == version for v in aliases.values()):
+            self._write_aliases(name, {alias: v for alias, v in aliases.items() if v != version})
+
+    # Reading
+    def names(self) -> List[str]:
+        return sorted(entry for entry in os.listdir(self.root)
+                      if not entry.startswith(".") and os.path.isdir(os.path.join(self.root, entry)))
+
+    def versions(self, name: str) -> List[ArtifactVersion]:
+        """Every version of an artifact, oldest first."""
+        name_dir = self._name_dir(name)
+        if not os.path.isdir(name_dir):
+            return []
+        records = []
+        for entry in os.listdir(name_dir):
+            path = os.path.join(name_dir, entry, self.METADATA_FILE)
+            if entry.startswith("v") and os.path.exists(path):
+                records.append(ArtifactVersion(**_read_json(path)))
+        return sorted(records, key=lambda record: record.version)
+
+    def aliases(self, name: str) -> Dict[str, int]:
+        path = os.path.join(self._name_dir(name), self.ALIASES_FILE)
+        return _read_json(path) if os.path.exists(path) else {}
+
+    def resolve(self, name: str, version=None) -> int:
+        """
+        Turns a version reference into a version number
+
+        Parameters:
+        name (str): Artifact name
+        version (int | str): A version number, an alias, or None / "latest" for the newest version
+
+        Returns:
+        int: The version number
+        """
+        if version is None or version == "latest":
+            versions = self.versions(name)
+            if not versions:
+                raise FileNotFoundError(f"No versions of {name!r} in the registry")
+            return versions[-1].version
+        if isinstance(version, str) and not version.isdigit():
+            aliases = self.aliases(name)
+            if version not in aliases:
+                raise ValueError(f"{name!r} has no alias {version!r}")
+            return aliases[version]
+        return int(version)
+
+    def metadata(self, name: str, version=None) -> ArtifactVersion:
+        version = self.resolve(name, version)
+        path = os.path.join(self._version_dir(name, version), self.METADATA_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No version {version} of {name!r} in the registry")
+        return ArtifactVersion(**_read_json(path))
+
+    def verify(self, name: str, version=None) -> bool:
+        """Recomputes a version's content hash and compares it with the stored one."""
+        record = self.metadata(name, version)
+        directory = self._version_dir(name, record.version)
+        return self._content_hash(directory, record.files) == record.content_hash
+
+    def load(self, name: str, version=None):
+        """
+        Returns an artifact, from the LRU cache when it is hot
+
+        Parameters:
+        name (str): Artifact name
+        version (int | str): Version number, alias, or None for the latest
+
+        Returns:
+        The stored object. Arrays are read-only memory-mapped views; treat cached objects as shared.
+        """
+        key = (name, self.resolve(name, version))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+        record = self.metadata(*key)
+        obj = _codec_for_kind(record.kind).load(self._version_dir(*key))
+        with self._lock:
+            self._cache[key] = obj
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return obj
+
+    def cached(self) -> List[Tuple[str, int]]:
+        """The (name, version) pairs currently loaded, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Example usage of the registry
+    # from ingest_data import ZipDataIngestion
+    # from feature_engineering import ames_pipeline
+    # from model_training import SuccessiveHalvingSearch, grid
+
+    # ingestor = ZipDataIngestion(schema="ames_housing")
+    # pipeline = ames_pipeline()
+    # X, y = pipeline.ingest(ingestor, "../data/archive.zip", fit=True)
+    # result = SuccessiveHalvingSearch(grid(alpha=[1, 10, 100])).fit(X, y)
+
+    # registry = ModelRegistry("../model_registry")
+    # fingerprint = dataset_fingerprint(ingestor, "../data/archive.zip")
+    # features = registry.register("ames_features", pipeline, dataset_fingerprint=fingerprint)
+    # model = registry.register("ames_ridge", result.best_model, metrics={"cv_rmse": result.best_score},
+    #                           params=result.best_params, dataset_fingerprint=fingerprint,
+    #                           tags={"features_version": str(features.version)})
+    # registry.set_alias("ames_ridge", "production", model.version)
+    # model = registry.load("ames_ridge", "production")
+    pass
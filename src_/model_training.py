@@ -0,0 +1,308 @@
+import os
+import json
+import math
+import time
+import shutil
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from price_model import RidgeRegression, rmse
+
+
+# Shared training arrays
+# ----------------------
+# The feature matrix and target are written once as .npy files and every
+# worker attaches read-only memory-mapped views, so the data is shared through
+# the page cache (RAM-backed under /dev/shm) instead of being pickled into each
+# task. Tasks only carry row index arrays. Like SharedDataset, the manifest is
+# written last and the handle pickles as its path.
+class SharedArrays:
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str):
+        manifest_path = os.path.join(directory, self.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No shared arrays found at: {directory}")
+        with open(manifest_path) as f:
+            self.names = json.load(f)["names"]
+        self.directory = directory
+        self._views = {}
+
+    @classmethod
+    def write(cls, directory: str = None, **arrays: np.ndarray) -> "SharedArrays":
+        """
+        Writes arrays as memory-mappable .npy files
+
+        Parameters:
+        directory (str): Directory to write to; an existing one is replaced. Defaults to a new
+            directory under /dev/shm where available, else under the system temp directory.
+        **arrays (np.ndarray): The arrays, by name
+
+        Returns:
+        SharedArrays: A handle attached to the written arrays
+        """
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="training-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+        elif os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+        tmp_path = os.path.join(directory, cls.MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"names": list(arrays)}, f)
+        os.replace(tmp_path, os.path.join(directory, cls.MANIFEST_FILE))
+        return cls(directory)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self.names:
+            raise ValueError(f"No array named {name} in {self.directory}")
+        if name not in self._views:
+            self._views[name] = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="r")
+        return self._views[name]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_views"] = {}
+        return state
+
+    def remove(self):
+        """Deletes the array files."""
+        self._views = {}
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def kfold_indices(n_rows: int, n_folds: int = 5, seed: int = 0) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Splits shuffled row positions into K folds
+
+    Parameters:
+    n_rows (int): Number of rows
+    n_folds (int): Number of folds
+    seed (int): Seed for the shuffle
+
+    Returns:
+    List[Tuple[np.ndarray, np.ndarray]]: (train, validation) row positions per fold. Training
+        positions stay shuffled, so any prefix of them is a random subsample.
+    """
+    if not 2 <= n_folds <= n_rows:
+        raise ValueError(f"n_folds must be between 2 and the number of rows, got {n_folds}")
+    index_type = np.int32 if n_rows < 2**31 else np.int64
+    order = np.random.default_rng(seed).permutation(n_rows).astype(index_type)
+    folds = np.array_split(order, n_folds)
+    return [(np.concatenate(folds[:k] + folds[k + 1:]), np.sort(folds[k])) for k in range(n_folds)]
+
+
+def grid(**space: list) -> List[dict]:
+    """Returns every combination of the given hyperparameter values, e.g. grid(alpha=[0.1, 1, 10])."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+# Worker side
+# -----------
+# Each worker attaches the shared arrays once, in the pool initializer.
+_shared: SharedArrays = None
+
+
+def _init_worker(shared: SharedArrays):
+    global _shared
+    _shared = shared
+
+
+def _fit_fold(model_class, params: dict, train_rows: np.ndarray, valid_rows: np.ndarray) -> Tuple[float, float, str]:
+    """
+    Fits one configuration on one fold's training rows
+
+    A fit that raises (e.g. a singular system for alpha=0) scores infinity, so the
+    configuration is pruned instead of aborting the search.
+
+    Returns:
+    Tuple[float, float, str]: The validation RMSE, the fit time and the error, if any
+    """
+    start = time.perf_counter()
+    X, y = _shared["X"], _shared["y"]
+    try:
+        model = model_class(**params).fit(X[train_rows], y[train_rows])
+        score = rmse(y[valid_rows], model.predict(X[valid_rows]))
+    except Exception as error:
+        return math.inf, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+    return (score if math.isfinite(score) else math.inf), time.perf_counter() - start, None
+
+
+# Results
+# -------
+@dataclass
+class Trial:
+    config_id: int
+    params: dict
+    rung: int
+    train_rows: int
+    fold_scores: List[float] = field(default_factory=list)
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def score(self) -> float:
+        return float(np.mean(self.fold_scores)) if self.fold_scores else math.inf
+
+
+@dataclass
+class SearchResult:
+    best_params: dict
+    best_score: float
+    best_model: object
+    trials: List[Trial]
+    seconds: float
+
+    def summary(self) -> pd.DataFrame:
+        """One row per configuration and rung, best scores first within each rung."""
+        rows = [{"config_id": t.config_id, **t.params, "rung": t.rung, "train_rows": t.train_rows,
+                 "cv_rmse": t.score, "cv_std": float(np.std(t.fold_scores)), "seconds": t.seconds,
+                 "error": t.errors[0] if t.errors else None}
+                for t in self.trials]
+        return pd.DataFrame(rows).sort_values(["rung", "cv_rmse"], ascending=[False, True], ignore_index=True)
+
+
+# Successive halving search
+# -------------------------
+# Every configuration is cross-validated on a small budget of training rows;
+# only the best 1/eta move up to the next rung, which trains on eta times as
+# many rows, until the survivors train on the full folds. Validation always
+# uses the whole held-out fold, so scores are comparable across rungs. Each
+# rung's (configuration, fold) fits run in parallel on a process pool, so
+# search time is bounded by the cores rather than the number of configurations.
+# The features are fitted once for the whole dataset, so target-encoded
+# columns make the CV scores slightly optimistic; compare configurations with
+# them, but report a held-out score.
+class SuccessiveHalvingSearch:
+    def __init__(self, configs: List[dict], model_class=RidgeRegression, n_folds: int = 5, eta: int = 3,
+                 min_rows: int = None, max_workers: int = None, seed: int = 0):
+        """
+        Initialises the search
+
+        Parameters:
+        configs (List[dict]): Keyword arguments for model_class, one dict per configuration (see grid())
+        model_class: Model with fit(X, y) and predict(X); it must be importable by the workers
+        n_folds (int): Number of cross-validation folds
+        eta (int): Each rung keeps the best 1/eta of the configurations and multiplies the rows by eta
+        min_rows (int): Training rows per fold on the first rung. Defaults to what the rung count implies.
+        max_workers (int): Number of worker processes. Defaults to the number of CPUs.
+        seed (int): Seed for the folds
+
+        Returns:
+        None
+        """
+        if not configs:
+            raise ValueError("The search needs at least one configuration")
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.configs = configs
+        self.model_class = model_class
+        self.n_folds = n_folds
+        self.eta = eta
+        self.min_rows = min_rows
+        self.max_workers = max_workers
+        self.seed = seed
+
+    def rung_sizes(self, max_rows: int) -> List[int]:
+        """Training rows per fold on each rung, ending with all of them."""
+        n_rungs = int(math.floor(math.log(len(self.configs), self.eta) + 1e-9)) + 1
+        sizes = [max(1, int(max_rows / self.eta ** (n_rungs - 1 - rung))) for rung in range(n_rungs)]
+        if self.min_rows is not None:
+            sizes = [min(max(size, self.min_rows), max_rows) for size in sizes]
+        # Rungs that would train on the same number of rows are merged
+        return sorted(set(sizes))
+
+    def fit(self, X: np.ndarray, y: np.ndarray, directory: str = None, refit: bool = True) -> SearchResult:
+        """
+        Runs the search and refits the best configuration on all rows
+
+        Parameters:
+        X (np.ndarray): Feature matrix, e.g. from FeaturePipeline.fit_transform
+        y (np.ndarray): Target
+        directory (str): Where to share the arrays with the workers; removed afterwards
+        refit (bool): Refit the best configuration on all rows; otherwise best_model is None
+
+        Returns:
+        SearchResult: The best configuration, its refitted model and every trial
+        """
+        start = time.perf_counter()
+        folds = kfold_indices(len(y), self.n_folds, self.seed)
+        max_rows = min(len(train) for train, _ in folds)
+        shared = SharedArrays.write(directory, X=X, y=y)
+        trials: List[Trial] = []
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(shared,)) as executor:
+                alive = list(range(len(self.configs)))
+                for rung, n_rows in enumerate(self.rung_sizes(max_rows)):
+                    rung_trials = [Trial(config_id, self.configs[config_id], rung, n_rows) for config_id in alive]
+                    futures = [
+                        [executor.submit(_fit_fold, self.model_class, trial.params, train[:n_rows], valid)
+                         for train, valid in folds]
+                        for trial in rung_trials
+                    ]
+                    for trial, fold_futures in zip(rung_trials, futures):
+                        for future in fold_futures:
+                            score, seconds, error = future.result()
+                            trial.fold_scores.append(score)
+                            trial.seconds += seconds
+                            if error is not None:
+                                trial.errors.append(error)
+                    trials.extend(rung_trials)
+                    ranked = sorted(rung_trials, key=lambda trial: trial.score)
+                    keep = max(1, math.ceil(len(ranked) / self.eta))
+                    alive = [trial.config_id for trial in ranked[:keep] if math.isfinite(trial.score)]
+                    if not alive:
+                        errors = sorted({error for trial in rung_trials for error in trial.errors})
+                        raise ValueError("Every configuration failed to produce a finite score"
+                                         + (f": {'; '.join(errors)}" if errors else ""))
+        finally:
+            shared.remove()
+
+        best = min((trial for trial in trials if trial.rung == trials[-1].rung), key=lambda trial: trial.score)
+        best_model = self.model_class(**best.params).fit(X, y) if refit else None
+        return SearchResult(best.params, best.score, best_model, trials, time.perf_counter() - start)
+
+
+def cross_validate(X: np.ndarray, y: np.ndarray, params: dict = None, model_class=RidgeRegression,
+                   n_folds: int = 5, max_workers: int = None, seed: int = 0) -> Trial:
+    """
+    Cross-validates one configuration, with the folds fitted in parallel
+
+    Parameters:
+    X (np.ndarray): Feature matrix
+    y (np.ndarray): Target
+    params (dict): Keyword arguments for model_class
+    model_class: The model class
+    n_folds (int): Number of folds
+    max_workers (int): Number of worker processes
+    seed (int): Seed for the folds
+
+    Returns:
+    Trial: The fold scores (RMSE) and total fit time
+    """
+    search = SuccessiveHalvingSearch([params or {}], model_class, n_folds, max_workers=max_workers, seed=seed)
+    return search.fit(X, y, refit=False).trials[-1]
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Example usage of the search
+    # from feature_engineering import ames_pipeline
+    # from ingest_data import ZipDataIngestion
+
+    # pipeline = ames_pipeline()
+    # X, y = pipeline.ingest(ZipDataIngestion(schema="ames_housing"), "../data/archive.zip", fit=True)
+    # search = SuccessiveHalvingSearch(grid(alpha=np.logspace(-2, 3, 27).tolist()), n_folds=5, eta=3)
+    # result = search.fit(X, y)
+    # print(result.best_params, result.best_score)
+    # print(result.summary())
+    pass
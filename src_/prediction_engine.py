@@ -0,0 +1,231 @@
+import csv
+import itertools
+from typing import Callable, Iterable, Iterator, List, Mapping, Sequence
+
+import numpy as np
+
+from feature_engineering import FeaturePipeline, NumericImputer, OneHotEncoder, OrdinalEncoder, TargetEncoder
+from price_model import RidgeRegression
+
+# Cells the schema reads as missing in numeric columns
+MISSING_STRINGS = frozenset(("", "NA"))
+
+
+def _parse_float(value) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        return np.nan if value.strip() in MISSING_STRINGS else float(value)
+    return float(value)
+
+
+def _lookup_table(categories: list, values) -> dict:
+    """Maps each category, and its string form as read from a CSV, to its encoded value."""
+    table = {str(category): value for category, value in zip(categories, values)}
+    table.update(zip(categories, values))
+    return table
+
+
+# Precompiled feature path
+# ------------------------
+# Each fitted pipeline step is compiled once into a filler: a closure holding
+# plain dict lookup tables and scratch buffers that writes the step's block for
+# a micro-batch of raw records straight into the engine's feature buffer. The
+# fillers reproduce FeaturePipeline.transform on a schema-ingested frame
+# without building a DataFrame per request.
+def _compile_numeric(step: NumericImputer, batch_size: int) -> Callable:
+    values_buffer = np.empty((batch_size, len(step.columns)), dtype=np.float64)
+    fill_values = np.asarray(step.fill_values_, dtype=np.float64)
+    log_positions = [step.columns.index(name) for name in step.log_columns]
+    indicator_positions = [step.columns.index(name) for name in step.indicator_columns_]
+    n_columns = len(step.columns)
+
+    def fill(records: Sequence[Mapping], out: np.ndarray):
+        values = values_buffer[:len(records)]
+        for position, name in enumerate(step.columns):
+            column = [record.get(name) for record in records]
+            try:
+                # NumPy parses numeric strings and maps None to NaN by itself
+                values[:, position] = column
+            except (TypeError, ValueError):
+                values[:, position] = [_parse_float(value) for value in column]
+        missing = np.isnan(values)
+        np.copyto(values, np.broadcast_to(fill_values, values.shape), where=missing)
+        if log_positions:
+            values[:, log_positions] = np.log1p(np.maximum(values[:, log_positions], 0.0))
+        out[:, :n_columns] = values
+        if indicator_positions:
+            out[:, n_columns:] = missing[:, indicator_positions]
+
+    return fill
+
+
+def _compile_ordinal(step: OrdinalEncoder, batch_size: int) -> Callable:
+    table = _lookup_table(step.levels, range(1, len(step.levels) + 1))
+
+    def fill(records: Sequence[Mapping], out: np.ndarray):
+        for position, name in enumerate(step.columns):
+            out[:, position] = [table.get(record.get(name), 0) for record in records]
+
+    return fill
+
+
+def _compile_one_hot(step: OneHotEncoder, batch_size: int) -> Callable:
+    tables, offset = [], 0
+    for name in step.columns:
+        categories = step.categories_[name]
+        tables.append((name, _lookup_table(categories, range(offset, offset + len(categories)))))
+        offset += len(categories)
+    rows_buffer = np.arange(batch_size)
+
+    def fill(records: Sequence[Mapping], out: np.ndarray):
+        n_rows = len(records)
+        out[:] = 0
+        for name, table in tables:
+            positions = np.fromiter((table.get(record.get(name), -1) for record in records), np.intp, n_rows)
+            present = positions >= 0
+            out[rows_buffer[:n_rows][present], positions[present]] = 1
+
+    return fill
+
+
+def _compile_target(step: TargetEncoder, batch_size: int) -> Callable:
+    tables = [(name, _lookup_table(step.categories_[name], step.encodings_[name])) for name in step.columns]
+    global_mean = step.global_mean_
+
+    def fill(records: Sequence[Mapping], out: np.ndarray):
+        for position, (name, table) in enumerate(tables):
+            out[:, position] = [table.get(record.get(name), global_mean) for record in records]
+
+    return fill
+
+
+STEP_COMPILERS = {
+    NumericImputer: _compile_numeric,
+    OrdinalEncoder: _compile_ordinal,
+    OneHotEncoder: _compile_one_hot,
+    TargetEncoder: _compile_target,
+}
+
+
+# Prediction engine
+# -----------------
+# Scores raw listings in the AmesHousing.csv layout (dicts of column name to
+# cell, e.g. rows from csv.DictReader) in micro-batches of `batch_size`. The
+# feature matrix, scratch and prediction buffers are allocated once, so a
+# request costs the lookups and one matrix-vector product per micro-batch.
+# The buffers are reused between calls, so use one engine per thread.
+class PredictionEngine:
+    def __init__(self, pipeline: FeaturePipeline, model: RidgeRegression, batch_size: int = 256):
+        """
+        Compiles the fitted pipeline and allocates the buffers
+
+        Parameters:
+        pipeline (FeaturePipeline): The fitted feature pipeline
+        model (RidgeRegression): The fitted model, trained on the pipeline's features
+        batch_size (int): Rows per micro-batch
+
+        Returns:
+        None
+        """
+        if not pipeline.is_fitted or not model.is_fitted:
+            raise ValueError("The prediction engine needs a fitted pipeline and a fitted model")
+        if len(model.coef_) != pipeline.n_features:
+            raise ValueError(f"The model expects {len(model.coef_)} features but the pipeline "
+                             f"produces {pipeline.n_features}")
+        self.pipeline = pipeline
+        self.model = model
+        self.batch_size = batch_size
+        self._features = np.zeros((batch_size, pipeline.n_features), dtype=pipeline.dtype, order="C")
+        self._predictions = np.empty(batch_size, dtype=pipeline.dtype)
+        self._fillers = []
+        offset = 0
+        for step in pipeline.steps:
+            compiler = STEP_COMPILERS.get(type(step))
+            if compiler is None:
+                raise ValueError(f"{type(step).__name__} has no compiled form for the prediction engine")
+            width = len(step.feature_names())
+            self._fillers.append((compiler(step, batch_size), slice(offset, offset + width)))
+            offset += width
+
+    @classmethod
+    def load(cls, pipeline_path: str, model_path: str, batch_size: int = 256) -> "PredictionEngine":
+        """Builds an engine from a pipeline and a model saved with their save() methods."""
+        return cls(FeaturePipeline.load(pipeline_path), RidgeRegression.load(model_path), batch_size)
+
+    def _fill(self, records: Sequence[Mapping]) -> np.ndarray:
+        features = self._features[:len(records)]
+        for fill, columns in self._fillers:
+            fill(records, features[:, columns])
+        return features
+
+    def _score(self, records: Sequence[Mapping]) -> np.ndarray:
+        """Scores at most batch_size records and returns prices; the result is a fresh array."""
+        predictions = self.model.predict(self._fill(records), out=self._predictions[:len(records)])
+        return self.pipeline.inverse_target(predictions)
+
+    def transform_records(self, records: Sequence[Mapping]) -> np.ndarray:
+        """
+        Builds the feature matrix for raw records, micro-batch by micro-batch
+
+        Parameters:
+        records (Sequence[Mapping]): Raw listings
+
+        Returns:
+        np.ndarray: The feature matrix, as FeaturePipeline.transform would produce it
+        """
+        out = np.empty((len(records), self.pipeline.n_features), dtype=self.pipeline.dtype)
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            out[start:start + len(batch)] = self._fill(batch)
+        return out
+
+    def predict_records(self, records: Sequence[Mapping]) -> np.ndarray:
+        """
+        Predicts sale prices for raw listings
+
+        Parameters:
+        records (Sequence[Mapping]): Raw listings in the AmesHousing.csv layout; SalePrice is not needed
+
+        Returns:
+        np.ndarray: Predicted prices, float64, one per record
+        """
+        out = np.empty(len(records), dtype=np.float64)
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            out[start:start + len(batch)] = self._score(batch)
+        return out
+
+    def iter_predictions(self, records: Iterable[Mapping]) -> Iterator[np.ndarray]:
+        """Streams predictions for an iterable of listings, yielding one array per micro-batch."""
+        records = iter(records)
+        while True:
+            batch: List[Mapping] = list(itertools.islice(records, self.batch_size))
+            if not batch:
+                return
+            yield self._score(batch)
+
+    def predict_csv(self, lines: Iterable[str]) -> np.ndarray:
+        """
+        Predicts sale prices for CSV text with the AmesHousing.csv header
+
+        Parameters:
+        lines (Iterable[str]): The header line followed by one line per listing, e.g. an open file
+
+        Returns:
+        np.ndarray: Predicted prices, one per listing
+        """
+        batches = list(self.iter_predictions(csv.DictReader(lines)))
+        return np.concatenate(batches) if batches else np.empty(0)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Example usage of the prediction engine
+    # engine = PredictionEngine.load("ames_features.json", "ames_ridge.json", batch_size=256)
+
+    # with open("new_listings.csv", newline="") as f:
+    #     prices = engine.predict_csv(f)
+
+    # prices = engine.predict_records([{"Gr Liv Area": "1656", "Neighborhood": "NAmes", ...}])
+    pass
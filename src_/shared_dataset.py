@@ -0,0 +1,201 @@
+import os
+import json
+import shutil
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ingest_data import DataIngestor
+
+
+# Memory-mapped dataset
+# ---------------------
+# Every column is written once as its own .npy file: numerical (and other
+# numpy-native) columns as they are, text and categorical columns as integer
+# codes with their categories in the manifest. Workers attach read-only
+# np.memmap views, so the data is shared through the page cache instead of
+# being pickled into every process; the handle itself pickles as a path and
+# a small manifest. Put the directory on a RAM-backed filesystem (e.g.
+# /dev/shm) to keep it out of the disk entirely.
+class SharedDataset:
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str):
+        """
+        Attaches to a dataset written by SharedDataset.write
+
+        Parameters:
+        directory (str): The dataset directory
+
+        Returns:
+        None
+        """
+        manifest_path = os.path.join(directory, self.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No shared dataset found at: {directory}")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.n_rows = manifest["n_rows"]
+        self._columns = manifest["columns"]
+        self._views = {}
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, directory: str) -> "SharedDataset":
+        """
+        Writes a dataframe as one memory-mappable file per column
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to share
+        directory (str): Directory to write to. An existing dataset there is replaced.
+
+        Returns:
+        SharedDataset: A handle attached to the written dataset
+        """
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory)
+
+        columns = []
+        for i, name in enumerate(df.columns):
+            column = df[name]
+            spec = {"name": name, "file": f"{i:04d}.npy"}
+            if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biufcmM":
+                values = column.to_numpy()
+                spec["kind"] = "array"
+            elif pd.api.types.is_numeric_dtype(column):
+                # Nullable extension types (Int64, Float32, ...) become floats with NaN
+                values = column.to_numpy(dtype="float64", na_value=np.nan)
+                spec["kind"] = "array"
+            else:
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    codes, categories = column.cat.codes.to_numpy(), column.cat.categories
+                    spec["ordered"] = bool(column.cat.ordered)
+                else:
+                    codes, categories = pd.factorize(column, use_na_sentinel=True)
+                    spec["ordered"] = False
+                code_type = np.int8 if len(categories) < 2**7 else np.int16 if len(categories) < 2**15 else np.int32
+                values = codes.astype(code_type)
+                spec["kind"] = "categorical"
+                # JSON-native values keep their type (int, float, bool); others, e.g. timestamps, are
+                # stored as text and parsed back through the recorded dtype
+                spec["categories"] = [
+                    value if isinstance(value, (str, int, float, bool)) else str(value)
+                    for value in categories.tolist()
+                ]
+                spec["categories_dtype"] = str(categories.dtype)
+            np.save(os.path.join(directory, spec["file"]), np.ascontiguousarray(values), allow_pickle=False)
+            columns.append(spec)
+
+        # The manifest is written last, so a partially written dataset cannot be attached
+        tmp_path = os.path.join(directory, cls.MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"n_rows": len(df), "columns": columns}, f)
+        os.replace(tmp_path, os.path.join(directory, cls.MANIFEST_FILE))
+        return cls(directory)
+
+    @property
+    def columns(self) -> List[str]:
+        return [spec["name"] for spec in self._columns]
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def _spec(self, name: str) -> dict:
+        for spec in self._columns:
+            if spec["name"] == name:
+                return spec
+        raise ValueError(f"No column named {name} in the shared dataset")
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a read-only memory-mapped view of a column (the codes, for categorical columns)
+
+        Parameters:
+        name (str): The column name
+
+        Returns:
+        np.ndarray: The view; nothing is read until its pages are touched
+        """
+        if name not in self._views:
+            path = os.path.join(self.directory, self._spec(name)["file"])
+            self._views[name] = np.load(path, mmap_mode="r")
+        return self._views[name]
+
+    def to_frame(self, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Builds a DataFrame over the memory-mapped columns
+
+        Parameters:
+        columns (List[str]): Columns to include. Defaults to all of them.
+
+        Returns:
+        pd.DataFrame: Numerical columns wrap the read-only views without copying; text columns come back as categoricals
+        """
+        data: Dict[str, object] = {}
+        for name in columns if columns is not None else self.columns:
+            spec = self._spec(name)
+            view = self.column(name)
+            if spec["kind"] == "categorical":
+                categories = pd.Index(spec["categories"], dtype=spec.get("categories_dtype", "object"))
+                dtype = pd.CategoricalDtype(categories, ordered=spec["ordered"])
+                data[name] = pd.Categorical.from_codes(view, dtype=dtype)
+            else:
+                data[name] = view
+        return pd.DataFrame(data, copy=False)
+
+    def __getstate__(self):
+        # Workers re-open the files; only the path and manifest travel
+        state = self.__dict__.copy()
+        state["_views"] = {}
+        return state
+
+    def remove(self):
+        """Deletes the dataset files."""
+        self._views = {}
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# Ingestion output mode
+# ---------------------
+# Wraps any ingestor: the ingested frame is written once as a SharedDataset
+# and the handle is returned, ready to be passed to worker processes.
+class SharedDatasetIngestor(DataIngestor):
+    def __init__(self, ingestor: DataIngestor, directory: str):
+        """
+        Initialises the shared output around an existing ingestor
+
+        Parameters:
+        ingestor (DataIngestor): The ingestor that reads the source file
+        directory (str): Directory the shared dataset is written to
+
+        Returns:
+        None
+        """
+        self.ingestor = ingestor
+        self.directory = directory
+
+    def ingest_shared(self, file_path: str) -> SharedDataset:
+        """
+        Ingests a file and writes it as a memory-mapped dataset
+
+        Parameters:
+        file_path (str): Path of the source file
+
+        Returns:
+        SharedDataset: The handle to pass to workers
+        """
+        return SharedDataset.write(self.ingestor.ingest(file_path), self.directory)
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Ingests a file through the shared dataset and returns a DataFrame over its memory-mapped columns."""
+        return self.ingest_shared(file_path).to_frame()
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Write the dataset once, then hand the handle (not the frame) to the workers
+    # dataset = SharedDatasetIngestor(ZipDataIngestion(), "/dev/shm/ames").ingest_shared("../data/archive.zip")
+    # render_report(dataset, max_workers=8)
+    pass
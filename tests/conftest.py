@@ -0,0 +1,7 @@
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules import each other flat within src_/ and analyze_src/
+sys.path[:0] = [os.path.join(REPO_ROOT, name) for name in ("src_", "analyze_src", "benchmarks")]
+os.environ.setdefault("MPLBACKEND", "Agg")
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from bivariate_analysis import BatchCategoricalVsNumericalAnalysis
+
+
+def test_all_missing_feature_gives_empty_summary():
+    df = pd.DataFrame({"Pool QC": pd.Series([np.nan] * 4, dtype=object), "SalePrice": [1.0, 2.0, 3.0, 4.0]})
+    summary = BatchCategoricalVsNumericalAnalysis().summarize(df, features=["Pool QC"])
+    assert summary.empty
+    assert list(summary.columns) == BatchCategoricalVsNumericalAnalysis.SUMMARY_COLUMNS
+
+
+def test_feature_without_target_is_skipped():
+    df = pd.DataFrame({
+        "Pool QC": ["Ex", None, "Gd", None],
+        "Street": ["Pave", "Grvl", "Pave", "Pave"],
+        "SalePrice": [np.nan, 2.0, np.nan, 4.0],
+    })
+    summary = BatchCategoricalVsNumericalAnalysis().summarize(df, features=["Pool QC", "Street"])
+    assert set(summary["feature"]) == {"Street"}
+    assert summary.set_index("category")["count"].to_dict() == {"Pave": 1, "Grvl": 1}
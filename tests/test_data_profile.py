@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+from data_profile import profile_dataframe
+
+
+def test_numeric_profile_matches_describe():
+    df = pd.DataFrame({
+        "values": [1.0, 2.0, np.nan, 4.0, 8.0],
+        "single": [np.nan, np.nan, 3.0, np.nan, np.nan],
+        "empty": [np.nan] * 5,
+    })
+    numeric = profile_dataframe(df).numeric
+    expected = df.describe().T
+    for column in ("count", "mean", "std", "min", "25%", "50%", "75%", "max"):
+        np.testing.assert_array_equal(numeric[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float))
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from drift_monitor import DriftMonitor, DriftMonitoringIngestor, ReferenceProfile
+from schema import get_schema
+from synthetic_data import AMES_CSV
+
+
+class FrameIngestor:
+    def __init__(self, df):
+        self.df = df
+
+    def ingest(self, file_path):
+        return self.df
+
+
+@pytest.fixture(scope="module")
+def ames():
+    return pd.read_csv(AMES_CSV, **get_schema("ames_housing").read_csv_options())
+
+
+@pytest.fixture(scope="module")
+def reference(ames, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("drift") / "reference.json")
+    ReferenceProfile.build(ames).save(path)
+    return ReferenceProfile.load(path)
+
+
+def test_sample_of_the_reference_is_stable(ames, reference):
+    report = DriftMonitor(reference).score(ames.sample(1000, random_state=0))
+    assert report.drifted == []
+    assert DriftMonitor(reference).score(ames).scores["psi"].max() < 1e-9
+
+
+def test_shifted_batch_drifts(ames, reference):
+    batch = ames.sample(1000, random_state=0).copy()
+    batch["Gr Liv Area"] *= 1.5
+    batch["Neighborhood"] = "NAmes"
+    report = DriftMonitor(reference).score(batch)
+    assert {"Gr Liv Area", "Neighborhood"} <= set(report.drifted)
+    assert report.scores.loc["Gr Liv Area", "ks_p_value"] < 1e-6
+
+
+def test_small_batches_are_not_scored(ames, reference):
+    monitor = DriftMonitor(reference, min_rows=30)
+    ingestor = DriftMonitoringIngestor(FrameIngestor(ames.iloc[:0]), monitor, on_drift="raise")
+    ingestor.ingest("empty.csv")
+    assert (ingestor.last_report.scores["status"] == "insufficient").all()
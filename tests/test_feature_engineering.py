@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engineering import FeaturePipeline, OneHotEncoder, OrdinalEncoder, ames_pipeline
+from schema import get_schema
+from synthetic_data import AMES_CSV
+
+
+@pytest.fixture(scope="module")
+def ames():
+    return pd.read_csv(AMES_CSV, **get_schema("ames_housing").read_csv_options())
+
+
+def test_ames_features_are_finite(ames):
+    X, y = ames_pipeline().fit_transform(ames)
+    assert X.shape[0] == len(ames) == len(y)
+    assert np.isfinite(X).all()
+    np.testing.assert_allclose(y, np.log1p(ames["SalePrice"].to_numpy(dtype=np.float64)))
+
+
+def test_saved_pipeline_transforms_the_same(ames, tmp_path):
+    pipeline = ames_pipeline().fit(ames)
+    path = str(tmp_path / "features.json")
+    pipeline.save(path)
+    loaded = FeaturePipeline.load(path)
+    assert loaded.feature_names == pipeline.feature_names
+    np.testing.assert_array_equal(loaded.transform(ames), pipeline.transform(ames))
+
+
+def test_unseen_and_missing_categories_encode_as_zero():
+    train = pd.DataFrame({"Kitchen Qual": ["TA", "Gd", "Ex"], "Street": ["Pave", "Grvl", "Pave"],
+                          "SalePrice": [1.0, 2.0, 3.0]})
+    pipeline = FeaturePipeline([OrdinalEncoder(["Kitchen Qual"]), OneHotEncoder(["Street"])]).fit(train)
+    X = pipeline.transform(pd.DataFrame({"Kitchen Qual": ["Po", None, "Zz"], "Street": ["Dirt", None, "Pave"]}))
+    np.testing.assert_array_equal(X[:, 0], [1, 0, 0])
+    assert X[:2, 1:].sum() == 0
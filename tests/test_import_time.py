@@ -0,0 +1,9 @@
+from import_time import MODULES, check_budget
+
+# Seconds a module may add on top of numpy and pandas, as in benchmarks/import_time.py
+IMPORT_BUDGET = 0.15
+
+
+def test_analysis_modules_import_within_budget():
+    violations = check_budget(MODULES, IMPORT_BUDGET)
+    assert not violations, "\n".join(violations)
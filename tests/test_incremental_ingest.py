@@ -0,0 +1,57 @@
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+from incremental_ingest import IncrementalZipIngestion
+
+AMES_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "analyze_src", "extracted_data", "AmesHousing.csv")
+
+
+@pytest.fixture
+def parts():
+    # Read as text so the members hold the original CSV fields (e.g. zero-padded PIDs)
+    df = pd.read_csv(AMES_CSV, nrows=300, dtype=str, keep_default_na=False)
+    return {f"2010-{month:02d}.csv": df.iloc[(month - 1) * 100:month * 100] for month in (1, 2, 3)}
+
+
+def _write_zip(path, parts):
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        for name, frame in parts.items():
+            zip_ref.writestr(name, frame.to_csv(index=False))
+
+
+def _member_files(state_dir):
+    return sorted(os.listdir(os.path.join(state_dir, IncrementalZipIngestion.MEMBERS_DIR)))
+
+
+def test_refresh_writes_only_the_delta(tmp_path, parts):
+    archive, state_dir = str(tmp_path / "listings.zip"), str(tmp_path / "state")
+    first = dict(list(parts.items())[:2])
+    _write_zip(archive, first)
+    ingestor = IncrementalZipIngestion(state_dir, schema="ames_housing")
+    assert len(ingestor.ingest(archive)) == 200
+    stored = {name: os.stat(os.path.join(state_dir, "members", name)).st_mtime_ns for name in _member_files(state_dir)}
+
+    _write_zip(archive, parts)
+    df = ingestor.ingest(archive)
+    assert ingestor.last_parsed_members == ["2010-03.csv"]
+    assert df["Order"].tolist() == list(range(1, 301))
+    # The unchanged members' files were not rewritten
+    for name, mtime in stored.items():
+        assert os.stat(os.path.join(state_dir, "members", name)).st_mtime_ns == mtime
+    assert len(_member_files(state_dir)) == 3
+
+
+def test_removed_members_are_dropped(tmp_path, parts):
+    archive, state_dir = str(tmp_path / "listings.zip"), str(tmp_path / "state")
+    _write_zip(archive, parts)
+    ingestor = IncrementalZipIngestion(state_dir, schema="ames_housing")
+    ingestor.ingest(archive)
+    _write_zip(archive, dict(list(parts.items())[1:]))
+    df = ingestor.ingest(archive)
+    assert ingestor.last_parsed_members == []
+    assert df["Order"].tolist() == list(range(101, 301))
+    assert len(_member_files(state_dir)) == 2
@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+import pytest
+
+from ingest_data import CompressedCSVIngestion, DataIngestorFactory, ParquetIngestion, ShardedDirectoryIngestion
+
+AMES_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "analyze_src", "extracted_data", "AmesHousing.csv")
+
+
+@pytest.fixture
+def mixed_directory(tmp_path):
+    # One CSV shard and one Parquet shard of the same dataset
+    df = pd.read_csv(AMES_CSV, nrows=200, dtype=str, keep_default_na=False)
+    df.iloc[:100].to_csv(tmp_path / "part-0.csv", index=False)
+    typed = CompressedCSVIngestion(schema="ames_housing").ingest(str(tmp_path / "part-0.csv"))
+    df.iloc[100:].to_csv(tmp_path / "part-1.tmp", index=False)
+    typed_tail = CompressedCSVIngestion(schema="ames_housing").ingest(str(tmp_path / "part-1.tmp"))
+    os.remove(tmp_path / "part-1.tmp")
+    typed_tail.to_parquet(tmp_path / "part-1.parquet")
+    return str(tmp_path), typed
+
+
+def test_schema_only_reaches_csv_shards(mixed_directory):
+    directory, typed = mixed_directory
+    df = DataIngestorFactory.get_data_ingestor_for_path(directory, schema="ames_housing").ingest(directory)
+    assert len(df) == 200
+    assert list(df.columns) == list(typed.columns)
+
+
+def test_options_by_extension(mixed_directory):
+    directory, _ = mixed_directory
+    ingestor = ShardedDirectoryIngestion(schema="ames_housing", options_by_extension={".parquet": {"columns": ["PID"]}})
+    assert ingestor.shard_options("part-1.parquet", ParquetIngestion) == {"columns": ["PID"]}
+    assert ingestor.shard_options("part-0.csv", CompressedCSVIngestion) == {"schema": "ames_housing"}
+    df = ingestor.ingest(directory)
+    assert len(df) == 200
+    assert df["PID"].notna().all()
+
+
+def test_named_options_reach_other_ingestors():
+    ingestor = ShardedDirectoryIngestion(schema="ames_housing", columns=["PID"])
+    assert ingestor.shard_options("part-1.pq", ParquetIngestion) == {"columns": ["PID"]}
@@ -0,0 +1,38 @@
+import asyncio
+import os
+
+from ingestion_service import IngestionService
+
+ARCHIVE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "archive.zip")
+
+
+def test_callers_get_independent_frames():
+    async def run():
+        async with IngestionService() as service:
+            first, joined = await service.submit(ARCHIVE), await service.submit(ARCHIVE)
+            frame = (await first).frame
+            original = frame.loc[0, "SalePrice"]
+            frame.loc[0, "SalePrice"] = -1
+            assert (await joined).frame.loc[0, "SalePrice"] == original
+            cached = await service.submit(ARCHIVE)
+            assert (await cached).cached
+            assert (await cached).frame.loc[0, "SalePrice"] == original
+
+    asyncio.run(run())
+
+
+def test_missing_path_fails_its_job_only():
+    async def run():
+        async with IngestionService() as service:
+            paths = asyncio.Queue()
+            for path in ("missing.csv", ARCHIVE, None):
+                paths.put_nowait(path)
+            missing, found = await service.consume(paths)
+            assert isinstance(missing.error, FileNotFoundError)
+            assert found.ok
+
+    asyncio.run(run())
+
+
+def test_stop_before_start_is_a_no_op():
+    asyncio.run(IngestionService().stop())
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bivariate_analysis import BivariateAnalysisStrategy
+from eda_plan import EDAPlan
+from instrumentation import InMemorySink, instrument
+from univariate_analysis import Analysis, NumericalUnivariateAnalysis, UnivariateAnalysisStrategy
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Gr Liv Area": rng.normal(1500, 300, 200),
+        "Street": rng.choice(["Pave", "Grvl"], 200),
+        "SalePrice": rng.normal(180_000, 40_000, 200),
+    })
+
+
+@pytest.fixture
+def sink():
+    sink = InMemorySink()
+    hooks = instrument(UnivariateAnalysisStrategy, BivariateAnalysisStrategy, sinks=[sink])
+    yield sink
+    hooks.remove()
+
+
+def _methods(sink):
+    return {(record.component, record.method) for record in sink.records}
+
+
+def test_execute_analysis_is_measured(df, sink):
+    Analysis(NumericalUnivariateAnalysis()).execute_analysis(df, "Gr Liv Area", fingerprint="v1")
+    assert {("NumericalUnivariateAnalysis", "compute"), ("NumericalUnivariateAnalysis", "draw")} <= _methods(sink)
+    rows = [record.rows for record in sink.records if record.method == "compute"]
+    assert rows == [len(df)]
+
+
+def test_eda_plan_run_is_measured(df, sink):
+    EDAPlan().univariate("Gr Liv Area").categorical_vs_target("SalePrice", ["Street"]).run(df, render=False)
+    methods = _methods(sink)
+    assert ("NumericalUnivariateAnalysis", "compute") in methods
+    assert ("BatchCategoricalVsNumericalAnalysis", "summarize") in methods
+
+
+def test_direct_analyze_is_measured(df, sink):
+    NumericalUnivariateAnalysis().analyze(df, "Gr Liv Area")
+    depths = {record.method: record.depth for record in sink.records}
+    assert depths == {"analyze": 0, "compute": 1, "draw": 1}
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from model_registry import ModelRegistry
+from price_model import RidgeRegression
+
+
+@pytest.fixture
+def model():
+    rng = np.random.default_rng(0)
+    return RidgeRegression(alpha=1.0).fit(rng.random((50, 3)), rng.random(50))
+
+
+def test_identical_registration_returns_existing_version(tmp_path, model):
+    registry = ModelRegistry(str(tmp_path))
+    first = registry.register("ridge", model, metrics={"rmse": 1.0}, dataset_fingerprint="a")
+    again = registry.register("ridge", model, metrics={"rmse": 1.0}, dataset_fingerprint="a")
+    assert again.version == first.version
+
+
+def test_same_bytes_with_new_lineage_get_a_new_version(tmp_path, model):
+    registry = ModelRegistry(str(tmp_path))
+    registry.register("ridge", model, metrics={"rmse": 1.0})
+    second = registry.register("ridge", model, metrics={"rmse": 2.0}, dataset_fingerprint="other")
+    assert second.version == 2
+    assert registry.metadata("ridge", 2).metrics == {"rmse": 2.0}
+    assert registry.metadata("ridge", 2).dataset_fingerprint == "other"
+
+
+def test_deleted_version_numbers_are_not_reused(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.register("array", np.arange(3))
+    registry.register("array", np.arange(4))
+    registry.delete("array", 2)
+    assert registry.register("array", np.arange(5)).version == 3
+    registry.delete("unknown", 1)
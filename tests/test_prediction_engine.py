@@ -0,0 +1,47 @@
+import csv
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engineering import ames_pipeline
+from prediction_engine import PredictionEngine
+from price_model import RidgeRegression
+from schema import get_schema
+from synthetic_data import AMES_CSV
+
+
+@pytest.fixture(scope="module")
+def ames():
+    df = pd.read_csv(AMES_CSV, **get_schema("ames_housing").read_csv_options())
+    pipeline = ames_pipeline()
+    X, y = pipeline.fit_transform(df)
+    engine = PredictionEngine(pipeline, RidgeRegression(alpha=10.0).fit(X, y), batch_size=256)
+    with open(AMES_CSV, newline="") as f:
+        records = list(csv.DictReader(f))
+    return df, X, engine, records
+
+
+def test_engine_features_match_the_pipeline(ames):
+    df, X, engine, records = ames
+    features = engine.transform_records(records)
+    assert features.dtype == X.dtype
+    np.testing.assert_array_equal(features, engine.pipeline.transform(df))
+
+
+def test_predict_csv_matches_the_dataframe_path(ames):
+    _, X, engine, _ = ames
+    expected = engine.pipeline.inverse_target(engine.model.predict(X))
+    with open(AMES_CSV, newline="") as f:
+        prices = engine.predict_csv(f)
+    assert prices.shape == (len(X),)
+    np.testing.assert_allclose(prices, expected, rtol=1e-5)
+
+
+def test_saved_engine_predicts_the_same(ames, tmp_path):
+    _, _, engine, records = ames
+    engine.pipeline.save(str(tmp_path / "features.json"))
+    engine.model.save(str(tmp_path / "ridge.json"))
+    loaded = PredictionEngine.load(str(tmp_path / "features.json"), str(tmp_path / "ridge.json"), batch_size=64)
+    np.testing.assert_allclose(loaded.predict_records(records[:500]), engine.predict_records(records[:500]),
+                               rtol=1e-5)
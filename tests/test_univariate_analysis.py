@@ -0,0 +1,28 @@
+import gc
+
+import numpy as np
+import pandas as pd
+
+import univariate_analysis
+from univariate_analysis import AggregateStore, Analysis, NumericalUnivariateAnalysis
+
+
+def test_column_is_hashed_once_per_frame(monkeypatch):
+    calls = []
+    original = univariate_analysis.column_fingerprint
+    monkeypatch.setattr(univariate_analysis, "column_fingerprint",
+                        lambda df, feature: calls.append(feature) or original(df, feature))
+    store = AggregateStore()
+    analysis = Analysis(NumericalUnivariateAnalysis(), store)
+    df = pd.DataFrame({"Gr Liv Area": np.random.default_rng(0).normal(1500, 300, 500)})
+    for _ in range(3):
+        analysis.execute_analysis(df, "Gr Liv Area")
+    assert calls == ["Gr Liv Area"]
+    assert len(store._entries) == 1
+
+    # A new frame with other values is hashed again and gets its own aggregates
+    del df
+    gc.collect()
+    analysis.execute_analysis(pd.DataFrame({"Gr Liv Area": np.arange(500.0)}), "Gr Liv Area")
+    assert len(calls) == 2
+    assert len(store._entries) == 2